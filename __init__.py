@@ -8,7 +8,7 @@ bl_info = {
     "doc_url": "https://atticus-lv.gitee.io/super_io/#/",
     "tracker_url": "https://github.com/atticus-lv/super_io/issues",
     "description": "Copy paste to import and export Model/Images (Inspired by Binit's ImagePaste)",
-    'warning': "Support Windows/MacOS (no copy multiple files to clipboard in mac)",
+    'warning': "Support Windows/MacOS/Linux (no copy multiple files to clipboard in mac)",
     "location": "3DView > F3 > Super Import('Ctrl Shift V') / Super Export('Ctrl Shift C')",
 }
 
@@ -32,28 +32,6 @@ classes = (
 )
 
 
-def prepare():
-    from addon_utils import enable
-    addons = [
-        'io_import_images_as_planes',
-        'io_import_dxf',
-        'io_scene_obj',  # 3.1 and heigher obj io
-        'io_scene_fbx',
-        'io_scene_gltf2',
-        'io_curve_svg',
-        'io_mesh_stl',
-        'io_mesh_ply',
-        'io_anim_bvh',
-        # 'node_wrangler', # use to set up pbr textures
-
-    ]
-    for addon in addons:
-        try:
-            enable(addon)
-        except ModuleNotFoundError:
-            pass
-
-
 def register():
     for cls in classes:
         try:
@@ -61,7 +39,7 @@ def register():
         except Exception as e:
             print(e)
 
-    prepare()
+    # io add-ons are enabled when a format is first used, see imexporter/addon_loader.py
 
 
 def unregister():
@@ -26,6 +26,7 @@ def copy_files() -> Path:
             if file.name == parent_path.name: continue
             if file.name.startswith('__') or file.name.startswith('.'): continue
             if file.is_dir() and file.name == 'docs': continue
+            if file.is_dir() and file.name == 'tests': continue
 
             shutil.copytree(file, sub_dir.joinpath(file.name))
 
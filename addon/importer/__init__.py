@@ -1,5 +1,6 @@
 import bpy
-from . import op_import_ies, op_import_zip, ops_addon_import, op_blend_import_and_assign, op_import_pbr_from_url
+from . import op_import_ies, op_import_zip, ops_addon_import, op_blend_import_and_assign, op_import_pbr_from_url, \
+    op_import_stl_fast, op_import_ply_fast
 
 classes = (
     op_import_ies,
@@ -7,6 +8,8 @@ classes = (
     ops_addon_import,
     op_blend_import_and_assign,
     op_import_pbr_from_url,
+    op_import_stl_fast,
+    op_import_ply_fast,
 )
 
 
@@ -3,6 +3,8 @@ import os
 import sys
 from bpy.props import StringProperty, BoolProperty, EnumProperty
 
+from ...ops.file_registry import resolve_files
+
 
 class SPIO_OT_import_ies(bpy.types.Operator):
     """Import IES file as light"""
@@ -10,7 +12,7 @@ class SPIO_OT_import_ies(bpy.types.Operator):
     bl_idname = 'spio.import_ies'
     bl_label = 'Import IES file as light'
 
-    filepath: StringProperty()  # list of filepath, join with$$
+    filepath: StringProperty()  # file list handle (see file_registry), or filepath joined with $$
 
     @classmethod
     def poll(_cls, context):
@@ -20,7 +22,7 @@ class SPIO_OT_import_ies(bpy.types.Operator):
                     and context.mode == "OBJECT")
 
     def execute(self, context):
-        for i, file in enumerate(self.filepath.split('$$')):
+        for i, file in enumerate(resolve_files(self.filepath)):
             with open(file, 'r') as f:
                 data = f.read()
 
@@ -0,0 +1,64 @@
+import bpy
+import os
+from bpy.props import StringProperty, FloatProperty, BoolProperty
+
+from ...ops.file_registry import resolve_files
+
+
+class SPIO_OT_import_ply_fast(bpy.types.Operator):
+    """Import PLY with the SPIO NumPy reader (meshes and large point clouds)"""
+
+    bl_idname = 'spio.import_ply_fast'
+    bl_label = 'Import PLY (Fast)'
+    bl_options = {'UNDO_GROUPED'}
+
+    filepath: StringProperty()  # file list handle (see file_registry), or filepath joined with $$
+    global_scale: FloatProperty(name='Scale', default=1.0, min=0.0001)
+    import_normals: BoolProperty(name='Normals', default=True)
+    import_colors: BoolProperty(name='Colors', default=True)
+
+    def execute(self, context):
+        from ...imexporter.ply_reader import read_ply
+        from ...imexporter.fast_mesh import mesh_from_arrays, set_point_attribute, add_mesh_object
+
+        for filepath in resolve_files(self.filepath):
+            try:
+                data = read_ply(filepath)
+            except (OSError, ValueError) as e:
+                self.report({'ERROR'}, f'{filepath}: {e}')
+                continue
+
+            vertices = data.vertices
+            if self.global_scale != 1.0: vertices *= self.global_scale
+
+            name = os.path.splitext(os.path.basename(filepath))[0]
+
+            # point cloud: vertices only
+            if data.is_point_cloud():
+                mesh = mesh_from_arrays(name, vertices)
+            elif data.face_sizes is not None:
+                mesh = mesh_from_arrays(name, vertices, data.faces, face_sizes=data.face_sizes)
+            else:
+                mesh = mesh_from_arrays(name, vertices, data.faces, corners_per_face=data.faces.shape[1])
+
+            if self.import_normals and data.normals is not None:
+                if data.is_point_cloud():
+                    set_point_attribute(mesh, 'point_normal', data.normals, 'FLOAT_VECTOR')
+                else:
+                    mesh.normals_split_custom_set_from_vertices(data.normals)
+
+            if self.import_colors and data.colors is not None:
+                set_point_attribute(mesh, 'Col', data.colors, 'FLOAT_COLOR')
+                mesh.color_attributes.active_color_name = 'Col'
+
+            add_mesh_object(context, name, mesh)
+
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(SPIO_OT_import_ply_fast)
+
+
+def unregister():
+    bpy.utils.unregister_class(SPIO_OT_import_ply_fast)
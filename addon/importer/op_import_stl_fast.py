@@ -0,0 +1,43 @@
+import bpy
+import os
+from bpy.props import StringProperty, FloatProperty
+
+from ...ops.file_registry import resolve_files
+
+
+class SPIO_OT_import_stl_fast(bpy.types.Operator):
+    """Import STL with the SPIO NumPy reader (welded vertices, fast on large scans)"""
+
+    bl_idname = 'spio.import_stl_fast'
+    bl_label = 'Import STL (Fast)'
+    bl_options = {'UNDO_GROUPED'}
+
+    filepath: StringProperty()  # file list handle (see file_registry), or filepath joined with $$
+    global_scale: FloatProperty(name='Scale', default=1.0, min=0.0001)
+
+    def execute(self, context):
+        from ...imexporter.stl_reader import read_stl
+        from ...imexporter.fast_mesh import mesh_from_arrays, add_mesh_object
+
+        for filepath in resolve_files(self.filepath):
+            try:
+                vertices, faces = read_stl(filepath)
+            except (OSError, ValueError) as e:
+                self.report({'ERROR'}, f'{filepath}: {e}')
+                continue
+
+            if self.global_scale != 1.0: vertices = vertices * self.global_scale
+
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            mesh = mesh_from_arrays(name, vertices, faces)
+            add_mesh_object(context, name, mesh)
+
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(SPIO_OT_import_stl_fast)
+
+
+def unregister():
+    bpy.utils.unregister_class(SPIO_OT_import_stl_fast)
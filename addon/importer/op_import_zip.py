@@ -5,13 +5,14 @@ import zipfile
 from bpy.props import StringProperty
 from ...preferences.prefs import get_pref
 from ...ops.op_image_io import get_dir
+from ...ops.file_registry import resolve_files
 
 
 class SPIO_OT_import_pbr_zip(bpy.types.Operator):
     bl_idname = 'spio.import_pbr_zip'
     bl_label = 'Import Zips as PBR Materials'
 
-    filepath: StringProperty()  # list of filepath, join with$$
+    filepath: StringProperty()  # file list handle (see file_registry), or filepath joined with $$
 
     def execute(self, context):
         if bpy.data.filepath != '':
@@ -19,7 +20,7 @@ class SPIO_OT_import_pbr_zip(bpy.types.Operator):
         else:
             extract_dir = get_dir()
 
-        for filepath in self.filepath.split('$$'):
+        for filepath in resolve_files(self.filepath):
             dir_name = os.path.basename(filepath).split('.')[0]  # extract folder
             # name
             extract = os.path.join(extract_dir, dir_name)
@@ -3,141 +3,344 @@ from __future__ import annotations
 import subprocess
 import os
 import sys
+import threading
 
 from locale import getdefaultlocale
 
-import time
 import bpy
 
-TEMP_DIR = ''
-IMAGE_CREATE_TIME_COST = 1  # seconds
+from ..temp_store import TEMP_STORE
+from ..profiler import PROFILER
+from .linux_helper import LinuxHelperProcess
 
 
 def get_dir():
-    global TEMP_DIR
-    if TEMP_DIR == '':
-        TEMP_DIR = os.path.join(os.path.expanduser('~'), 'spio_temp')
-        if not "spio_temp" in os.listdir(os.path.expanduser('~')):
-            os.makedirs(TEMP_DIR)
+    return TEMP_STORE.get_dir()
 
-    return TEMP_DIR
 
+# Backend registry
+##################
 
-class CheckStringFile():
-    # notice that the extra file only allow one type (one file from string / one image bytes / one file drop list)
-    def __init__(self):
-        self.s = bpy.context.window_manager.clipboard
+CLIPBOARD_BACKENDS = dict()  # name: backend class
+PLATFORM_BACKENDS = dict()  # sys.platform: backend name
+
+_backend_override = os.environ.get('SPIO_CLIPBOARD_BACKEND', '').upper()
+_backend_instances = dict()
+
+
+def register_backend(name, platform=None):
+    """Class decorator, register a ClipboardBackend under a name
+    if platform is given, the backend is the default one for this sys.platform"""
+
+    def wrapper(cls):
+        cls.backend_name = name
+        CLIPBOARD_BACKENDS[name] = cls
+        if platform:
+            PLATFORM_BACKENDS[platform] = name
+        return cls
+
+    return wrapper
+
+
+def set_backend(name=None):
+    """Force a backend for the whole session (eg. 'MEMORY' for blender --background),
+    None to restore the platform default"""
+    global _backend_override
+
+    if name and name not in CLIPBOARD_BACKENDS:
+        raise KeyError(f'Clipboard backend {name} not found, available: {list(CLIPBOARD_BACKENDS)}')
+
+    _backend_override = name or ''
 
-    def is_svg(self):
-        if self.s.endswith("</svg>"):
-            dir = get_dir()
-            filepath = os.path.join(dir, 'temp.svg')
-            with open(filepath, 'w') as f:
-                f.write(self.s)
 
-            return filepath
+def get_backend(name=None):
+    """Return the shared backend instance, backends keep state (helper process, memory payload)"""
+    name = name or _backend_override or PLATFORM_BACKENDS.get(sys.platform)
+    if name not in CLIPBOARD_BACKENDS:
+        raise EnvironmentError(f'No clipboard backend for platform {sys.platform}')
 
-    def is_file(self):
-        if os.path.isfile(self.s):
-            return self.s
+    if name not in _backend_instances:
+        _backend_instances[name] = CLIPBOARD_BACKENDS[name]()
 
-    def is_dir(self):
-        if os.path.isdir(self.s):
-            return self.s + '/' if not self.s.endswith('/') else self.s
+    return _backend_instances[name]
 
-    def is_something(self):
-        if self.is_svg():
-            return self.is_svg()
-        if self.is_file():
-            return self.is_file()
-        if self.is_dir():
-            return self.is_dir()
+
+class ClipboardBackend():
+    """Stable interface of a clipboard backend"""
+    backend_name = ''
+    main_thread_text = True  # pull_text read from bpy, can't run in a thread
+
+    def pull(self, force_unicode=False) -> list[str]:
+        """Return the file paths in clipboard"""
+        return []
+
+    def pull_text(self) -> str:
+        return bpy.context.window_manager.clipboard
+
+    def change_token(self):
+        """A value that changes every time the clipboard content changes, None if the platform can't tell"""
+        return None
+
+    def pull_image_from_clipboard(self, save_name='spio_from_clipboard.png') -> str:
+        """Save the clipboard image to a staging path and return it (file not exist / empty if no image in clipboard)"""
+        return TEMP_STORE.get_staging_path(save_name.split('.')[-1])
+
+    def pull_image_data(self):
+        """Return a ClipboardImage kept in memory (no temp file), None if no image in clipboard"""
+        return None
+
+    def push_to_clipboard(self, paths):
+        pass
+
+    def push_pixel_to_clipboard(self, path):
+        pass
 
 
 class Clipboard():
-    def __init__(self, file_urls=None):
-        if sys.platform not in {'win32', 'darwin'}:
-            raise EnvironmentError
+    def __init__(self, file_urls=None, backend=None):
+        self.backend = get_backend(backend)
+
+    def get_token_key(self):
+        token = self.backend.change_token()
+        return (self.backend.backend_name, token) if token is not None else None
+
+    def pull_payload(self, force_unicode, image_in_memory=False):
+        """Return the classified clipboard content, skip pulling / parsing if nothing changed since last paste"""
+        from .payload import PAYLOAD_CACHE
+
+        token_key = self.get_token_key()
+
+        payload = PAYLOAD_CACHE.get(token_key)
+        if payload is not None:
+            return payload
+
+        payload = self.parse_payload(force_unicode, image_in_memory=image_in_memory)
+        self.finish_payload(payload, token_key)
+
+        return payload
+
+    def parse_payload(self, force_unicode, text=None, image_in_memory=False, run=None):
+        """Pull and classify clipboard content
+        safe to run in a thread when text is given for backends that read the text from blender
+        run: profiler run of the paste, when not parsed on the main thread"""
+        from .payload import ClipboardPayload, PAYLOAD_CACHE, get_raw_hash
+
+        with PROFILER.span('clipboard.pull', run=run):
+            kind, data = self.pull_raw(force_unicode, text)
+
+        if kind == 'IMAGE' and image_in_memory:
+            payload = ClipboardPayload()
+            with PROFILER.span('clipboard.image_data', run=run):
+                payload.image = self.backend.pull_image_data()
+            payload.kind = kind
+            return payload
+
+        # image bytes is saved as a new file every time, nothing to hash
+        raw_key = get_raw_hash(kind, data) if kind != 'IMAGE' else None
+
+        payload = PAYLOAD_CACHE.get(raw_key)
+        if payload is None:
+            with PROFILER.span('clipboard.classify', run=run, kind=kind):
+                payload = ClipboardPayload.from_file_list(self.resolve_raw(kind, data), drop_missing=kind == 'TEXT')
+            payload.kind = kind
+            payload.raw_key = raw_key
+            payload.is_new = True
+
+        return payload
+
+    def finish_payload(self, payload, token_key):
+        """Main thread part of a pull: reload pasted image and cache the payload"""
+        from .payload import PAYLOAD_CACHE
+
+        if payload.is_new and payload.kind == 'IMAGE' and len(payload.file_list) != 0:
+            self.reload_image(payload.file_list[0])
+
+        payload.is_new = False
+        PAYLOAD_CACHE.set(payload, token_key, payload.raw_key)
 
     def pull_files_from_clipboard(self, force_unicode):
-        file_list = []
+        kind, data = self.pull_raw(force_unicode)
+        file_list = self.resolve_raw(kind, data)
 
-        if sys.platform == 'win32':
-            clipboard = WinTypeClipboard()
-            file_list = clipboard.pull(force_unicode)
+        if kind == 'TEXT':
+            from .payload import get_stat_keys
+            keys = get_stat_keys(file_list)
+            file_list = [path for path in file_list if keys[path] is not None]
 
-            del clipboard
+        if kind == 'IMAGE' and len(file_list) != 0:
+            self.reload_image(file_list[0])
 
-            if file_list is None:
-                clipboard = PowerShellClipboard()
-                file_list = clipboard.pull()
+        return file_list
 
-        elif sys.platform == 'darwin':
-            clipboard = MacClipboard()
-            file_list = clipboard.pull()
+    def pull_raw(self, force_unicode, text=None):
+        """Return the kind of clipboard content and the unparsed data"""
+        file_list = self.backend.pull(force_unicode)
 
         # user is copying files
-        if len(file_list) != 0:
-            return file_list
+        if file_list:
+            return 'FILES', file_list
 
         # user is copying strings
-        if bpy.context.window_manager.clipboard != '':
-            res = CheckStringFile().is_something()
-            if res:
-                file_list.append(res)
+        if text is None:
+            text = self.backend.pull_text()
+        if text != '':
+            return 'TEXT', text
 
-            return file_list
+        return 'IMAGE', None
 
-        # user is copying image bytes
-        image_path = self.pull_image_from_clipboard()  # create image from clipboard
+    def resolve_raw(self, kind, data):
+        """Turn the raw clipboard content into file paths"""
+        file_list = []
+
+        if kind == 'FILES':
+            return list(data)
 
-        # check file exist (if image is not exist, return [])
-        if not os.path.isfile(image_path):
-            return file_list
+        if kind == 'TEXT':
+            from .text_parser import parse_text
+            return parse_text(data)
 
-        # check image create time(pull pixel from clipboard time) is smaller than IMAGE_CREATE_TIME_COST
-        if time.time() - os.path.getmtime(image_path) < IMAGE_CREATE_TIME_COST:
+        # user is copying image bytes
+        staging_path = self.pull_image_from_clipboard()  # create image from clipboard
+
+        # store by content, the same image pasted twice share one file (None if no image in clipboard)
+        image_path = TEMP_STORE.adopt(staging_path)
+        if image_path:
             file_list.append(image_path)
-            # reload image before it import (if already reload)
-            if os.path.basename(image_path) in bpy.data.images:
-                bpy.data.images[os.path.basename(image_path)].reload()
-            else:
-                for img in bpy.data.images:
-                    if not img.library and not img.packed_file and img.source not in {'VIEWER',
-                                                                                      'GENERATED'}:
-                        path = os.path.abspath(img.filepath)
-                        if path == image_path:
-                            img.reload()
-                            break
 
         return file_list
 
-    def push_to_clipboard(self, paths):
-        if sys.platform == 'win32':
-            clipboard = PowerShellClipboard()
-        elif sys.platform == 'darwin':
-            clipboard = MacClipboard()
+    @staticmethod
+    def reload_image(image_path):
+        """reload image before it import (if already reload)"""
+        if os.path.basename(image_path) in bpy.data.images:
+            bpy.data.images[os.path.basename(image_path)].reload()
+        else:
+            for img in bpy.data.images:
+                if not img.library and not img.packed_file and img.source not in {'VIEWER',
+                                                                                  'GENERATED'}:
+                    path = os.path.abspath(img.filepath)
+                    if path == image_path:
+                        img.reload()
+                        break
 
-        clipboard.push_to_clipboard(paths)
+    def push_to_clipboard(self, paths):
+        self.backend.push_to_clipboard(paths)
 
     def push_pixel_to_clipboard(self, path):
-        if sys.platform == 'win32':
-            clipboard = PowerShellClipboard()
-        elif sys.platform == 'darwin':
-            clipboard = MacClipboard()
-
-        clipboard.push_pixel_to_clipboard(path)
+        self.backend.push_pixel_to_clipboard(path)
 
     def pull_image_from_clipboard(self):
-        if sys.platform == 'win32':
-            clipboard = PowerShellClipboard()
-        elif sys.platform == 'darwin':
-            clipboard = MacClipboard()
+        return self.backend.pull_image_from_clipboard()
+
+
+class ClipboardPullTask():
+    """Pull clipboard in a background thread, create on the main thread and poll is_done() from a modal/timer
+    the thread result is dropped if cancel() is called"""
+
+    def __init__(self, clipboard, force_unicode=False, image_in_memory=False):
+        from .payload import PAYLOAD_CACHE
+
+        self.clipboard = clipboard
+        self.force_unicode = force_unicode
+        self.image_in_memory = image_in_memory
+        self.payload = None
+        self.error = None
+        self.cancelled = False
+        self.thread = None
+        self.profile_run = PROFILER.current  # the thread records into the paste that started it
+
+        # cheap check on main thread, nothing to do if clipboard not changed
+        self.token_key = clipboard.get_token_key()
+        self.payload = PAYLOAD_CACHE.get(self.token_key)
+        if self.payload is not None: return
+
+        # bpy is not thread safe, read blender's clipboard string here
+        self.text = clipboard.backend.pull_text() if clipboard.backend.main_thread_text else None
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            payload = self.clipboard.parse_payload(self.force_unicode, text=self.text,
+                                                   image_in_memory=self.image_in_memory, run=self.profile_run)
+        except Exception as e:
+            self.error = e
+        else:
+            if not self.cancelled:
+                self.payload = payload
 
-        return clipboard.pull_image_from_clipboard()
+    def is_done(self):
+        return self.thread is None or not self.thread.is_alive()
 
+    def cancel(self):
+        self.cancelled = True
 
-class MacClipboard():
+    def get_payload(self):
+        """Main thread, call when is_done()"""
+        if self.error is not None:
+            raise self.error
+
+        if self.payload.is_new:
+            self.clipboard.finish_payload(self.payload, self.token_key)
+
+        return self.payload
+
+
+@register_backend('MEMORY')
+class MemoryClipboard(ClipboardBackend):
+    """Clipboard kept in python memory, for headless runs (blender --background) and benchmarks
+    use set_payload() to feed synthetic data before calling the operators"""
+    main_thread_text = False
+
+    def __init__(self):
+        self.files = []
+        self.text = ''
+        self.image = None  # png bytes
+        self.sequence = 0
+
+    def set_payload(self, files=None, text='', image=None):
+        self.files = list(files) if files else []
+        self.text = text
+        self.image = image
+        self.sequence += 1
+
+    def change_token(self):
+        return self.sequence
+
+    def clear(self):
+        self.set_payload()
+
+    def pull(self, force_unicode=False):
+        return list(self.files)
+
+    def pull_text(self):
+        return self.text
+
+    def pull_image_from_clipboard(self, save_name='spio_from_clipboard.png'):
+        filepath = super().pull_image_from_clipboard(save_name)
+        if self.image:
+            with open(filepath, 'wb') as f:
+                f.write(self.image)
+
+        return filepath
+
+    def pull_image_data(self):
+        if not self.image: return None
+
+        from .image_data import ClipboardImage
+        return ClipboardImage(encoded=self.image)
+
+    def push_to_clipboard(self, paths):
+        self.set_payload(files=paths)
+
+    def push_pixel_to_clipboard(self, path):
+        with open(path, 'rb') as f:
+            self.set_payload(image=f.read())
+
+
+@register_backend('DARWIN', platform='darwin')
+class MacClipboard(ClipboardBackend):
 
     def pull(self, force_unicode=False):
         self.file_urls = []
@@ -152,6 +355,30 @@ class MacClipboard():
 
         return self.file_urls
 
+    def change_token(self):
+        """NSPasteboard changeCount through the objc runtime"""
+        try:
+            import ctypes
+            import ctypes.util
+
+            objc = ctypes.cdll.LoadLibrary(ctypes.util.find_library('objc'))
+            ctypes.cdll.LoadLibrary(ctypes.util.find_library('AppKit'))
+
+            objc.objc_getClass.restype = ctypes.c_void_p
+            objc.objc_getClass.argtypes = [ctypes.c_char_p]
+            objc.sel_registerName.restype = ctypes.c_void_p
+            objc.sel_registerName.argtypes = [ctypes.c_char_p]
+            objc.objc_msgSend.restype = ctypes.c_void_p
+            objc.objc_msgSend.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+
+            pb = objc.objc_msgSend(objc.objc_getClass(b'NSPasteboard'), objc.sel_registerName(b'generalPasteboard'))
+            if not pb: return None
+
+            objc.objc_msgSend.restype = ctypes.c_long
+            return objc.objc_msgSend(pb, objc.sel_registerName(b'changeCount'))
+        except (OSError, AttributeError, TypeError):
+            return None
+
     def push_pixel_to_clipboard(self, path):
         commands = [
             "set the clipboard to "
@@ -175,8 +402,7 @@ class MacClipboard():
         return args
 
     def pull_image_from_clipboard(self, save_name='spio_from_clipboard.png'):
-        ts = time.strftime('%Y_%m_%d_%H_%M_%S', time.localtime())
-        filepath = os.path.join(get_dir(), ts + '.' + save_name)
+        filepath = TEMP_STORE.get_staging_path(save_name.split('.')[-1])
 
         commands = [
             "set pastedImage to "
@@ -191,6 +417,103 @@ class MacClipboard():
 
         return filepath
 
+    def pull_image_data(self):
+        from .image_data import ClipboardImage, png_from_osascript
+
+        popen = subprocess.run(self.get_osascript_args(["the clipboard as «class PNGf»"]),
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, encoding='utf-8')
+        data = png_from_osascript(popen.stdout)
+
+        return ClipboardImage(encoded=data) if data else None
+
+
+LINUX_HELPER = LinuxHelperProcess()
+
+
+def stop_linux_helper():
+    LINUX_HELPER.stop()
+
+
+@register_backend('LINUX', platform='linux')
+class LinuxClipboard(ClipboardBackend):
+    """X11 / Wayland clipboard, all calls go through the persistent helper process"""
+    main_thread_text = False
+
+    def __init__(self, helper=None):
+        self.helper = helper if helper else LINUX_HELPER
+        self.file_urls = []
+
+    @staticmethod
+    def parse_uri_list(data):
+        from urllib.parse import urlparse, unquote
+
+        file_urls = []
+        for line in data.splitlines():
+            line = line.strip()
+            if line == '' or line.startswith('#'): continue
+
+            uri = urlparse(line)
+            if uri.scheme == 'file':
+                file_urls.append(unquote(uri.path))
+            elif uri.scheme == '' and os.path.isabs(line):
+                file_urls.append(line)
+
+        return file_urls
+
+    def pull(self, force_unicode=False):
+        self.file_urls = []
+        data = self.helper.request('GET', 'text/uri-list')
+        if data:
+            self.file_urls = self.parse_uri_list(data.decode('utf-8', errors='surrogateescape'))
+
+        return self.file_urls
+
+    def change_token(self):
+        try:
+            data = self.helper.request('SEQ')
+        except RuntimeError:  # helper without change tracking
+            return None
+
+        return int(data) if data else None
+
+    def pull_text(self):
+        data = self.helper.request('GET', 'text/plain')
+        return data.decode('utf-8', errors='replace') if data else ''
+
+    def push_text(self, text):
+        self.helper.request('SET', 'text/plain', text.encode('utf-8'))
+
+    def push_to_clipboard(self, paths):
+        from pathlib import Path
+
+        uris = '\r\n'.join(Path(path).absolute().as_uri() for path in paths)
+        self.helper.request('SET', 'text/uri-list', (uris + '\r\n').encode('utf-8'))
+
+    def push_pixel_to_clipboard(self, path):
+        with open(path, 'rb') as f:
+            self.helper.request('SET', 'image/png', f.read())
+
+    def pull_image_from_clipboard(self, save_name='spio_from_clipboard.png'):
+        filepath = TEMP_STORE.get_staging_path(save_name.split('.')[-1])
+
+        data = self.helper.request('GET', 'image/png')
+        if data:
+            with open(filepath, 'wb') as f:
+                f.write(data)
+
+        return filepath
+
+    def pull_image_data(self):
+        from .image_data import ClipboardImage, image_from_rgba_buffer
+
+        # raw pixels from the gtk helper, skip png decoding
+        data = self.helper.request('GET', 'image/x-spio-rgba')
+        if data:
+            return image_from_rgba_buffer(data)
+
+        data = self.helper.request('GET', 'image/png')
+        return ClipboardImage(encoded=data) if data else None
+
 
 class PowerShellClipboard:
     def get_args(self, script):
@@ -264,8 +587,7 @@ class PowerShellClipboard:
         return self.file_urls
 
     def pull_image_from_clipboard(self, save_name='spio_from_clipboard.png'):
-        ts = time.strftime('%Y_%m_%d_%H_%M_%S', time.localtime())
-        filepath = os.path.join(get_dir(), ts + '.' + save_name)
+        filepath = TEMP_STORE.get_staging_path(save_name.split('.')[-1])
 
         if sys.platform == 'win32':
             image_script = (
@@ -321,6 +643,20 @@ class WinTypeClipboard:
         self.DragQueryFile = s32.DragQueryFile
         self.DragQueryFile.argtypes = [w.HANDLE, w.UINT, ctypes.c_void_p, w.UINT]
 
+        self.CF_DIB = 8
+
+        self.GlobalLock = k32.GlobalLock
+        self.GlobalLock.argtypes = w.HGLOBAL,
+        self.GlobalLock.restype = w.LPVOID
+
+        self.GlobalUnlock = k32.GlobalUnlock
+        self.GlobalUnlock.argtypes = w.HGLOBAL,
+        self.GlobalUnlock.restype = w.BOOL
+
+        self.GlobalSize = k32.GlobalSize
+        self.GlobalSize.argtypes = w.HGLOBAL,
+        self.GlobalSize.restype = ctypes.c_size_t
+
     @property
     def file_list(self):
         return self.file_urls
@@ -348,3 +684,53 @@ class WinTypeClipboard:
             pass
         finally:
             self.CloseClipboard()
+
+    def pull_dib(self):
+        """Copy the CF_DIB memory (windows convert any bitmap / png in clipboard to it)"""
+        import ctypes
+
+        if not self.OpenClipboard(None): return None
+        try:
+            handle = self.GetClipboardData(self.CF_DIB)
+            if not handle: return None
+
+            pointer = self.GlobalLock(handle)
+            if not pointer: return None
+            try:
+                return ctypes.string_at(pointer, self.GlobalSize(handle))
+            finally:
+                self.GlobalUnlock(handle)
+        finally:
+            self.CloseClipboard()
+
+
+@register_backend('WINDOWS', platform='win32')
+class WindowsClipboard(ClipboardBackend):
+    """Read file drop list with ctypes, fallback to powershell"""
+
+    def pull(self, force_unicode=False):
+        file_list = WinTypeClipboard().pull(force_unicode)
+
+        if file_list is None:
+            file_list = PowerShellClipboard().pull()
+
+        return file_list
+
+    def change_token(self):
+        import ctypes
+        return ctypes.windll.user32.GetClipboardSequenceNumber()
+
+    def pull_image_data(self):
+        from .image_data import image_from_dib
+
+        data = WinTypeClipboard().pull_dib()
+        return image_from_dib(data) if data else None
+
+    def pull_image_from_clipboard(self, save_name='spio_from_clipboard.png'):
+        return PowerShellClipboard().pull_image_from_clipboard(save_name)
+
+    def push_to_clipboard(self, paths):
+        PowerShellClipboard().push_to_clipboard(paths)
+
+    def push_pixel_to_clipboard(self, path):
+        PowerShellClipboard().push_pixel_to_clipboard(path)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import struct
+import hashlib
+from functools import partial
+
+BI_BITFIELDS = 3
+
+
+class ClipboardImage():
+    """Image pulled from clipboard and kept in memory
+
+    pixels: float32 RGBA array, rows from bottom to top (blender order), ready for Image.pixels.foreach_set
+    decoder: callable returning the pixels, the 8 bit buffer is converted only when the image is not pasted yet
+    encoded: compressed file bytes (png) when the platform can't give raw pixels, decoded by blender itself
+    """
+
+    def __init__(self, width=0, height=0, pixels=None, encoded=None, ext='png', hash=None, decoder=None):
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+        self.decoder = decoder
+        self.encoded = encoded
+        self.ext = ext
+        self.hash = hash  # content hash, used to reuse an image already pasted
+
+    def is_raw(self):
+        return self.pixels is not None or self.decoder is not None
+
+    def get_pixels(self):
+        if self.pixels is None and self.decoder is not None:
+            self.pixels = self.decoder()
+            self.decoder = None
+        return self.pixels
+
+    def get_bytes(self):
+        if self.is_raw():
+            return self.get_pixels().tobytes()
+        return self.encoded
+
+    def get_hash(self):
+        """sha1 of the source bytes, set by the readers from the 8 bit buffer (cheaper than float pixels)"""
+        if self.hash is None:
+            self.hash = hashlib.sha1(self.get_bytes()).hexdigest()
+        return self.hash
+
+
+def rgba8_to_pixels(buffer, width, height, rowstride, channels, top_down=True, bgr=False):
+    """Convert 8 bit rows (gray / rgb / rgba) into blender float RGBA pixels in one numpy pass"""
+    import numpy as np
+
+    data = np.frombuffer(buffer, dtype=np.uint8, count=height * rowstride)
+    rows = data.reshape(height, rowstride)[:, :width * channels].reshape(height, width, channels)
+    if top_down:
+        rows = rows[::-1]
+
+    pixels = np.empty((height, width, 4), dtype=np.float32)
+    if channels >= 3:
+        pixels[..., :3] = rows[..., 2::-1] if bgr else rows[..., :3]
+    else:
+        pixels[..., :3] = rows[..., :1]
+
+    if channels in {2, 4} and rows[..., -1].any():
+        pixels[..., 3] = rows[..., -1]
+    else:
+        # 32 bit dib often leave alpha to 0, treat as opaque
+        pixels[..., 3] = 255
+
+    pixels *= 1 / 255
+
+    return pixels.ravel()
+
+
+def image_from_dib(data):
+    """Windows CF_DIB / CF_DIBV5 memory (BITMAPINFOHEADER + pixels)"""
+    if len(data) < 40: return None
+
+    header_size, width, height, planes, bit_count, compression = struct.unpack_from('<IiiHHI', data, 0)
+    if bit_count not in {24, 32}: return None
+
+    offset = header_size
+    if compression == BI_BITFIELDS and header_size == 40:
+        offset += 12  # color masks follow the v1 header
+
+    top_down = height < 0
+    height = abs(height)
+    rowstride = ((width * bit_count + 31) // 32) * 4
+
+    decoder = partial(rgba8_to_pixels, memoryview(data)[offset:], width, height, rowstride, bit_count // 8,
+                      top_down=top_down, bgr=True)
+
+    return ClipboardImage(width, height, decoder=decoder, hash=hashlib.sha1(data).hexdigest())
+
+
+def image_from_rgba_buffer(data):
+    """'<width> <height> <rowstride> <channels>\\n' + rows, top to bottom (linux helper image/x-spio-rgba)"""
+    header, _, buffer = data.partition(b'\n')
+    width, height, rowstride, channels = (int(v) for v in header.split())
+    # gdk pixbuf does not pad the last row
+    if len(buffer) < height * rowstride:
+        buffer = buffer + bytes(height * rowstride - len(buffer))
+
+    decoder = partial(rgba8_to_pixels, buffer, width, height, rowstride, channels, top_down=True)
+
+    return ClipboardImage(width, height, decoder=decoder, hash=hashlib.sha1(data).hexdigest())
+
+
+def png_from_osascript(text):
+    """osascript print clipboard data as «data PNGf89504E47...»"""
+    text = text.strip()
+    prefix = '«data PNGf'
+    if not text.startswith(prefix): return None
+
+    return bytes.fromhex(text[len(prefix):].rstrip('»'))
@@ -0,0 +1,234 @@
+"""Persistent clipboard helper for X11/Wayland.
+
+This script is started once by ``LinuxClipboard`` with the system python (not blender's python)
+and stays alive, answering requests on stdin/stdout so a paste does not pay a process startup.
+
+Protocol (one request at a time, binary safe):
+    request:  ``<CMD> <mime> <length>\\n`` followed by ``length`` bytes of payload
+    response: ``OK <length>\\n`` + payload | ``NONE 0\\n`` | ``ERR <length>\\n`` + utf-8 message
+
+Commands:
+    PING - 0            check the helper is alive
+    SEQ  - 0            clipboard change counter (NONE if the backend can't watch the clipboard)
+    GET  <mime> 0       read the clipboard content for a mime type (text/plain, text/uri-list, image/png)
+                        image/x-spio-rgba return raw rows: ``<width> <height> <rowstride> <channels>\n`` + pixels
+    SET  <mime> <n>     own the clipboard and offer the payload for a mime type
+    QUIT - 0            exit
+
+Any executable speaking this protocol can replace this script (see SPIO_CLIPBOARD_HELPER),
+which is how the backend is tested without a display server.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+TEXT_TARGETS = ('UTF8_STRING', 'STRING', 'TEXT', 'text/plain;charset=utf-8', 'text/plain')
+
+
+def read_request(stream):
+    header = stream.readline()
+    if not header:
+        return None
+
+    cmd, mime, length = header.decode('utf-8').split()
+    length = int(length)
+    payload = stream.read(length) if length else b''
+
+    return cmd, mime, payload
+
+
+def write_response(stream, status, payload=b''):
+    stream.write(f'{status} {len(payload)}\n'.encode('utf-8'))
+    if payload:
+        stream.write(payload)
+    stream.flush()
+
+
+def uri_list_to_gnome(payload):
+    """nautilus / nemo only paste files from their own target"""
+    uris = [line for line in payload.decode('utf-8').splitlines() if line and not line.startswith('#')]
+    return ('copy\n' + '\n'.join(uris)).encode('utf-8')
+
+
+class GtkBackend():
+    """Own the selection with GTK so the content stays available while blender is running"""
+
+    def __init__(self):
+        import gi
+        gi.require_version('Gtk', '3.0')
+        gi.require_version('Gdk', '3.0')
+        from gi.repository import Gtk, Gdk, GLib
+
+        self.Gtk = Gtk
+        self.Gdk = Gdk
+        self.GLib = GLib
+
+        # gtk import fine without display, but there is no clipboard
+        self.clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
+        if self.clipboard is None:
+            raise RuntimeError('No display for the GTK clipboard')
+        self.clipboard.connect('owner-change', self.on_owner_change)
+        self.sequence = 0
+
+        self.owner = Gtk.Invisible()
+        self.owner.connect('selection-get', self.on_selection_get)
+        self.offers = dict()
+
+    def on_owner_change(self, clipboard, event):
+        self.sequence += 1
+
+    def on_selection_get(self, widget, selection_data, info, time):
+        target = selection_data.get_target().name()
+        data = self.offers.get(target)
+        if data is not None:
+            selection_data.set(selection_data.get_target(), 8, data)
+
+    def get(self, mime):
+        if mime == 'text/plain':
+            text = self.clipboard.wait_for_text()
+            return text.encode('utf-8') if text is not None else None
+
+        if mime == 'image/x-spio-rgba':
+            pixbuf = self.clipboard.wait_for_image()
+            if pixbuf is None or pixbuf.get_bits_per_sample() != 8:
+                return None
+
+            header = f'{pixbuf.get_width()} {pixbuf.get_height()} {pixbuf.get_rowstride()} {pixbuf.get_n_channels()}\n'
+            return header.encode('utf-8') + pixbuf.get_pixels()
+
+        selection_data = self.clipboard.wait_for_contents(self.Gdk.Atom.intern(mime, False))
+        if selection_data is None:
+            return None
+
+        data = selection_data.get_data()
+        return bytes(data) if data else None
+
+    def set(self, mime, payload):
+        offers = dict()
+        if mime == 'text/plain':
+            for target in TEXT_TARGETS:
+                offers[target] = payload
+        elif mime == 'text/uri-list':
+            offers[mime] = payload
+            offers['x-special/gnome-copied-files'] = uri_list_to_gnome(payload)
+        else:
+            offers[mime] = payload
+
+        selection = self.Gdk.SELECTION_CLIPBOARD
+        self.owner.selection_clear_targets(selection)
+        for index, target in enumerate(offers):
+            self.owner.selection_add_target(selection, self.Gdk.Atom.intern(target, False), index)
+
+        self.offers = offers
+        self.Gtk.selection_owner_set(self.owner, selection, self.Gdk.CURRENT_TIME)
+
+    def run(self, handle):
+        stdin = sys.stdin.buffer
+
+        def on_stdin(source, condition):
+            if condition & (self.GLib.IO_HUP | self.GLib.IO_ERR):
+                self.Gtk.main_quit()
+                return False
+
+            if handle(stdin) is False:
+                self.Gtk.main_quit()
+                return False
+            return True
+
+        self.GLib.io_add_watch(stdin.fileno(), self.GLib.IO_IN | self.GLib.IO_HUP | self.GLib.IO_ERR, on_stdin)
+        self.Gtk.main()
+
+
+class ToolBackend():
+    """Fallback when PyGObject is missing: wl-clipboard on wayland, xclip on X11"""
+
+    def __init__(self):
+        self.wayland = bool(os.environ.get('WAYLAND_DISPLAY')) and shutil.which('wl-paste') is not None
+        if not self.wayland and shutil.which('xclip') is None:
+            raise EnvironmentError('No clipboard tool found, install python3-gi, wl-clipboard or xclip')
+
+        self.sequence = None  # no way to watch the clipboard without a main loop
+
+    def get(self, mime):
+        if mime == 'image/x-spio-rgba':
+            return None  # no raw pixels from command line tools
+
+        if self.wayland:
+            args = ['wl-paste', '--no-newline', '--type', mime]
+        else:
+            args = ['xclip', '-selection', 'clipboard', '-out', '-target',
+                    'UTF8_STRING' if mime == 'text/plain' else mime]
+
+        popen = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        if popen.returncode != 0 or not popen.stdout:
+            return None
+
+        return popen.stdout
+
+    def set(self, mime, payload):
+        if self.wayland:
+            args = ['wl-copy', '--type', mime]
+        else:
+            args = ['xclip', '-selection', 'clipboard', '-in', '-target',
+                    'UTF8_STRING' if mime == 'text/plain' else mime]
+
+        # both tools fork to keep serving the selection
+        subprocess.run(args, input=payload, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def run(self, handle):
+        stdin = sys.stdin.buffer
+        while handle(stdin) is not False:
+            pass
+
+
+def get_backend():
+    try:
+        return GtkBackend()
+    except (ImportError, ValueError, RuntimeError):
+        return ToolBackend()
+
+
+def main():
+    backend = get_backend()
+    stdout = sys.stdout.buffer
+
+    def handle(stdin):
+        request = read_request(stdin)
+        if request is None:
+            return False
+
+        cmd, mime, payload = request
+        try:
+            if cmd == 'PING':
+                write_response(stdout, 'OK')
+            elif cmd == 'SEQ':
+                if backend.sequence is None:
+                    write_response(stdout, 'NONE')
+                else:
+                    write_response(stdout, 'OK', str(backend.sequence).encode('utf-8'))
+            elif cmd == 'GET':
+                data = backend.get(mime)
+                if data is None:
+                    write_response(stdout, 'NONE')
+                else:
+                    write_response(stdout, 'OK', data)
+            elif cmd == 'SET':
+                backend.set(mime, payload)
+                write_response(stdout, 'OK')
+            elif cmd == 'QUIT':
+                write_response(stdout, 'OK')
+                return False
+            else:
+                write_response(stdout, 'ERR', f'Unknown command {cmd}'.encode('utf-8'))
+        except Exception as e:
+            write_response(stdout, 'ERR', str(e).encode('utf-8'))
+
+        return True
+
+    backend.run(handle)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Client of the persistent clipboard helper (see linux/spio_clipboard_helper.py for the protocol)
+
+No bpy here, the process handling is tested with a fake helper (tests/fake_clipboard_helper.py).
+"""
+
+from __future__ import annotations
+
+import os
+import shlex
+import shutil
+import select
+import subprocess
+import threading
+
+TIMEOUT = 5.0  # seconds to wait for an answer, the clipboard owner can hang
+
+
+class LinuxHelperProcess():
+    """One long-lived helper process shared by every LinuxClipboard call
+    set SPIO_CLIPBOARD_HELPER to a command line to replace the default helper (eg. a fake binary for testing)"""
+
+    def __init__(self, args=None, timeout=TIMEOUT):
+        self.args = args
+        self.timeout = timeout
+        self.popen = None
+        self.lock = threading.Lock()
+
+    def get_args(self):
+        if self.args:
+            return self.args
+
+        custom = os.environ.get('SPIO_CLIPBOARD_HELPER')
+        if custom:
+            return shlex.split(custom)
+
+        # blender's python has no gi module, use the system python
+        python = shutil.which('python3') or shutil.which('python')
+        if python is None:
+            raise EnvironmentError('python3 is required to run the clipboard helper')
+
+        script = os.path.join(os.path.dirname(__file__), 'linux', 'spio_clipboard_helper.py')
+        return [python, script]
+
+    def is_alive(self):
+        return self.popen is not None and self.popen.poll() is None
+
+    def start(self):
+        self.popen = subprocess.Popen(self.get_args(),
+                                      stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.DEVNULL)
+
+    def stop(self):
+        if not self.is_alive():
+            self.popen = None
+            return
+        try:
+            self._send('QUIT', '-', b'')
+            self.popen.wait(timeout=1)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self.popen.kill()
+        finally:
+            self.popen = None
+
+    def kill(self):
+        """Helper not answering, a QUIT would not be read either"""
+        if self.popen is None: return
+        self.popen.kill()
+        self.popen.wait()
+        self.popen = None
+
+    def _wait_readable(self):
+        # the previous answer was read to its end, nothing is left in the read buffer
+        ready, _, _ = select.select([self.popen.stdout], [], [], self.timeout)
+        if not ready:
+            raise TimeoutError(f'Clipboard helper did not answer in {self.timeout} seconds')
+
+    def _send(self, cmd, mime, payload):
+        self.popen.stdin.write(f'{cmd} {mime} {len(payload)}\n'.encode('utf-8'))
+        if payload:
+            self.popen.stdin.write(payload)
+        self.popen.stdin.flush()
+
+        if self.timeout: self._wait_readable()
+        header = self.popen.stdout.readline()
+        if not header:
+            raise BrokenPipeError('Clipboard helper exit unexpectedly')
+
+        status, length = header.decode('utf-8').split()
+        length = int(length)
+        data = self.popen.stdout.read(length) if length else b''
+
+        if status == 'ERR':
+            raise RuntimeError(data.decode('utf-8', errors='replace'))
+
+        return data if status == 'OK' else None
+
+    def request(self, cmd, mime='-', payload=b''):
+        with self.lock:
+            # restart once if the helper die between two paste
+            for retry in (True, False):
+                if not self.is_alive():
+                    self.start()
+                try:
+                    return self._send(cmd, mime, payload)
+                except TimeoutError:
+                    # a hung helper is not asked again, the next request starts a new one
+                    self.kill()
+                    raise
+                except (BrokenPipeError, ValueError, OSError):
+                    self.stop()
+                    if not retry: raise
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+import stat
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def get_stat_key(path):
+    """cheap revalidation key of a path, None if the path not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return st.st_mtime_ns, st.st_size, stat.S_ISDIR(st.st_mode)
+
+
+SCANDIR_MIN_FILES = 8  # below this, stat each path instead of listing the whole folder
+
+
+def get_stat_keys(paths):
+    """Stat keys of many paths, one os.scandir per parent folder instead of one stat per path"""
+    keys = dict()
+    groups = dict()  # parent dir: [(name, path)]
+    for path in paths:
+        parent, name = os.path.split(path.rstrip('/\\') or path)
+        groups.setdefault(parent, []).append((name, path))
+
+    for parent, children in groups.items():
+        if len(children) < SCANDIR_MIN_FILES:
+            for name, path in children:
+                keys[path] = get_stat_key(path)
+            continue
+
+        try:
+            with os.scandir(parent) as it:
+                entries = {os.path.normcase(entry.name): entry for entry in it}
+        except OSError:
+            for name, path in children:
+                keys[path] = None
+            continue
+
+        for name, path in children:
+            entry = entries.get(os.path.normcase(name))
+            if entry is None:
+                # case insensitive / unicode normalized file system
+                keys[path] = get_stat_key(path)
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                keys[path] = None
+                continue
+
+            keys[path] = (st.st_mtime_ns, st.st_size, stat.S_ISDIR(st.st_mode))
+
+    return keys
+
+
+class ClipboardPayload():
+    """Classified clipboard content: files to import, folders and the dominant extension"""
+
+    def __init__(self, file_list=None, dir_list=None, ext=None, missing_list=None, stats=None):
+        self.file_list = file_list if file_list is not None else []
+        self.dir_list = dir_list if dir_list is not None else []
+        self.missing_list = missing_list if missing_list is not None else []
+        self.ext = ext
+        self.ext_list = []
+        # raw clipboard content info
+        self.kind = None  # FILES / TEXT / IMAGE
+        self.raw_key = None
+        self.is_new = False  # not finished on main thread yet
+        self.image = None  # ClipboardImage when image is pasted without temp file
+        # path: stat key, used to trust the cache
+        self.stats = stats if stats is not None else dict()
+
+    @classmethod
+    def from_file_list(cls, file_list, drop_missing=False):
+        """drop_missing: ignore paths that not exist (paths guessed from text)"""
+        payload = cls()
+        keys = get_stat_keys(file_list)
+
+        for file_path in file_list:
+            key = keys[file_path]
+            payload.stats[file_path] = key  # also watch missing path, the cache is dropped once created
+            if key is None and drop_missing: continue
+
+            if key is not None and key[2]:
+                payload.dir_list.append(file_path)  # add dir list for batch import folder's files
+                continue
+            elif key is None:
+                payload.missing_list.append(file_path)
+
+            # pass extra file
+            extension = file_path.split('.')[-1].lower()
+            if extension in {'mtl'}:
+                continue
+
+            payload.file_list.append(file_path)
+
+        payload.ext_list = [file.split('.')[-1].lower() for file in payload.file_list]
+        payload.ext = payload.get_main_ext()
+
+        return payload
+
+    def get_main_ext(self):
+        ext_count_dict = dict()
+        for ext in self.ext_list:
+            ext_count_dict[ext] = ext_count_dict.get(ext, 0) + 1
+
+        if len(ext_count_dict) == 0: return None
+
+        max_count = max(ext_count_dict.values())
+        # keep the first ext in clipboard order if count is equal
+        for key, value in ext_count_dict.items():
+            if value == max_count:
+                return key
+
+    def is_empty(self):
+        return len(self.file_list) == 0 and len(self.dir_list) == 0 and self.image is None
+
+    def is_multi_ext(self):
+        return len(set(self.ext_list)) > 1
+
+    def is_valid(self):
+        """True if no path has been modified / removed / created since classification"""
+        return get_stat_keys(self.stats) == self.stats
+
+
+def get_raw_hash(kind, data):
+    """Hash of the raw clipboard content (file list or string)"""
+    if kind == 'FILES':
+        data = '\0'.join(data)
+
+    return kind + hashlib.sha1(data.encode('utf-8', errors='surrogateescape')).hexdigest()
+
+
+class PayloadCache():
+    """Keep the last classified payloads, keyed by clipboard change token or raw content hash"""
+
+    def __init__(self, max_size=8):
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()  # clipboard can be pulled in a thread
+
+    def get(self, key):
+        if key is None: return None
+
+        with self.lock:
+            payload = self.items.get(key)
+        if payload is None: return None
+
+        if not payload.is_valid():
+            with self.lock:
+                self.items.pop(key, None)
+            return None
+
+        with self.lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+
+        return payload
+
+    def set(self, payload, *keys):
+        with self.lock:
+            for key in keys:
+                if key is None: continue
+                self.items[key] = payload
+                self.items.move_to_end(key)
+
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+PAYLOAD_CACHE = PayloadCache()
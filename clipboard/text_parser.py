@@ -0,0 +1,72 @@
+"""Find file paths in clipboard text
+
+Handles a single path, newline separated path lists (scripts, spreadsheets, "Copy as path"),
+file:// uris, glob patterns and svg markup. Existence is checked later in one batch by
+ClipboardPayload.from_file_list, so a long list is resolved with one scandir per folder.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import glob
+from urllib.parse import urlparse, unquote
+
+GLOB_CHARS = frozenset('*?[')
+QUOTES = '"\''
+
+
+def is_svg(text):
+    text = text.strip()
+    return text.endswith('</svg>') and '<svg' in text
+
+
+def uri_to_path(uri):
+    parsed = urlparse(uri)
+    path = unquote(parsed.path)
+    if parsed.netloc and parsed.netloc != 'localhost':
+        path = f'//{parsed.netloc}{path}'  # network share
+    if sys.platform == 'win32' and len(path) > 2 and path[0] == '/' and path[2] == ':':
+        path = path[1:]  # /C:/foo -> C:/foo
+
+    return path
+
+
+def iter_line_paths(text):
+    """yield absolute paths from each line, other lines are ignored"""
+    for line in text.splitlines():
+        line = line.strip().strip(QUOTES)
+        if line == '' or line.startswith('#'): continue  # text/uri-list comment
+
+        if line.startswith('file:'):
+            line = uri_to_path(line)
+
+        line = os.path.expanduser(line)
+        if not os.path.isabs(line): continue
+
+        if GLOB_CHARS.isdisjoint(line):
+            yield line
+            continue
+
+        # '[' is also legal in file names, keep the line if nothing match
+        matches = glob.glob(line)
+        if matches:
+            yield from sorted(matches)
+        else:
+            yield line
+
+
+def parse_text(text):
+    """Return candidate paths found in clipboard text (not checked for existence)"""
+    if is_svg(text):
+        from ..temp_store import TEMP_STORE
+        return [TEMP_STORE.write_bytes(text.strip().encode('utf-8'), 'svg')]
+
+    paths = list()
+    seen = set()
+    for path in iter_line_paths(text):
+        if path in seen: continue
+        seen.add(path)
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,74 @@
+"""Enable blender's io add-ons the first time one of their operators is used
+
+The add-ons used to be enabled on every startup, whether the format was pasted in the session or not.
+The importer / exporter tables are OperatorTable, looking up an extension enables the add-on of its
+operator once. The result is cached for the session.
+"""
+
+import bpy
+
+OPERATOR_ADDONS = {
+    'import_image.to_plane': 'io_import_images_as_planes',
+    'import_scene.dxf': 'io_import_dxf',
+    'import_scene.obj': 'io_scene_obj',  # 3.1 and heigher obj io
+    'export_scene.obj': 'io_scene_obj',
+    'import_scene.fbx': 'io_scene_fbx',
+    'export_scene.fbx': 'io_scene_fbx',
+    'import_scene.gltf': 'io_scene_gltf2',
+    'export_scene.gltf': 'io_scene_gltf2',
+    'import_curve.svg': 'io_curve_svg',
+    'import_mesh.stl': 'io_mesh_stl',
+    'export_mesh.stl': 'io_mesh_stl',
+    'import_mesh.ply': 'io_mesh_ply',
+    'export_mesh.ply': 'io_mesh_ply',
+    'import_anim.bvh': 'io_anim_bvh',
+}
+
+RESOLVED = dict()  # bl_idname: operator is available
+
+
+def has_operator(bl_idname):
+    cat, name = bl_idname.split('.')
+    try:
+        getattr(getattr(bpy.ops, cat), name).get_rna_type()
+    except KeyError:
+        return False
+
+    return True
+
+
+def ensure_operator(bl_idname):
+    """Enable the add-on that defines the operator if needed, False if the operator is still missing"""
+    if not bl_idname: return False
+
+    found = RESOLVED.get(bl_idname)
+    if found is not None: return found
+
+    module = OPERATOR_ADDONS.get(bl_idname)
+    if module is None:
+        found = True  # build-in or spio operator, nothing to enable
+    else:
+        if not has_operator(bl_idname):
+            from addon_utils import enable
+            try:
+                enable(module)
+            except ModuleNotFoundError:
+                pass
+        found = has_operator(bl_idname)
+
+    RESOLVED[bl_idname] = found
+    return found
+
+
+class OperatorTable(dict):
+    """ext: bl_idname, the add-on of the operator is enabled when an extension is looked up
+    iterating (menus) does not enable anything"""
+
+    def __getitem__(self, ext):
+        bl_idname = super().__getitem__(ext)
+        ensure_operator(bl_idname)
+        return bl_idname
+
+    def get(self, ext, default=None):
+        if ext not in self: return default
+        return self[ext]
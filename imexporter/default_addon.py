@@ -4,6 +4,8 @@ importer_addon = {
     'ADDONS_INSTALL_ADDON': 'spio.import_addon',
     'ADDONS_IMPORT_IES': 'spio.import_ies',
     'ADDONS_IMPORT_PBR_ZIP': 'spio.import_pbr_zip',
+    'ADDONS_IMPORT_STL_FAST': 'spio.import_stl_fast',
+    'ADDONS_IMPORT_PLY_FAST': 'spio.import_ply_fast',
 }
 
 # v1
@@ -44,4 +46,18 @@ addon_lib = {
         'icon': 'MATERIAL',
         'number': 105
     },
+    'ADDONS_IMPORT_STL_FAST': {
+        'bl_idname': 'spio.import_stl_fast',
+        'name': 'Import STL Fast (.stl)',
+        'description': 'Import STL with the SPIO NumPy reader',
+        'icon': 'IMPORT',
+        'number': 106
+    },
+    'ADDONS_IMPORT_PLY_FAST': {
+        'bl_idname': 'spio.import_ply_fast',
+        'name': 'Import PLY Fast (.ply)',
+        'description': 'Import PLY meshes and point clouds with the SPIO NumPy reader',
+        'icon': 'IMPORT',
+        'number': 107
+    },
 }
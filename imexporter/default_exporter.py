@@ -1,5 +1,7 @@
 import bpy.app
 
+from .addon_loader import OperatorTable
+
 exporter_lib = {
     'EXPORT_DAE': {
         'name': 'Collada (.dae)',
@@ -180,8 +182,15 @@ exporter_ops_props = {
 }
 
 
+_tables = dict()  # (cpp_obj_exporter, extend): OperatorTable
+
+
 def get_exporter(cpp_obj_exporter=True, extend=False):
-    m = exporter_min.copy()
+    """ext: bl_idname, the io add-on of an exporter is enabled the first time its extension is looked up"""
+    m = _tables.get((cpp_obj_exporter, extend))
+    if m is not None: return m
+
+    m = OperatorTable(exporter_min)
     if cpp_obj_exporter and bpy.app.version >= (3, 1, 0):
         m['obj'] = 'wm.obj_export'
     elif bpy.app.version >= (4, 0, 0):
@@ -189,6 +198,7 @@ def get_exporter(cpp_obj_exporter=True, extend=False):
     if extend:
         m.update(exporter_extend)
 
+    _tables[(cpp_obj_exporter, extend)] = m
     return m
 
 
@@ -1,5 +1,7 @@
 import bpy
 
+from .addon_loader import OperatorTable
+
 importer = {
     'usd': 'wm.usd_import',
     'usdc': 'wm.usd_import',
@@ -25,13 +27,21 @@ importer = {
 }
 
 
+_tables = dict()  # cpp_obj_importer: OperatorTable
+
+
 def get_importer(cpp_obj_importer=True):
-    im = importer.copy()
+    """ext: bl_idname, the io add-on of an importer is enabled the first time its extension is looked up"""
+    im = _tables.get(cpp_obj_importer)
+    if im is not None: return im
+
+    im = OperatorTable(importer)
     if bpy.app.version >= (4,0,0):
         im['obj'] = 'wm.obj_import'
     elif cpp_obj_importer and bpy.app.version >= (3, 2, 0):
         im['obj'] = 'wm.obj_import'
 
+    _tables[cpp_obj_importer] = im
     return im
 
 
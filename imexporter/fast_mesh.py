@@ -0,0 +1,55 @@
+"""Build blender meshes from NumPy arrays in bulk (foreach_set), used by the SPIO fast readers"""
+
+import bpy
+import numpy as np
+
+
+def mesh_from_arrays(name, vertices, faces=None, corners_per_face=3, face_sizes=None):
+    """vertices: (v, 3) float, faces: (f, corners_per_face) int or None for a point cloud
+    mixed polygons: faces is the flat corner indices and face_sizes the corner count of each face"""
+    mesh = bpy.data.meshes.new(name)
+
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set('co', np.ascontiguousarray(vertices, dtype=np.float32).ravel())
+
+    if faces is not None and len(faces) != 0:
+        if face_sizes is None:
+            face_count = len(faces)
+            # loop_total is computed from the starts
+            loop_starts = np.arange(0, face_count * corners_per_face, corners_per_face, dtype=np.int32)
+        else:
+            face_count = len(face_sizes)
+            loop_starts = np.zeros(face_count, dtype=np.int32)
+            np.cumsum(face_sizes[:-1], out=loop_starts[1:])
+
+        corners = np.ascontiguousarray(faces, dtype=np.int32).ravel()
+        mesh.loops.add(len(corners))
+        mesh.loops.foreach_set('vertex_index', corners)
+
+        mesh.polygons.add(face_count)
+        mesh.polygons.foreach_set('loop_start', loop_starts)
+
+    mesh.update()
+
+    return mesh
+
+
+def set_point_attribute(mesh, name, values, data_type='FLOAT_VECTOR', domain='POINT'):
+    """Write a per point array into a mesh attribute (normals, colors...)"""
+    attr = mesh.attributes.new(name, data_type, domain)
+    key = 'color' if data_type in {'FLOAT_COLOR', 'BYTE_COLOR'} else ('vector' if data_type == 'FLOAT_VECTOR' else 'value')
+    attr.data.foreach_set(key, np.ascontiguousarray(values, dtype=np.float32).ravel())
+
+    return attr
+
+
+def add_mesh_object(context, name, mesh):
+    obj = bpy.data.objects.new(name, mesh)
+    context.collection.objects.link(obj)
+
+    for o in context.selected_objects:
+        o.select_set(False)
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+
+    return obj
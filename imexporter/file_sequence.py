@@ -0,0 +1,72 @@
+"""Detect numbered file sequences (smoke_0001.vdb ... smoke_0240.vdb) in a file list"""
+
+import os
+import re
+
+FRAME_PATTERN = re.compile(r'^(.*?)(\d+)(\.[^.]+)$')
+SEQUENCE_MIN_FILES = 3  # part_1.obj, part_2.obj are more likely separate models
+
+
+class FileSequence():
+    def __init__(self, directory, prefix, suffix):
+        self.directory = directory
+        self.prefix = prefix
+        self.suffix = suffix
+        self.files = dict()  # frame: file name
+
+    @property
+    def frames(self):
+        return sorted(self.files)
+
+    @property
+    def first_path(self):
+        return self.get_path(self.frames[0])
+
+    @property
+    def name(self):
+        """smoke_0001.vdb -> smoke"""
+        return self.prefix.rstrip('_.- ') or os.path.splitext(self.files[self.frames[0]])[0]
+
+    @property
+    def ext(self):
+        return self.suffix[1:].lower()
+
+    def get_path(self, frame):
+        return os.path.join(self.directory, self.files[frame])
+
+    def get_paths(self):
+        return [self.get_path(frame) for frame in self.frames]
+
+    def __len__(self):
+        return len(self.files)
+
+
+def split_frame(path):
+    """(directory, prefix, frame, suffix), None if the name does not end with a number"""
+    directory, name = os.path.split(path)
+    match = FRAME_PATTERN.match(name)
+    if match is None: return None
+
+    prefix, digits, suffix = match.groups()
+    return directory, prefix, int(digits), suffix
+
+
+def group_sequences(file_list, min_files=SEQUENCE_MIN_FILES):
+    """Return (sequences, other files), file order is kept for the other files"""
+    groups = dict()  # (directory, prefix, suffix): FileSequence
+    for path in file_list:
+        parts = split_frame(path)
+        if parts is None: continue
+
+        directory, prefix, frame, suffix = parts
+        key = (os.path.normcase(directory), prefix, suffix.lower())
+        seq = groups.get(key)
+        if seq is None:
+            seq = groups[key] = FileSequence(directory, prefix, suffix)
+        seq.files.setdefault(frame, os.path.basename(path))
+
+    sequences = [seq for seq in groups.values() if len(seq) >= min_files]
+    in_sequence = {os.path.normcase(path) for seq in sequences for path in seq.get_paths()}
+    others = [path for path in file_list if os.path.normcase(path) not in in_sequence]
+
+    return sequences, others
@@ -0,0 +1,49 @@
+"""Lazy folder walk for pasted directories
+
+Files are yielded while the folders are scanned (os.scandir, no full listing kept in memory),
+then grouped by extension into small batches for the importers.
+"""
+
+import os
+
+
+def get_ext(path):
+    return os.path.splitext(path)[1][1:].lower()
+
+
+def iter_folder_files(dirs, extensions=None, recursive=True):
+    """Yield file paths under dirs, hidden files / folders are skipped. extensions: set of lower ext or None"""
+    stack = list(reversed(dirs))
+    while stack:
+        folder = stack.pop()
+        subdirs = list()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.startswith('.'): continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive: subdirs.append(entry.path)
+                        elif extensions is None or get_ext(entry.name) in extensions:
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+        # depth first, sub folders in name order
+        stack.extend(sorted(subdirs, reverse=True))
+
+
+def iter_ext_batches(paths, batch_size=32):
+    """Yield (ext, [path]) batches, one pending batch per extension"""
+    pending = dict()  # ext: [path]
+    for path in paths:
+        ext = get_ext(path)
+        batch = pending.setdefault(ext, [])
+        batch.append(path)
+        if len(batch) >= batch_size:
+            yield ext, pending.pop(ext)
+
+    for ext, batch in pending.items():
+        yield ext, batch
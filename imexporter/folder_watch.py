@@ -0,0 +1,118 @@
+"""Incremental index of watched folders
+
+The folders are listed once when the watch starts, the files already there are not new.
+On each poll only the folders whose mtime changed (a file was created / removed / renamed in it)
+are listed again with os.scandir. A new file is pending until its size and mtime have not changed
+for the settle time, so files still being written / copied are not imported half done.
+A file overwritten in place does not change the folder mtime and is not seen again.
+"""
+
+import os
+import time
+
+# folders modified this recently are listed again on the next poll, a file created in the same
+# mtime tick as the last listing (coarse mtime on FAT / HFS+) does not change the folder mtime
+MTIME_GRACE = 2.0
+
+
+def stat_key(path):
+    """(size, mtime_ns), None if the path is gone"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return st.st_size, st.st_mtime_ns
+
+
+class FolderWatch():
+    def __init__(self, roots, recursive=True, settle_time=2.0):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.recursive = recursive
+        self.settle_time = settle_time
+
+        self.dirs = dict()  # folder: mtime_ns of the last listing
+        self.files = dict()  # folder: set of file names in the last listing
+        self.pending = dict()  # filepath: ((size, mtime_ns), time the key was first seen)
+
+    def start(self):
+        """List every folder, the files already there are known and not reported"""
+        self.dirs.clear()
+        self.files.clear()
+        self.pending.clear()
+
+        for root in self.roots:
+            if os.path.isdir(root): self.scan_dir(root, report=False)
+
+    def scan_dir(self, folder, report=True, now=None):
+        """List one folder, new files go to pending. New sub folders are listed at once"""
+        mtime = stat_key(folder)
+        if mtime is None:
+            self.drop_dir(folder)
+            return
+
+        names = set()
+        subdirs = list()
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.startswith('.'): continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive: subdirs.append(entry.path)
+                        else:
+                            names.add(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return
+
+        self.dirs[folder] = mtime[1]
+        known = self.files.get(folder, set())
+        self.files[folder] = names
+
+        if report:
+            now = now if now is not None else time.monotonic()
+            for name in names - known:
+                path = os.path.join(folder, name)
+                key = stat_key(path)
+                if key is not None: self.pending[path] = (key, now)
+
+        for subdir in subdirs:
+            if subdir not in self.dirs: self.scan_dir(subdir, report=report, now=now)
+
+    def drop_dir(self, folder):
+        """Folder removed, forget it and its sub folders"""
+        prefix = folder + os.sep
+        for path in [path for path in self.dirs if path == folder or path.startswith(prefix)]:
+            del self.dirs[path]
+            self.files.pop(path, None)
+
+    def poll(self, now=None):
+        """Return the new files that settled since the last poll"""
+        now = now if now is not None else time.monotonic()
+
+        # a root created after the watch started
+        for root in self.roots:
+            if root not in self.dirs and os.path.isdir(root): self.scan_dir(root, now=now)
+
+        for folder, mtime in list(self.dirs.items()):
+            if folder not in self.dirs: continue  # dropped with its parent
+            key = stat_key(folder)
+            if key is None:
+                self.drop_dir(folder)
+            elif key[1] != mtime or time.time() - mtime / 1e9 < MTIME_GRACE:
+                self.scan_dir(folder, now=now)
+
+        settled = list()
+        for path, (key, since) in list(self.pending.items()):
+            current = stat_key(path)
+            if current is None:
+                del self.pending[path]
+            elif current != key:
+                self.pending[path] = (current, now)  # still written
+            elif now - since >= self.settle_time:
+                del self.pending[path]
+                settled.append(path)
+
+        return settled
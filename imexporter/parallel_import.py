@@ -0,0 +1,136 @@
+"""Parallel import: shard a file list across background blender workers
+
+Each worker (script_batch_import.py) imports its shard with the same importer operator and writes
+a staging blend. The main file appends every staging blend with one bpy.data.libraries.load,
+file collections are linked back in clipboard order.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import bpy
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), 'script_batch_import.py')
+
+
+def get_op_addon_module(bl_idname):
+    """Add-on module that define the operator, None for build-in operators"""
+    cat, name = bl_idname.split('.')
+    cls = bpy.types.Operator.bl_rna_get_subclass_py(f'{cat.upper()}_OT_{name}')
+    if cls is None: return None
+
+    parts = cls.__module__.split('.')
+    # extensions are enabled with their full package name
+    return '.'.join(parts[:3]) if parts[0] == 'bl_ext' else parts[0]
+
+
+def get_worker_count(workers, file_count):
+    """workers: 0 for auto (leave one core to the ui)"""
+    if workers <= 0: workers = max(1, (os.cpu_count() or 2) - 1)
+    return max(1, min(workers, file_count))
+
+
+def shard_files(file_list, count):
+    """Longest file first to the lightest shard, keeps the workers busy for the same time"""
+    sizes = dict()
+    for path in file_list:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            sizes[path] = 0
+
+    shards = [[] for i in range(count)]
+    loads = [0] * count
+    for path in sorted(file_list, key=lambda p: sizes[p], reverse=True):
+        index = loads.index(min(loads))
+        shards[index].append(path)
+        loads[index] += sizes[path]
+
+    return [shard for shard in shards if shard]
+
+
+class ParallelImport():
+    """start() launches the workers, poll() until done, then load() append the results and cleanup()"""
+
+    def __init__(self, bl_idname, args, file_list, workers=0):
+        self.bl_idname = bl_idname
+        # filepath is set by the worker for each file
+        self.args = {key: value for key, value in (args or dict()).items() if key != 'filepath'}
+        self.file_list = list(file_list)
+        self.workers = get_worker_count(workers, len(file_list))
+        self.temp_dir = None
+        self.jobs = list()  # (job dict, Popen)
+
+    def start(self):
+        self.temp_dir = tempfile.mkdtemp(prefix='spio_parallel_')
+        module = get_op_addon_module(self.bl_idname)
+
+        for index, shard in enumerate(shard_files(self.file_list, self.workers)):
+            job = {
+                'bl_idname': self.bl_idname,
+                'args': self.args,
+                'files': shard,
+                'addons': [module] if module else [],
+                'output': os.path.join(self.temp_dir, f'shard_{index}.blend'),
+                'result': os.path.join(self.temp_dir, f'shard_{index}.json'),
+            }
+            job_path = os.path.join(self.temp_dir, f'shard_{index}_job.json')
+            with open(job_path, 'w', encoding='utf-8') as f:
+                json.dump(job, f)
+
+            args = [bpy.app.binary_path, '--background', '--factory-startup',
+                    '--python', WORKER_SCRIPT, '--', job_path]
+            popen = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.jobs.append((job, popen))
+
+    def done_count(self):
+        return sum(1 for job, popen in self.jobs if popen.poll() is not None)
+
+    def poll(self):
+        return self.done_count() == len(self.jobs)
+
+    def wait(self):
+        for job, popen in self.jobs:
+            popen.wait()
+
+    def cancel(self):
+        for job, popen in self.jobs:
+            if popen.poll() is None: popen.kill()
+        self.cleanup()
+
+    def load(self, target_collection):
+        """Append all staging blends, return (collections in file order, {filepath: error})"""
+        collections = dict()  # source path: collection
+        errors = dict()
+
+        for job, popen in self.jobs:
+            try:
+                with open(job['result'], 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                for filepath in job['files']:
+                    errors[filepath] = f'Import worker failed (exit code {popen.returncode})'
+                continue
+
+            errors.update(result['errors'])
+            if len(result['collections']) == 0: continue
+
+            with bpy.data.libraries.load(job['output'], link=False) as (data_from, data_to):
+                data_to.collections = result['collections']
+
+            for coll in data_to.collections:
+                if coll is not None: collections[coll.get('spio_source')] = coll
+
+        ordered = [collections[path] for path in self.file_list if path in collections]
+        for coll in ordered:
+            target_collection.children.link(coll)
+
+        return ordered, errors
+
+    def cleanup(self):
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
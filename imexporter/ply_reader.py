@@ -0,0 +1,370 @@
+"""NumPy PLY reader
+
+Binary little / big endian bodies are memory mapped as structured arrays, positions / normals / colors
+are copied into the output arrays chunk by chunk so memory stays bounded by the result, not the file.
+Files without faces (LiDAR, photogrammetry point clouds) skip all face handling.
+Rows with list properties have no fixed size: the list counts are walked once to get the row offsets,
+then the list items of every row are gathered with one numpy fancy index (counts + cumsum offsets).
+"""
+
+import os
+import mmap
+import struct
+from itertools import islice
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 22  # rows converted at once
+
+PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1',
+    'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2',
+    'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4',
+    'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4',
+    'double': 'f8', 'float64': 'f8',
+}
+
+FACE_LIST_NAMES = ('vertex_indices', 'vertex_index')
+
+
+class PlyElement():
+    def __init__(self, name, count):
+        self.name = name
+        self.count = count
+        self.properties = list()  # (name, type) or (name, ('list', count_type, item_type))
+
+    def has_list(self):
+        return any(isinstance(prop_type, tuple) for name, prop_type in self.properties)
+
+    def get_dtype(self, byte_order, list_size=None):
+        """Structured dtype of a row, list properties need a fixed list_size"""
+        fields = list()
+        for name, prop_type in self.properties:
+            if isinstance(prop_type, tuple):
+                fields.append((f'{name}_count', byte_order + PLY_TYPES[prop_type[1]]))
+                fields.append((name, byte_order + PLY_TYPES[prop_type[2]], (list_size,)))
+            else:
+                fields.append((name, byte_order + PLY_TYPES[prop_type]))
+
+        return np.dtype(fields)
+
+
+class PlyData():
+    def __init__(self):
+        self.vertices = None  # (n, 3) float32
+        self.normals = None  # (n, 3) float32
+        self.colors = None  # (n, 4) float32 0-1
+        self.faces = None  # (f, k) int32 when all faces have k corners, else flat indices
+        self.face_sizes = None  # (f,) corners of each face when faces are mixed
+
+    def is_point_cloud(self):
+        return self.faces is None or len(self.faces) == 0
+
+
+def read_header(f):
+    if f.readline().strip() != b'ply':
+        raise ValueError('Not a ply file')
+
+    fmt = None
+    elements = list()
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError('Ply header not closed')
+
+        words = line.decode('ascii', errors='replace').split()
+        if not words or words[0] in {'comment', 'obj_info'}: continue
+
+        if words[0] == 'format':
+            fmt = words[1]
+        elif words[0] == 'element':
+            elements.append(PlyElement(words[1], int(words[2])))
+        elif words[0] == 'property':
+            if words[1] == 'list':
+                elements[-1].properties.append((words[4], ('list', words[2], words[3])))
+            else:
+                elements[-1].properties.append((words[2], words[1]))
+        elif words[0] == 'end_header':
+            break
+
+    if fmt not in {'ascii', 'binary_little_endian', 'binary_big_endian'}:
+        raise ValueError(f'Unsupported ply format {fmt}')
+
+    return fmt, elements, f.tell()
+
+
+def copy_columns(rows, data, offset):
+    """Copy known columns of a chunk of vertex rows into the output arrays"""
+    names = rows.dtype.names
+    end = offset + len(rows)
+
+    for index, axis in enumerate('xyz'):
+        data.vertices[offset:end, index] = rows[axis]
+
+    if data.normals is not None:
+        for index, axis in enumerate(('nx', 'ny', 'nz')):
+            data.normals[offset:end, index] = rows[axis]
+
+    if data.colors is not None:
+        for index, channel in enumerate(('red', 'green', 'blue', 'alpha')):
+            if channel not in names: continue
+            column = rows[channel]
+            # 8 / 16 bit integer colors are normalized
+            scale = 1.0 if column.dtype.kind == 'f' else 1.0 / np.iinfo(column.dtype).max
+            data.colors[offset:end, index] = column * scale
+
+
+def alloc_vertex_arrays(element, data):
+    names = {name for name, prop_type in element.properties}
+    if not {'x', 'y', 'z'} <= names:
+        raise ValueError('Ply vertex element has no x, y, z')
+
+    data.vertices = np.empty((element.count, 3), dtype=np.float32)
+    if {'nx', 'ny', 'nz'} <= names:
+        data.normals = np.empty((element.count, 3), dtype=np.float32)
+    if {'red', 'green', 'blue'} <= names:
+        data.colors = np.ones((element.count, 4), dtype=np.float32)
+
+
+def read_binary_vertices(filepath, element, byte_order, offset, data, chunk_size):
+    dtype = element.get_dtype(byte_order)
+    alloc_vertex_arrays(element, data)
+    if element.count == 0: return offset
+
+    rows = np.memmap(filepath, dtype=dtype, mode='r', offset=offset, shape=(element.count,))
+    try:
+        for start in range(0, element.count, chunk_size):
+            copy_columns(rows[start:start + chunk_size], data, start)
+    finally:
+        del rows
+
+    return offset + element.count * dtype.itemsize
+
+
+def get_face_list(element):
+    for name, prop_type in element.properties:
+        if isinstance(prop_type, tuple) and name in FACE_LIST_NAMES:
+            return name, prop_type
+
+    return None, None
+
+
+def read_binary_faces(filepath, element, byte_order, offset, data):
+    list_name, list_type = get_face_list(element)
+    if element.count == 0 or list_name is None: return None
+
+    count_type = np.dtype(byte_order + PLY_TYPES[list_type[1]])
+    # first face gives the corner count, most files only have triangles or quads
+    list_count = sum(isinstance(prop_type, tuple) for name, prop_type in element.properties)
+    if element.properties[0][0] == list_name and list_count == 1:
+        with open(filepath, 'rb') as f:
+            f.seek(offset)
+            first_size = int(np.frombuffer(f.read(count_type.itemsize), dtype=count_type)[0])
+
+        dtype = element.get_dtype(byte_order, list_size=first_size)
+        end = offset + element.count * dtype.itemsize
+        if end <= os.path.getsize(filepath):
+            rows = np.memmap(filepath, dtype=dtype, mode='r', offset=offset, shape=(element.count,))
+            try:
+                if (rows[f'{list_name}_count'] == first_size).all():
+                    data.faces = np.array(rows[list_name], dtype=np.int32)
+                    return end
+            finally:
+                del rows
+
+    # mixed face sizes
+    lists = [name for name, prop_type in element.properties if isinstance(prop_type, tuple)]
+    item_type = np.dtype(byte_order + PLY_TYPES[list_type[2]])
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        end, counts, starts = scan_list_rows(buffer, element, byte_order, offset)
+        sizes = counts[lists.index(list_name)]
+        faces = gather_list_items(buffer, starts[lists.index(list_name)], sizes, item_type, dtype=np.int32)
+
+    data.face_sizes = sizes.astype(np.int32)
+    data.faces = faces
+
+    return end
+
+
+def get_list_layout(element, byte_order):
+    """[(fixed bytes before the list, count struct, item size)] of the list properties, fixed bytes after the last"""
+    layout = list()
+    gap = 0
+    for name, prop_type in element.properties:
+        if isinstance(prop_type, tuple):
+            count_char = np.dtype(PLY_TYPES[prop_type[1]]).char
+            layout.append((gap, struct.Struct(byte_order + count_char), np.dtype(PLY_TYPES[prop_type[2]]).itemsize))
+            gap = 0
+        else:
+            gap += np.dtype(PLY_TYPES[prop_type]).itemsize
+
+    return layout, gap
+
+
+def scan_list_rows(buffer, element, byte_order, offset):
+    """Walk the rows of an element with list properties, reading the list counts only
+    return end offset, [counts] and [offsets of the first item] of each list property (int64 arrays)"""
+    layout, tail = get_list_layout(element, byte_order)
+    counts = [np.empty(element.count, dtype=np.int64) for _ in layout]
+    starts = [np.empty(element.count, dtype=np.int64) for _ in layout]
+
+    pos = offset
+    if len(layout) == 1:
+        # faces, one list per row: keep the loop minimal
+        (gap, count_struct, item_size), = layout
+        unpack = count_struct.unpack_from
+        head = gap + count_struct.size
+        row_counts = counts[0]
+        for i in range(element.count):
+            count = unpack(buffer, pos + gap)[0]
+            row_counts[i] = count
+            pos += head + count * item_size + tail
+        # first items follow the count of each row
+        row_sizes = head + row_counts * item_size + tail
+        starts[0][:] = offset + np.cumsum(row_sizes) - row_sizes + head
+        return pos, counts, starts
+
+    for i in range(element.count):
+        for index, (gap, count_struct, item_size) in enumerate(layout):
+            count = count_struct.unpack_from(buffer, pos + gap)[0]
+            pos += gap + count_struct.size
+            counts[index][i] = count
+            starts[index][i] = pos
+            pos += count * item_size
+        pos += tail
+
+    return pos, counts, starts
+
+
+def gather_list_items(buffer, starts, counts, item_type, dtype=None, chunk_size=CHUNK_SIZE):
+    """Items of every row in one array, starts: byte offset of the first item of each row
+    rows are gathered chunk by chunk, temporaries stay bounded by the chunk size"""
+    size = item_type.itemsize
+    items = np.empty(int(counts.sum()), dtype=dtype or item_type)
+    if len(items) == 0: return items
+
+    # one view of the buffer per byte alignment, the items of a row are not aligned to their size
+    views = [np.ndarray(((len(buffer) - r) // size,), dtype=item_type, buffer=buffer, offset=r) for r in range(size)]
+    try:
+        out = 0
+        for start in range(0, len(counts), chunk_size):
+            chunk_counts = counts[start:start + chunk_size]
+            total = int(chunk_counts.sum())
+            if total == 0: continue
+
+            # byte offset of each item: first item of its row + index in the row * size
+            first = starts[start:start + chunk_size] - (np.cumsum(chunk_counts) - chunk_counts) * size
+            positions = np.repeat(first, chunk_counts) + np.arange(total, dtype=np.int64) * size
+
+            block = items[out:out + total]
+            if size == 1:
+                block[:] = views[0][positions]
+            else:
+                residues = positions % size
+                for r, view in enumerate(views):
+                    mask = residues == r
+                    if mask.any(): block[mask] = view[(positions[mask] - r) // size]
+            out += total
+    finally:
+        del views  # release the buffer, the mmap can be closed
+
+    return items
+
+
+def skip_binary_element(filepath, element, byte_order, offset):
+    if not element.has_list():
+        return offset + element.count * element.get_dtype(byte_order).itemsize
+
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        end, counts, starts = scan_list_rows(buffer, element, byte_order, offset)
+
+    return end
+
+
+def read_ascii_list(block, element):
+    """(sizes, flat items) of the face list from the text rows of an element, without a loop over rows
+    vertex_indices is the first list property in almost every file, scalar properties before it are skipped"""
+    list_name, list_type = get_face_list(element)
+    before = 0
+    for name, prop_type in element.properties:
+        if name == list_name: break
+        before += 1
+
+    chars = np.frombuffer(block, dtype=np.uint8)
+    if len(chars) == 0: return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+
+    # tokens start where a non space follows a space, rows end at new lines
+    space = np.isin(chars, (32, 9, 10, 13))
+    token_start = ~space & np.concatenate(([True], space[:-1]))
+    row_of_token = np.cumsum(chars == 10)[token_start]
+    row_tokens = np.bincount(row_of_token)
+    row_tokens = row_tokens[row_tokens > 0]  # blank lines
+
+    tokens = np.fromstring(block.decode('ascii', errors='replace'), dtype=np.int64, sep=' ')
+    if len(tokens) != token_start.sum(): raise ValueError('Ply face rows are not integers')
+    count_index = np.cumsum(row_tokens) - row_tokens + before
+    sizes = tokens[count_index]
+
+    total = int(sizes.sum())
+    index = np.repeat(count_index + 1, sizes) + np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+
+    return sizes.astype(np.int32), tokens[index].astype(np.int32)
+
+
+def read_ascii(filepath, elements, offset, data, chunk_size):
+    with open(filepath, 'rb') as f:
+        f.seek(offset)
+
+        for element in elements:
+            if element.name == 'vertex':
+                alloc_vertex_arrays(element, data)
+                dtype = element.get_dtype('<')
+                for start in range(0, element.count, chunk_size):
+                    count = min(chunk_size, element.count - start)
+                    values = np.loadtxt(f, dtype=np.float64, max_rows=count, ndmin=2)
+                    rows = np.zeros(count, dtype=dtype)
+                    for index, name in enumerate(dtype.names):
+                        rows[name] = values[:, index]
+                    copy_columns(rows, data, start)
+
+            elif element.name == 'face':
+                sizes, faces = read_ascii_list(b''.join(islice(f, element.count)), element)
+                if len(sizes) and (sizes == sizes[0]).all():
+                    data.faces = faces.reshape(len(sizes), sizes[0])
+                elif len(sizes):
+                    data.face_sizes = sizes
+                    data.faces = faces
+
+            else:
+                for i in range(element.count):
+                    f.readline()
+
+
+def read_ply(filepath, chunk_size=CHUNK_SIZE):
+    """Return PlyData, faces is None for a point cloud"""
+    with open(filepath, 'rb') as f:
+        fmt, elements, offset = read_header(f)
+
+    data = PlyData()
+
+    if fmt == 'ascii':
+        read_ascii(filepath, elements, offset, data, chunk_size)
+        return data
+
+    byte_order = '<' if fmt == 'binary_little_endian' else '>'
+    for element in elements:
+        if element.name == 'vertex':
+            offset = read_binary_vertices(filepath, element, byte_order, offset, data, chunk_size)
+        elif element.name == 'face':
+            end = read_binary_faces(filepath, element, byte_order, offset, data)
+            offset = end if end is not None else skip_binary_element(filepath, element, byte_order, offset)
+        else:
+            offset = skip_binary_element(filepath, element, byte_order, offset)
+
+    if data.vertices is None:
+        raise ValueError('Ply file has no vertex element')
+
+    return data
@@ -0,0 +1,71 @@
+"""Worker of parallel import, run with blender --background --factory-startup
+
+Import a shard of files with one importer operator, each file into its own collection,
+then write the collections to a staging blend that the main blender appends.
+
+usage: blender --background --factory-startup --python script_batch_import.py -- <job.json>
+
+job.json: {"bl_idname": "import_scene.fbx", "args": {...}, "files": [...], "addons": [...],
+           "output": "<staging.blend>", "result": "<result.json>"}
+"""
+
+import json
+import os
+import sys
+
+import addon_utils
+import bpy
+
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+
+
+def import_file(op_callable, filepath, args):
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+
+    coll = bpy.data.collections.new(os.path.splitext(os.path.basename(filepath))[0])
+    coll['spio_source'] = filepath
+    scene.collection.children.link(coll)
+    # importers link new objects to the active collection
+    view_layer.active_layer_collection = view_layer.layer_collection.children[coll.name]
+
+    op_callable(filepath=filepath, **args)
+
+    return coll
+
+
+def main(job_path):
+    with open(job_path, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+
+    for module in job.get('addons', []):
+        try:
+            addon_utils.enable(module, default_set=False)
+        except Exception:
+            pass
+
+    clear_scene()
+
+    bl_idname = job['bl_idname']
+    op_callable = getattr(getattr(bpy.ops, bl_idname.split('.')[0]), bl_idname.split('.')[1])
+
+    collections = list()
+    errors = dict()
+    for filepath in job['files']:
+        try:
+            collections.append(import_file(op_callable, filepath, job.get('args', {})))
+        except Exception as e:
+            errors[filepath] = str(e)
+
+    # keep texture paths valid from the main file
+    bpy.data.libraries.write(job['output'], set(collections), path_remap='ABSOLUTE')
+
+    with open(job['result'], 'w', encoding='utf-8') as f:
+        json.dump({'collections': [coll.name for coll in collections], 'errors': errors}, f)
+
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1])
@@ -0,0 +1,446 @@
+"""Headless end-to-end benchmark of the SPIO import / export paths
+
+Generate synthetic OBJ / STL / PLY / FBX / PNG / .blend corpora, run the add-on operators on them
+with the in-memory clipboard and write files/sec, MB/sec and memory of each case to json,
+so two versions of SPIO can be compared on the same machine.
+The peak RSS is process wide: process_peak_rss_mb is the peak since blender started, peak_rss_growth_mb
+how much a case raised it (0 when an earlier case went higher). Run one format to compare memory.
+
+usage: blender --background --factory-startup --python script_benchmark.py -- [options]
+
+    --output <result.json>      default: spio_benchmark.json in the current directory
+    --count <files>             files of each format, default 8
+    --faces <triangles>         triangles of each model file, default 20000
+    --image-size <pixels>       size of the png images, default 1024
+    --formats obj,stl,ply,fbx,png,blend
+    --repeat <n>                best of n, default 1
+    --keep                      keep the generated corpus and the exported files
+
+The add-on is the package this script lives in, it is enabled from its folder.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import addon_utils
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fast_mesh import mesh_from_arrays
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = os.path.basename(PACKAGE_DIR)
+
+MODEL_FORMATS = ('obj', 'stl', 'ply', 'fbx')
+ALL_FORMATS = MODEL_FORMATS + ('png', 'blend')
+PBR_MAPS = ('basecolor', 'roughness', 'metallic', 'normal')
+
+STL_RECORD = np.dtype([('normal', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attribute', '<u2')])
+PLY_FACE = np.dtype([('count', 'u1'), ('indices', '<i4', (3,))])
+
+
+# Add-on
+########
+
+def enable_addon():
+    """Enable SPIO from the folder of this script, return {module name: module} of the parts used here"""
+    sys.path.insert(0, os.path.dirname(PACKAGE_DIR))
+    if addon_utils.enable(PACKAGE_NAME, default_set=True) is None:
+        raise RuntimeError(f'Can not enable {PACKAGE_NAME} from {PACKAGE_DIR}')
+
+    return {name: importlib.import_module(f'{PACKAGE_NAME}.{name}') for name in (
+        'clipboard.clipboard', 'ops.file_registry', 'profiler')}
+
+
+def get_pref():
+    return bpy.context.preferences.addons[PACKAGE_NAME].preferences
+
+
+def get_peak_rss_mb():
+    """Peak resident memory of this blender process, None if unknown"""
+    try:
+        import resource
+    except ImportError:  # windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return round(psutil.Process().memory_info().peak_wset / 1024 / 1024, 1)
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on mac, kilobytes on linux
+    return round(rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024, 1)
+
+
+def get_memory(peak_before):
+    """Process peak after a case and how much the case raised it"""
+    peak = get_peak_rss_mb()
+    growth = round(peak - peak_before, 1) if peak is not None and peak_before is not None else None
+
+    return {'process_peak_rss_mb': peak, 'peak_rss_growth_mb': growth}
+
+
+# Corpus
+########
+
+def grid_arrays(triangle_count, offset=0.0):
+    """(vertices, triangles) of a wavy grid, offset makes each file content different"""
+    side = max(1, int((triangle_count / 2) ** 0.5))
+    xs, ys = np.meshgrid(np.arange(side + 1, dtype=np.float32), np.arange(side + 1, dtype=np.float32))
+    zs = np.sin(xs * 0.1 + offset) * np.cos(ys * 0.1)
+    vertices = np.stack([xs, ys, zs], axis=-1).reshape(-1, 3)
+
+    index = np.arange((side + 1) * (side + 1), dtype=np.int32).reshape(side + 1, side + 1)
+    a, b = index[:-1, :-1].ravel(), index[:-1, 1:].ravel()
+    c, d = index[1:, 1:].ravel(), index[1:, :-1].ravel()
+    triangles = np.concatenate([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)])
+
+    return vertices, triangles
+
+
+def write_obj(filepath, vertices, triangles):
+    with open(filepath, 'w') as f:
+        np.savetxt(f, vertices, fmt='v %.6f %.6f %.6f')
+        np.savetxt(f, triangles + 1, fmt='f %d %d %d')
+
+
+def write_stl(filepath, vertices, triangles):
+    records = np.zeros(len(triangles), dtype=STL_RECORD)
+    records['vertices'] = vertices[triangles]
+    with open(filepath, 'wb') as f:
+        f.write(b'\0' * 80)
+        f.write(np.array([len(triangles)], dtype='<u4').tobytes())
+        f.write(records.tobytes())
+
+
+def write_ply(filepath, vertices, triangles):
+    faces = np.zeros(len(triangles), dtype=PLY_FACE)
+    faces['count'] = 3
+    faces['indices'] = triangles
+    header = ('ply\nformat binary_little_endian 1.0\n'
+              f'element vertex {len(vertices)}\nproperty float x\nproperty float y\nproperty float z\n'
+              f'element face {len(triangles)}\nproperty list uchar int vertex_indices\nend_header\n')
+    with open(filepath, 'wb') as f:
+        f.write(header.encode('ascii'))
+        f.write(np.ascontiguousarray(vertices, dtype='<f4').tobytes())
+        f.write(faces.tobytes())
+
+
+def new_grid_object(name, vertices, triangles):
+    obj = bpy.data.objects.new(name, mesh_from_arrays(name, vertices, triangles))
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def write_fbx(filepath, vertices, triangles):
+    addon_utils.enable('io_scene_fbx', default_set=True)
+    obj = new_grid_object('bench', vertices, triangles)
+    select_only([obj])
+    bpy.ops.export_scene.fbx(filepath=filepath, use_selection=True)
+    clear_scene()
+
+
+def write_blend(filepath, vertices, triangles):
+    obj = new_grid_object('bench', vertices, triangles)
+    bpy.data.libraries.write(filepath, {obj})
+    clear_scene()
+
+
+def write_png(filepath, size, seed):
+    rng = np.random.default_rng(seed)
+    image = bpy.data.images.new('bench', size, size, alpha=False)
+    pixels = rng.random((size, size, 4), dtype=np.float32)
+    pixels[..., 3] = 1.0
+    image.pixels.foreach_set(pixels.ravel())
+    image.filepath_raw = filepath
+    image.file_format = 'PNG'
+    image.save()
+    bpy.data.images.remove(image)
+
+
+def generate_corpus(root, formats, count, faces, image_size):
+    """{format: [filepath]}, 'pbr': [folder of textures] when png is asked"""
+    writers = {'obj': write_obj, 'stl': write_stl, 'ply': write_ply, 'fbx': write_fbx, 'blend': write_blend}
+    corpus = dict()
+
+    for ext in formats:
+        folder = os.path.join(root, ext)
+        os.makedirs(folder, exist_ok=True)
+        # names do not end with a number, not detected as a sequence
+        paths = [os.path.join(folder, f'bench_{i}_{ext}.{ext}') for i in range(count)]
+
+        for i, filepath in enumerate(paths):
+            if ext == 'png':
+                write_png(filepath, image_size, seed=i)
+            else:
+                writers[ext](filepath, *grid_arrays(faces, offset=i * 0.01))
+        corpus[ext] = paths
+
+    if 'png' in formats:
+        corpus['pbr'] = list()
+        for i in range(count):
+            folder = os.path.join(root, 'pbr', f'material_{i}_pbr')
+            os.makedirs(folder, exist_ok=True)
+            for j, map_name in enumerate(PBR_MAPS):
+                write_png(os.path.join(folder, f'material_{map_name}.png'), image_size // 2, seed=i * 10 + j)
+            corpus['pbr'].append(folder)
+
+    return corpus
+
+
+# Scene
+#######
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for coll in list(bpy.data.collections):
+        bpy.data.collections.remove(coll)
+    for data in (bpy.data.meshes, bpy.data.materials, bpy.data.images, bpy.data.node_groups):
+        for block in list(data):
+            data.remove(block)
+
+
+def select_only(objects):
+    view_layer = bpy.context.view_layer
+    for obj in view_layer.objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    if objects: view_layer.objects.active = objects[-1]
+
+
+def get_size(paths):
+    return sum(os.path.getsize(path) for path in paths if os.path.isfile(path))
+
+
+# Cases
+#######
+# a case is (name, setup, run): setup() returns the state, not timed. run(state) returns the files it handled
+
+class Benchmark():
+    def __init__(self, modules, corpus, args):
+        self.clipboard = modules['clipboard.clipboard']
+        self.file_registry = modules['ops.file_registry']
+        self.profiler = modules['profiler'].PROFILER
+        self.corpus = corpus
+        self.args = args
+        self.out_dir = os.path.join(args.work_dir, 'out')
+
+        self.clipboard.set_backend('MEMORY')
+        self.backend = self.clipboard.get_backend()
+        # keep every run of a case (one run per pasted image / exported object)
+        self.profiler.configure(max_runs=max(100, args.count * 4))
+
+    def paste_files(self, paths):
+        self.backend.set_payload(files=paths)
+        bpy.ops.wm.super_import()
+        return paths
+
+    def import_model(self, paths):
+        bpy.ops.spio.import_model(files=self.file_registry.register_files(paths))
+        return paths
+
+    def paste_blend(self, paths):
+        bpy.ops.spio.batch_import_blend(action='APPEND', files=self.file_registry.register_files(paths),
+                                        data_type='objects', load_all=True)
+        return paths
+
+    def paste_images(self, images):
+        for data in images:
+            self.backend.set_payload(image=data)
+            bpy.ops.wm.super_import()
+        return self.corpus['png']
+
+    def pbr_setup(self, folders):
+        textures = list()
+        for folder in folders:
+            bpy.ops.spio.create_principled_set_up_material(directory=folder + os.sep, use_context_space=False)
+            textures.extend(os.path.join(folder, name) for name in os.listdir(folder))
+        return textures
+
+    def new_export_objects(self):
+        return [new_grid_object(f'bench_{i}_export', *grid_arrays(self.args.faces, offset=i * 0.01))
+                for i in range(self.args.count)]
+
+    def export_single(self, ext, objects):
+        paths = list()
+        for obj in objects:
+            select_only([obj])
+            bpy.ops.spio.export_model(extension=ext, batch_mode=False)
+            paths.extend(self.backend.files)
+        return paths
+
+    def export_batch(self, ext, objects):
+        select_only(objects)
+        bpy.ops.spio.export_model(extension=ext, batch_mode=True)
+        return list(self.backend.files)
+
+    def export_blend(self, objects):
+        paths = list()
+        for obj in objects:
+            select_only([obj])
+            bpy.ops.spio.export_blend(filepath=os.path.join(self.out_dir, f'{obj.name}.blend'))
+            paths.append(os.path.join(self.out_dir, f'{obj.name}.blend'))
+        return paths
+
+    def get_cases(self):
+        cases = list()
+        for ext in MODEL_FORMATS:
+            if ext not in self.corpus: continue
+            paths = self.corpus[ext]
+            cases.append((f'paste_{ext}', lambda paths=paths: paths, self.paste_files))
+            cases.append((f'import_model_{ext}', lambda paths=paths: paths, self.import_model))
+
+        if 'blend' in self.corpus:
+            cases.append(('paste_blend', lambda: self.corpus['blend'], self.paste_blend))
+
+        if 'png' in self.corpus:
+            def read_images():
+                images = list()
+                for filepath in self.corpus['png']:
+                    with open(filepath, 'rb') as f:
+                        images.append(f.read())
+                return images
+
+            cases.append(('paste_image', read_images, self.paste_images))
+            cases.append(('pbr_setup', lambda: self.corpus['pbr'], self.pbr_setup))
+
+        for ext in ('obj', 'stl', 'fbx', 'ply'):
+            if ext not in self.args.formats: continue
+            cases.append((f'export_{ext}_single', self.new_export_objects,
+                          lambda objects, ext=ext: self.export_single(ext, objects)))
+            cases.append((f'export_{ext}_batch', self.new_export_objects,
+                          lambda objects, ext=ext: self.export_batch(ext, objects)))
+
+        if 'blend' in self.args.formats:
+            cases.append(('export_blend', self.new_export_objects, self.export_blend))
+
+        return cases
+
+    def run_case(self, name, setup, run):
+        peak_before = get_peak_rss_mb()
+        best = None
+        for i in range(self.args.repeat):
+            clear_scene()
+            self.backend.clear()
+            state = setup()
+            before = set(self.profiler.runs)
+
+            start = time.perf_counter()
+            try:
+                paths = run(state)
+            except Exception as e:
+                return {'name': name, 'error': str(e), **get_memory(peak_before)}
+            cost = time.perf_counter() - start
+
+            if best is None or cost < best[0]:
+                runs = [run for run in self.profiler.runs if run not in before]
+                best = (cost, paths, len(bpy.data.objects), runs)
+
+        cost, paths, objects, runs = best
+        size = get_size(paths)
+
+        return {'name': name,
+                'files': len(paths),
+                'mb': round(size / 1024 / 1024, 3),
+                'seconds': round(cost, 4),
+                'files_per_sec': round(len(paths) / cost, 2) if cost > 0 else None,
+                'mb_per_sec': round(size / 1024 / 1024 / cost, 2) if cost > 0 else None,
+                'objects': objects,
+                **get_memory(peak_before),
+                'breakdown': get_breakdown(runs)}
+
+    def run(self):
+        results = list()
+        for name, setup, run in self.get_cases():
+            result = self.run_case(name, setup, run)
+            results.append(result)
+            if 'error' in result:
+                print(f'{name:24} error: {result["error"]}')
+            else:
+                print(f'{name:24} {result["files"]:5} files  {result["seconds"]:8.3f} s  '
+                      f'{result["files_per_sec"]:8} files/s  {result["mb_per_sec"]:8} MB/s  '
+                      f'+{result["peak_rss_growth_mb"]} MB peak')
+
+        return results
+
+
+def get_breakdown(runs):
+    """{span name: seconds} summed over the profiler runs of a case"""
+    breakdown = dict()
+    for run in runs:
+        for depth, name, count, total in run.get_breakdown():
+            breakdown[name] = breakdown.get(name, 0.0) + total
+
+    return {name: round(total, 4) for name, total in breakdown.items()}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='script_benchmark.py')
+    parser.add_argument('--output', default=os.path.abspath('spio_benchmark.json'))
+    parser.add_argument('--count', type=int, default=8)
+    parser.add_argument('--faces', type=int, default=20000)
+    parser.add_argument('--image-size', type=int, default=1024)
+    parser.add_argument('--formats', default=','.join(ALL_FORMATS))
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--keep', action='store_true')
+    args = parser.parse_args(argv)
+
+    args.formats = [ext.strip().lower() for ext in args.formats.split(',') if ext.strip()]
+    unknown = set(args.formats) - set(ALL_FORMATS)
+    if unknown: parser.error(f'unknown formats {sorted(unknown)}, choose from {ALL_FORMATS}')
+
+    return args
+
+
+def main(argv):
+    args = parse_args(argv)
+    args.work_dir = tempfile.mkdtemp(prefix='spio_benchmark_')
+
+    modules = enable_addon()
+    addon = sys.modules[PACKAGE_NAME]
+
+    try:
+        clear_scene()
+        start = time.perf_counter()
+        corpus = generate_corpus(os.path.join(args.work_dir, 'corpus'), args.formats, args.count, args.faces,
+                                 args.image_size)
+        print(f'corpus generated in {time.perf_counter() - start:.1f} s: {args.work_dir}')
+
+        # exported files stay in the work dir instead of spio_temp
+        os.makedirs(os.path.join(args.work_dir, 'out'), exist_ok=True)
+        bpy.context.preferences.filepaths.temporary_directory = os.path.join(args.work_dir, 'out')
+
+        results = Benchmark(modules, corpus, args).run()
+    finally:
+        if not args.keep: shutil.rmtree(args.work_dir, ignore_errors=True)
+
+    pref = get_pref()
+    report = {'spio_version': '.'.join(str(v) for v in addon.bl_info['version']),
+              'blender_version': bpy.app.version_string,
+              'platform': platform.platform(),
+              'python': platform.python_version(),
+              'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+              'settings': {'count': args.count, 'faces': args.faces, 'image_size': args.image_size,
+                           'repeat': args.repeat, 'formats': args.formats,
+                           'parallel_import': pref.parallel_import, 'import_ledger': pref.import_ledger,
+                           'image_paste_in_memory': pref.image_paste_in_memory},
+              'cases': results}
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'result saved to {args.output}')
+
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
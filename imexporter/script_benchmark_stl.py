@@ -0,0 +1,94 @@
+"""Benchmark the SPIO NumPy STL reader against blender's stock STL importer
+
+usage: blender --background --factory-startup --python script_benchmark_stl.py -- <file.stl> [repeat]
+       blender --background --factory-startup --python script_benchmark_stl.py -- --generate <triangles> [repeat]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from stl_reader import read_stl, STL_RECORD, HEADER_SIZE
+from fast_mesh import mesh_from_arrays
+
+
+def generate_stl(triangle_count):
+    """Binary stl of a subdivided grid, corners shared like a real scan"""
+    side = max(1, int((triangle_count / 2) ** 0.5))
+    xs, ys = np.meshgrid(np.arange(side + 1, dtype=np.float32), np.arange(side + 1, dtype=np.float32))
+    zs = np.sin(xs * 0.1) * np.cos(ys * 0.1)
+    grid = np.stack([xs, ys, zs], axis=-1)
+
+    a, b = grid[:-1, :-1].reshape(-1, 3), grid[:-1, 1:].reshape(-1, 3)
+    c, d = grid[1:, 1:].reshape(-1, 3), grid[1:, :-1].reshape(-1, 3)
+    triangles = np.concatenate([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)])
+
+    records = np.zeros(len(triangles), dtype=STL_RECORD)
+    records['vertices'] = triangles
+
+    filepath = os.path.join(tempfile.gettempdir(), f'spio_benchmark_{len(triangles)}.stl')
+    with open(filepath, 'wb') as f:
+        f.write(b'\0' * 80)
+        f.write(np.array([len(triangles)], dtype='<u4').tobytes())
+        f.write(records.tobytes())
+
+    return filepath
+
+
+def clear():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+
+
+def stock_import(filepath):
+    if hasattr(bpy.ops.wm, 'stl_import'):
+        bpy.ops.wm.stl_import(filepath=filepath)
+    else:
+        bpy.ops.import_mesh.stl(filepath=filepath)
+
+
+def spio_import(filepath):
+    vertices, faces = read_stl(filepath)
+    mesh = mesh_from_arrays('spio', vertices, faces)
+    bpy.context.collection.objects.link(bpy.data.objects.new('spio', mesh))
+
+
+def measure(func, filepath, repeat):
+    costs = []
+    for i in range(repeat):
+        clear()
+        start = time.perf_counter()
+        func(filepath)
+        costs.append(time.perf_counter() - start)
+
+    mesh = bpy.data.meshes[0]
+    return min(costs), len(mesh.vertices), len(mesh.polygons)
+
+
+def main(args):
+    if args[0] == '--generate':
+        filepath = generate_stl(int(args[1]))
+        args = args[2:]
+    else:
+        filepath = args[0]
+        args = args[1:]
+    repeat = int(args[0]) if args else 3
+
+    size = os.path.getsize(filepath) / 1024 / 1024
+    print(f'{filepath} ({size:.1f} MB), best of {repeat}')
+
+    for label, func in (('stock', stock_import), ('spio ', spio_import)):
+        cost, verts, faces = measure(func, filepath, repeat)
+        print(f'{label}: {cost:.3f} s  {verts} vertices  {faces} faces')
+
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:])
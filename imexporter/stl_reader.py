@@ -0,0 +1,84 @@
+"""NumPy STL reader
+
+Binary files are memory mapped as 50 bytes triangle records, vertices are welded with np.unique
+on their packed float bits, so a multi million triangles scan loads without a python loop.
+"""
+
+import os
+
+import numpy as np
+
+HEADER_SIZE = 84  # 80 bytes header + uint32 triangle count
+
+STL_RECORD = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attribute', '<u2'),
+])
+
+
+def get_triangle_count(filepath):
+    """Triangle count of a binary stl, None for ascii stl"""
+    size = os.path.getsize(filepath)
+    if size < HEADER_SIZE: return None
+
+    with open(filepath, 'rb') as f:
+        f.seek(80)
+        count = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+
+    # some ascii exporters, some binary exporters write 'solid' in the header: trust the size
+    if size != HEADER_SIZE + count * STL_RECORD.itemsize: return None
+
+    return count
+
+
+def weld_triangles(triangles):
+    """(n, 3, 3) float32 triangle corners -> (vertices (v, 3), faces (n, 3))"""
+    corners = np.ascontiguousarray(triangles, dtype='<f4').reshape(-1, 3)
+    corners += 0.0  # -0.0 and 0.0 have different bits
+
+    packed = corners.view(np.dtype((np.void, 12))).ravel()
+    unique, inverse = np.unique(packed, return_inverse=True)
+
+    vertices = unique.view('<f4').reshape(-1, 3)
+    faces = inverse.reshape(-1, 3).astype(np.int32)
+
+    # triangles collapsed by welding are invalid polygons
+    valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+    if not valid.all():
+        faces = faces[valid]
+        # vertices only used by the dropped triangles would be loose, keep the used ones
+        used, remap = np.unique(faces, return_inverse=True)
+        vertices = vertices[used]
+        faces = remap.reshape(-1, 3).astype(np.int32)
+
+    return vertices, faces
+
+
+def read_binary_stl(filepath, count):
+    if count == 0:
+        return np.zeros((0, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.int32)
+
+    records = np.memmap(filepath, dtype=STL_RECORD, mode='r', offset=HEADER_SIZE, shape=(count,))
+    try:
+        return weld_triangles(records['vertices'])
+    finally:
+        del records  # release the file handle (windows)
+
+
+def read_ascii_stl(filepath):
+    with open(filepath, 'rb') as f:
+        lines = [line.split()[1:4] for line in f if line.lstrip().startswith(b'vertex')]
+
+    triangles = np.array(lines, dtype=np.float32).reshape(-1, 3, 3)
+
+    return weld_triangles(triangles)
+
+
+def read_stl(filepath):
+    """Return welded (vertices float32 (v, 3), faces int32 (f, 3))"""
+    count = get_triangle_count(filepath)
+    if count is None:
+        return read_ascii_stl(filepath)
+
+    return read_binary_stl(filepath, count)
@@ -1,6 +1,9 @@
 import bpy
+import sys
 from . import (op_blend_export, op_node_export, op_model_export, op_model_import, ops_super_export, ops_super_import,
-               ops_blend_import, ops_config_io, op_image_io, op_get_plugin, op_read_preset)
+               ops_blend_import, ops_config_io, op_image_io, op_get_plugin, op_read_preset, op_temp_store,
+               import_ledger, op_refresh_imported, op_sequence_import,
+               op_folder_import, op_batch_import, op_profiler, op_watch_folder)
 
 classes = (
     op_blend_export,
@@ -13,8 +16,15 @@ classes = (
     ops_config_io,
     op_image_io,
     op_get_plugin,
-    op_read_preset
-
+    op_read_preset,
+    op_temp_store,
+    import_ledger,
+    op_refresh_imported,
+    op_sequence_import,
+    op_folder_import,
+    op_batch_import,
+    op_profiler,
+    op_watch_folder,
 )
 
 
@@ -26,3 +36,7 @@ def register():
 def unregister():
     for cls in classes:
         cls.unregister()
+
+    if sys.platform == 'linux':
+        from ..clipboard.clipboard import stop_linux_helper
+        stop_linux_helper()
@@ -1,7 +1,7 @@
 import bpy
 from .. import __folder_name__
+from ..profiler import PROFILER
 
-import time
 import os
 
 
@@ -14,14 +14,6 @@ def viewlayer_fix_291(self, context):
     return context.view_layer.depsgraph if bpy.app.version >= (2, 91, 0) else context.view_layer
 
 
-class MeasureTime():
-    def __enter__(self):
-        return time.time()
-
-    def __exit__(self, type, value, traceback):
-        pass
-
-
 def is_float(s) -> bool:
     s = str(s)
     if s.count('.') == 1:
@@ -58,33 +50,28 @@ def remove_prefix(s, prefix):
 
 
 from ..imexporter.default_importer import get_importer
+from ..imexporter.addon_loader import ensure_operator
 from ..imexporter.lib_blend import default_blend_lib
 from ..imexporter.default_addon import importer_addon
+from .file_registry import register_files
 
 
 class ConfigItemHelper():
     '''This class accept the item from config helper, and access the specific item settings'''
 
-    def __init__(self, item):
+    def __init__(self, item, config=None):
         self.item = item
 
-        for key in item.__annotations__.keys():
-            value = getattr(item, key)
-            if key != 'prop_list':
-                self.__setattr__(key, value)
-            # prop list
-            ops_config = dict()
-            if len(item.prop_list) != 0:
-                for prop_index, prop_item in enumerate(item.prop_list):
-                    prop, value = prop_item.name, prop_item.value
-                    # skip if the prop is not filled
-                    if prop == '' or value == '': continue
-                    ops_config[prop] = convert_value(value)
-            self.__setattr__('prop_list', ops_config)
+        # use the compiled config from CONFIG_INDEX if given
+        if config is None: config = get_config_dict(item)
+        self.config = config
+        for key, value in config.items():
+            self.__setattr__(key, value)
 
     def is_config_item_poll(self, context_area_type):
-        if get_pref().experimental:
-            return self.item.context_area == bpy.context.area.type
+        # no area when running headless, accept all configs
+        if get_pref().experimental and context_area_type is not None:
+            return self.context_area == context_area_type
 
         return True
 
@@ -112,8 +99,9 @@ class ConfigItemHelper():
         if operator_type == 'CUSTOM':
             # custom operator
             bl_idname = self.bl_idname
+            ensure_operator(bl_idname)  # io add-ons are enabled on first use
             op_callable = getattr(getattr(bpy.ops, bl_idname.split('.')[0]), bl_idname.split('.')[1])
-            ops_args = self.prop_list
+            ops_args = dict(self.prop_list)  # copy, the compiled config is shared
             op_context = self.context
 
         # default operator
@@ -153,24 +141,163 @@ class ConfigItemHelper():
 
         return op_callable, ops_args, op_context
 
+    def get_match_func(self):
+        """Compiled match rule: func(basename) -> bool, None if the config has no rule"""
+        return compile_match_rule(self.match_rule, self.match_value, self.extension)
+
     def get_match_files(self, file_list):
-        match_rule = self.match_rule
-        match_value = self.match_value
+        match_func = self.get_match_func()
+        if match_func is None: return list()
+
+        return [file for file in file_list if match_func(os.path.basename(file))]
+
+
+MATCH_RULE_CACHE = dict()  # (rule, value, extension): match func, cleared when a config changes
+
+
+def get_regex_error(match_value):
+    """Error message of an invalid expression, None if valid. Shown under the config match value"""
+    import re
+    try:
+        re.compile(match_value)
+    except re.error as e:
+        return str(e)
+
+
+def compile_match_rule(match_rule, match_value, extension):
+    key = (match_rule, match_value, extension)
+    if key in MATCH_RULE_CACHE: return MATCH_RULE_CACHE[key]
+
+    match_func = None
+    if match_rule == 'STARTSWITH':
+        match_func = lambda name: name.startswith(match_value)
+    elif match_rule == 'ENDSWITH':
+        suffix = '.' + extension
+        match_func = lambda name: (name[:-len(suffix)] if name.endswith(suffix) else name).endswith(match_value)
+    elif match_rule == 'IN':
+        match_func = lambda name: match_value in name
+    elif match_rule == 'REGEX':
+        import re
+        try:
+            match_func = re.compile(match_value).search
+        except re.error as e:
+            print(f'Super IO: invalid regex "{match_value}", {e}')
+
+    MATCH_RULE_CACHE[key] = match_func
+
+    return match_func
+
+
+class MatchDispatcher():
+    """Classify files against the match rules of many configs in one pass
+    each file is checked once, the first matching config in config order wins"""
+
+    def __init__(self, items):
+        # items: [(config_list_index, ConfigItemHelper)] in config order
+        self.rules = list()
+        for index, item in items:
+            match_func = item.get_match_func()
+            if match_func is not None:
+                self.rules.append((index, item, match_func))
+
+    def dispatch(self, file_list):
+        """Return ({file: ConfigItemHelper}, {matched config index})"""
+        match_file_op_dict = dict()
+        match_index_list = set()
+        if len(self.rules) == 0: return match_file_op_dict, match_index_list
+
+        rules = self.rules
+        for file in file_list:
+            name = os.path.basename(file)
+            for index, item, match_func in rules:
+                if match_func(name):
+                    match_file_op_dict[file] = item
+                    match_index_list.add(index)
+                    break
+
+        return match_file_op_dict, match_index_list
+
+
+def get_config_dict(item):
+    """Read a config item into a dict, prop list values are converted to python type"""
+    config = dict()
+    for key in item.__annotations__.keys():
+        if key != 'prop_list':
+            config[key] = getattr(item, key)
+
+    # prop list
+    ops_config = dict()
+    for prop_item in item.prop_list:
+        prop, value = prop_item.name, prop_item.value
+        # skip if the prop is not filled
+        if prop == '' or value == '': continue
+        ops_config[prop] = convert_value(value)
+    config['prop_list'] = ops_config
+
+    return config
+
+
+class ConfigIndex():
+    """Compiled view of the preferences config list
+    rebuilt only after a config is changed (property update callbacks and config list operators mark it dirty)"""
+
+    def __init__(self):
+        self.dirty = True
+        self.size = 0
+        self.entries = list()  # (config_list_index, config dict)
+        self.by_io_type = dict()  # io_type: [entry]
+        self.by_extension = dict()  # (io_type, extension): [entry]
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def build(self):
+        self.entries.clear()
+        self.by_io_type.clear()
+        self.by_extension.clear()
+
+        pref_config = get_pref().config_list
+        for config_list_index, item in enumerate(pref_config):
+            config = get_config_dict(item)
+            entry = (config_list_index, config)
+            self.entries.append(entry)
+            # not qualified config never show up, whatever the use state
+            if not ConfigHelper.is_config_qualified(config, check_use=False): continue
+
+            self.by_io_type.setdefault(config['io_type'], []).append(entry)
+            self.by_extension.setdefault((config['io_type'], config['extension']), []).append(entry)
+
+        self.size = len(pref_config)
+        self.dirty = False
+
+    def ensure(self):
+        # size check catch collection changes made outside of the add-on (eg. preferences reverted)
+        if self.dirty or self.size != len(get_pref().config_list):
+            self.build()
 
-        if match_rule == 'NONE':
-            match_files = list()
-        elif match_rule == 'STARTSWITH':
-            match_files = [file for file in file_list if os.path.basename(file).startswith(match_value)]
-        elif match_rule == 'ENDSWITH':
-            match_files = [file for file in file_list if
-                           os.path.basename(file).removesuffix('.' + self.ext).endswith(match_value)]
-        elif match_rule == 'IN':
-            match_files = [file for file in file_list if match_value in os.path.basename(file)]
-        elif match_rule == 'REGEX':
-            import re
-            match_files = [file for file in file_list if re.search(match_value, os.path.basename(file))]
+    def get_entries(self, io_type='ALL', extension=None):
+        self.ensure()
 
-        return match_files
+        if io_type == 'ALL':
+            return [entry for entry in self.entries if ConfigHelper.is_config_qualified(entry[1], check_use=False)]
+        elif extension is not None:
+            return self.by_extension.get((io_type, extension), [])
+
+        return self.by_io_type.get(io_type, [])
+
+    def get_config(self, config_list_index):
+        self.ensure()
+        return self.entries[config_list_index][1]
+
+
+CONFIG_INDEX = ConfigIndex()
+
+
+def mark_config_dirty(self=None, context=None):
+    """Update callback of config properties"""
+    CONFIG_INDEX.mark_dirty()
+    # rules typed in the ui would pile up, one entry per edit
+    MATCH_RULE_CACHE.clear()
 
 
 class ConfigHelper():
@@ -178,46 +305,32 @@ class ConfigHelper():
     and also to export config to json file/import json file as config'''
 
     def __init__(self, check_use=False, filter=None, io_type="IMPORT"):
-        pref_config = get_pref().config_list
-
         config_list = dict()
         index_list = []
 
-        for config_list_index, item in enumerate(pref_config):
-            # config dict
-            config = dict()
-            # TODO need to clean up later
-            for key in item.__annotations__.keys():
-                value = getattr(item, key)
-                if key != 'prop_list':
-                    config[key] = value
-                # prop list
-                ops_config = dict()
-                if len(item.prop_list) != 0:
-                    for prop_index, prop_item in enumerate(item.prop_list):
-                        prop, value = prop_item.name, prop_item.value
-                        # skip if the prop is not filled
-                        if prop == '' or value == '': continue
-                        ops_config[prop] = convert_value(value)
-                config['prop_list'] = ops_config
-
-            if io_type == 'IMPORT' and self.is_import_config(config, check_use, filter):
-                # check config dict
-                index_list.append(config_list_index)
-                config_list[item.name] = config
+        with PROFILER.span('config.resolve', io_type=io_type, extension=filter or ''):
+            if io_type == 'IMPORT':
+                # no filter, no import config
+                entries = CONFIG_INDEX.get_entries(io_type, extension=filter) if filter else []
+            else:
+                entries = CONFIG_INDEX.get_entries(io_type)
 
-            elif io_type == 'EXPORT' and self.is_export_config(config, check_use):
-                index_list.append(config_list_index)
-                config_list[item.name] = config
+            for config_list_index, config in entries:
+                if check_use and not config.get('use_config'): continue
 
-            elif io_type == 'ALL' and self.is_config_qualified(config, check_use):
                 index_list.append(config_list_index)
-                config_list[item.name] = config
+                config_list[config['name']] = config
 
         self.config_list = config_list
         self.index_list = index_list
 
-    def is_config_qualified(self, config, check_use):
+    def get_item_helper(self, config_list_index):
+        """ConfigItemHelper from the compiled config, no need to read the item again"""
+        return ConfigItemHelper(get_pref().config_list[config_list_index],
+                                config=CONFIG_INDEX.get_config(config_list_index))
+
+    @staticmethod
+    def is_config_qualified(config, check_use):
         if check_use and not config.get('use_config'): return False
 
         if config.get('name') == '' or config.get('extension') == '': return False
@@ -226,16 +339,18 @@ class ConfigHelper():
 
         return True
 
-    def is_import_config(self, config, check_use, filter, io_type="IMPORT"):
+    @classmethod
+    def is_import_config(cls, config, check_use, filter, io_type="IMPORT"):
         return (
-                self.is_config_qualified(config, check_use) and
+                cls.is_config_qualified(config, check_use) and
                 filter and config.get('extension') == filter and
                 config.get('io_type') == io_type
         )
 
-    def is_export_config(self, config, check_use, io_type="EXPORT"):
+    @classmethod
+    def is_export_config(cls, config, check_use, io_type="EXPORT"):
         return (
-                self.is_config_qualified(config, check_use) and
+                cls.is_config_qualified(config, check_use) and
                 config.get('io_type') == io_type
         )
 
@@ -350,8 +465,9 @@ class PopupImportMenu():
 
     def default_image_menu(self, return_menu=False):
         context = self.context
-        join_paths = '$$'.join(self.file_list)
-        join_dirs = '$$'.join(self.dir_list)
+        # registered once, menu redraw only pass the handle
+        join_paths = register_files(self.file_list)
+        join_dirs = register_files(self.dir_list)
 
         def draw_statistics(cls, context):
             layout = cls.layout
@@ -383,6 +499,9 @@ class PopupImportMenu():
                     op.files = join_paths
 
                 if join_dirs != '':
+                    op = col.operator('spio.import_folders', icon='FILE_FOLDER')
+                    op.dirs = join_dirs
+
                     op = col.operator('spio.import_pbr_folders_as_materials')
                     op.dirs = join_dirs
 
@@ -448,11 +567,76 @@ class PopupImportMenu():
                                               title=f'Super Import Image',
                                               icon='IMAGE_DATA')
 
+    def clipboard_image_menu(self, image_name, return_menu=False):
+        """menu for an image pasted in memory, operators get the image datablock by name"""
+        context = self.context
+
+        if context.area.type == "VIEW_3D":
+            def draw_3dview_menu(cls, context):
+                layout = cls.layout
+                layout.operator_context = "INVOKE_DEFAULT"
+                col = layout.column()
+                op = col.operator('spio.import_image_as_reference')
+                op.image_name = image_name
+
+                col.separator()
+                op = col.operator('spio.import_image_as_world')
+                op.image_name = image_name
+
+                op = col.operator('spio.import_image_as_light_gobos')
+                op.image_name = image_name
+
+                op = col.operator('spio.import_image_as_parallax_material')
+                op.image_name = image_name
+
+            if return_menu:
+                return draw_3dview_menu
+
+            context.window_manager.popup_menu(draw_3dview_menu,
+                                              title=f'Super Import Image',
+                                              icon='IMAGE_DATA')
+
+        elif context.area.type == "NODE_EDITOR":
+            def draw_node_editor_menu(cls, context):
+                layout = cls.layout
+                layout.operator_context = "INVOKE_DEFAULT"
+                col = layout.column()
+                op = col.operator('spio.import_image_as_nodes')
+                op.image_name = image_name
+
+            if return_menu:
+                return draw_node_editor_menu
+
+            context.window_manager.popup_menu(draw_node_editor_menu,
+                                              title=f'Super Import Image',
+                                              icon='NODE_SEL')
+
+        elif context.area.type == "FILE_BROWSER" and context.area.ui_type == 'ASSETS':
+            def draw_asset_browser_menu(cls, context):
+                layout = cls.layout
+                layout.operator_context = "INVOKE_DEFAULT"
+                col = layout.column()
+                op = col.operator('spio.import_image_as_world')
+                op.image_name = image_name
+
+                op = col.operator('spio.import_image_as_light_gobos')
+                op.image_name = image_name
+
+                op = col.operator('spio.import_image_as_parallax_material')
+                op.image_name = image_name
+
+            if return_menu:
+                return draw_asset_browser_menu
+
+            context.window_manager.popup_menu(draw_asset_browser_menu,
+                                              title=f'Super Import Image',
+                                              icon='IMAGE_DATA')
+
     def default_blend_menu(self, return_menu=False):
         context = self.context
 
         path = self.file_list[0]
-        join_paths = '$$'.join(self.file_list)
+        join_paths = register_files(self.file_list)
 
         def draw_statistics(cls, context):
             layout = cls.layout
@@ -529,11 +713,13 @@ class PostProcess():
     def fix_blend(self, filepath, scripts_file_name):
         # append obj to scene, mark slower
         from ..imexporter.execute_blend import post_process_blend_file
-        post_process_blend_file(filepath, scripts_file_name)
+        with PROFILER.span('post.fix_blend'):
+            post_process_blend_file(filepath, scripts_file_name)
 
     def open_dir(self, temp_dir):
         if get_pref().post_open_dir:
-            bpy.ops.wm.path_open(filepath=temp_dir)
+            with PROFILER.span('post.open_dir'):
+                bpy.ops.wm.path_open(filepath=temp_dir)
 
     @staticmethod
     def get_update_files(src_file, temp_dir):
@@ -552,7 +738,8 @@ class PostProcess():
             from ..clipboard.clipboard import Clipboard as Clipboard
 
             clipboard = Clipboard()
-            clipboard.push_to_clipboard(paths=paths)
+            with PROFILER.span('post.copy_to_clipboard', files=str(len(paths))):
+                clipboard.push_to_clipboard(paths=paths)
             if op:
                 op.report({'INFO'}, f'{bpy.context.active_object.name}.blend has been copied to Clipboard')
 
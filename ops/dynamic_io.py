@@ -1,7 +1,6 @@
 import bpy
 import os
 import sys
-import time
 
 from bpy.props import (EnumProperty,
                        CollectionProperty,
@@ -9,7 +8,13 @@ from bpy.props import (EnumProperty,
                        IntProperty,
                        BoolProperty)
 
-from .core import get_pref, MeasureTime, PostProcess
+from .core import get_pref, PostProcess
+from ..profiler import PROFILER
+
+
+def use_parallel_import(file_list):
+    pref = get_pref()
+    return pref.parallel_import and len(file_list) >= pref.parallel_import_min_files
 
 
 class IO_Base(bpy.types.Operator):
@@ -17,7 +22,7 @@ class IO_Base(bpy.types.Operator):
 
     # dependant class
     #################
-    dep_classes = []  # for easier manage, helpful for batch register and un register
+    dep_classes = []  # config operators shown in the popup, registered by CONFIG_OPERATORS
 
     # data
     #################
@@ -40,17 +45,19 @@ class IO_Base(bpy.types.Operator):
         self.ext = None
         self.use_custom_config = False
 
-    def register_dep_classes(self):
-        for cls in self.dep_classes:
-            bpy.utils.register_class(cls)
+    @staticmethod
+    def get_area_type(context):
+        return context.area.type if context.area else None
 
-    def unregister_dep_classes(self):
-        for cls in self.dep_classes:
-            bpy.utils.unregister_class(cls)
+    @staticmethod
+    def can_popup(context):
+        """No popup menu in blender --background"""
+        return not bpy.app.background and context.area is not None
 
-    def report_time(self, start_time):
+    def report_time(self, run):
+        """Report the total of a profiler run, the breakdown is in the preferences"""
         if get_pref().report_time: self.report({"INFO"},
-                                               f'{self.bl_label} Cost {round(time.time() - start_time, 5)} s')
+                                               f'{self.bl_label} Cost {round(run.get_duration(), 5)} s')
 
     # Import Method
     def import_blend_default(self, context):
@@ -72,31 +79,99 @@ class IO_Base(bpy.types.Operator):
         pass
 
 
+# files of the last paste, config operators are registered once and read them at execute
+DYNAMIC_IMPORT_STATE = {
+    'file_list': [],
+    'dir_list': [],
+    'match_file_op_dict': {},
+}
+
+
+def set_dynamic_import_state(file_list, dir_list, match_file_op_dict):
+    DYNAMIC_IMPORT_STATE['file_list'] = file_list
+    DYNAMIC_IMPORT_STATE['dir_list'] = dir_list
+    DYNAMIC_IMPORT_STATE['match_file_op_dict'] = match_file_op_dict
+
+
+def get_config_hash(config, io_type):
+    import hashlib
+    return hashlib.sha1(repr((io_type, sorted(config.items()))).encode('utf-8')).hexdigest()
+
+
+class ConfigOperatorPool():
+    """Config operator classes (wm.spio_config_<index>), registered once
+    and registered again only when the config content changes"""
+
+    def __init__(self):
+        self.classes = dict()  # bl_idname: (config hash, class)
+
+    def get_operator(self, index, ITEM, io_type, namespace):
+        bl_idname = f'wm.spio_config_{index}'
+        config_hash = get_config_hash(ITEM.config, io_type)
+
+        exist = self.classes.get(bl_idname)
+        if exist is not None:
+            if exist[0] == config_hash:
+                exist[1].ITEM = ITEM  # same content, refresh the item reference only
+                return exist[1]
+            self.unregister_operator(bl_idname)
+
+        attrs = {"bl_idname": bl_idname,
+                 "bl_label": ITEM.name,
+                 "bl_description": ITEM.description,
+                 'ITEM': ITEM}
+        attrs.update(namespace)
+        op_cls = type("DynOp", (bpy.types.Operator,), attrs)
+
+        with PROFILER.span('operator.register', operator=bl_idname):
+            bpy.utils.register_class(op_cls)
+        self.classes[bl_idname] = (config_hash, op_cls)
+
+        return op_cls
+
+    def unregister_operator(self, bl_idname):
+        config_hash, op_cls = self.classes.pop(bl_idname)
+        try:
+            bpy.utils.unregister_class(op_cls)
+        except RuntimeError:
+            pass
+
+    def clear(self):
+        for bl_idname in list(self.classes):
+            self.unregister_operator(bl_idname)
+
+
+CONFIG_OPERATORS = ConfigOperatorPool()
+
+
 class DynamicImport:
     # define exec
     def execute(self, context):
         # use pre-define index to call config
         ITEM = self.ITEM
+        file_list = DYNAMIC_IMPORT_STATE['file_list']
+        match_file_op_dict = DYNAMIC_IMPORT_STATE['match_file_op_dict']
 
         op_callable, ops_args, op_context = ITEM.get_operator_and_args()
 
-        if op_callable:
-            with MeasureTime() as start_time:
-                for file_path in self.file_list:
-                    if file_path in self.match_file_op_dict: continue
-                    ops_args['filepath'] = file_path
-                    try:
-                        if op_context:
-                            op_callable(op_context, **ops_args)
-                        else:
-                            op_callable(**ops_args)
-                    except Exception as e:
-                        self.report({"ERROR"}, str(e))
-
-                if get_pref().report_time: self.report({"INFO"},
-                                                       f'{self.bl_label} Cost {round(time.time() - start_time, 5)} s')
-        else:
+        # importer run by background workers, no ui operator context
+        parallel = (op_callable and op_context != 'INVOKE_DEFAULT'
+                    and (ITEM.operator_type.startswith('DEFAULT') or ITEM.operator_type == 'CUSTOM'))
+        files = [file_path for file_path in file_list if file_path not in match_file_op_dict]
+
+        if not op_callable:
             self.report({"ERROR"}, f'{op_callable} Error!!!')
+            return {"FINISHED"}
+
+        from .op_batch_import import BatchImportJob, ParallelImportJob, ImportTask, run_batch_import
+
+        if parallel and use_parallel_import(files):
+            job = ParallelImportJob(op_callable.idname_py(), ops_args, files,
+                                    workers=get_pref().parallel_import_workers, title=self.bl_label)
+        else:
+            tasks = [ImportTask(file_path, op_callable, ops_args, op_context) for file_path in files]
+            job = BatchImportJob(tasks, total=len(tasks), title=self.bl_label)
+        run_batch_import(context, job, op=self)
 
         return {"FINISHED"}
 
@@ -112,10 +187,9 @@ class DynamicExport:
         if temp_dir == '':
             temp_dir = bpy.path.abspath(bpy.context.preferences.filepaths.temporary_directory)
             if temp_dir == '':
-                # win temp file
-                temp_dir = os.path.join(os.path.expanduser('~'), 'spio_temp')
-                if not "spio_temp" in os.listdir(os.path.expanduser('~')):
-                    os.makedirs(temp_dir)
+                # managed spio_temp, size / age limited
+                from ..temp_store import TEMP_STORE
+                temp_dir = TEMP_STORE.get_dir()
         else:
             temp_dir = bpy.path.abspath(temp_dir)
             if not os.path.exists(temp_dir):
@@ -130,7 +204,8 @@ class DynamicExport:
         paths.append(filepath)
 
         op_args.update({'filepath': filepath})
-        op_callable(**op_args)
+        with PROFILER.span('export.file', exporter=op_callable.idname_py(), file=os.path.basename(filepath)):
+            op_callable(**op_args)
 
         return paths
 
@@ -151,7 +226,8 @@ class DynamicExport:
             obj.select_set(True)
 
             op_args.update({'filepath': filepath})
-            op_callable(**op_args)
+            with PROFILER.span('export.file', exporter=op_callable.idname_py(), file=os.path.basename(filepath)):
+                op_callable(**op_args)
             obj.select_set(False)
 
         context.view_layer.objects.active = src_active
@@ -175,7 +251,7 @@ class DynamicExport:
             for file in os.listdir(temp_dir):
                 src_file[file] = os.path.getmtime(os.path.join(temp_dir, file))
 
-            with MeasureTime() as start_time:
+            with PROFILER.run(self.bl_label) as run:
                 if self.batch_mode:
                     paths = self.export_batch(context, op_callable, op_args)
                     self.report({'INFO'},
@@ -191,8 +267,8 @@ class DynamicExport:
                 POST.copy_to_clipboard(paths=PostProcess.get_update_files(src_file, temp_dir), op=self)
                 POST.open_dir(temp_dir)
 
-                if get_pref().report_time: self.report({"INFO"},
-                                                       f'{self.bl_label} Cost {round(time.time() - start_time, 5)} s')
+            if get_pref().report_time: self.report({"INFO"},
+                                                   f'{self.bl_label} Cost {round(run.get_duration(), 5)} s')
         else:
             self.report({"ERROR"}, f'{op_callable} Error!!!')
 
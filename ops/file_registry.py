@@ -0,0 +1,47 @@
+"""Session registry of file lists passed to operators
+
+Popup menus used to join every path with '$$' into a StringProperty, which blender copies
+on each redraw and call. The list is now registered once and operators receive a short handle.
+'$$' joined strings and single paths are still accepted, scripts calling the operators keep working.
+"""
+
+from collections import OrderedDict
+
+HANDLE_PREFIX = 'spio_files:'
+MAX_LISTS = 32  # popup menus of older pastes can still be clicked
+
+FILE_LISTS = OrderedDict()  # handle: list of path
+_counter = 0
+
+
+def register_files(paths):
+    """Store a file list and return its handle, '' for an empty list"""
+    global _counter
+    if len(paths) == 0: return ''
+
+    _counter += 1
+    handle = f'{HANDLE_PREFIX}{_counter}'
+    FILE_LISTS[handle] = list(paths)
+
+    while len(FILE_LISTS) > MAX_LISTS:
+        FILE_LISTS.popitem(last=False)
+
+    return handle
+
+
+def is_handle(value):
+    return value.startswith(HANDLE_PREFIX)
+
+
+def resolve_files(value):
+    """File list from a handle, a '$$' joined string or a single path. Empty for an expired handle"""
+    if value == '': return []
+
+    if is_handle(value):
+        return FILE_LISTS.get(value, [])
+
+    return value.split('$$')
+
+
+def clear_files():
+    FILE_LISTS.clear()
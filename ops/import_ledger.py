@@ -0,0 +1,368 @@
+"""Import ledger: provenance of every file imported by SPIO
+
+Imported objects (and the file collections of parallel import) carry a 'spio_import' custom property
+with the source path, size, mtime, content hash and the importer that made them. A session index maps the
+files to their objects, so pasting an unchanged file again creates linked duplicates (shared data,
+like Alt+D) instead of running the importer and getting Mesh.001, Material.001...
+Files are matched by path, size and mtime. Contents are hashed only when an entry has the same size,
+so the first import of a file does not read it twice ('' hash until then).
+"""
+
+import os
+import ast
+import hashlib
+
+import bpy
+from bpy.app.handlers import persistent
+
+from ..temp_store import TempStore
+from ..profiler import PROFILER
+from ..preferences.prefs import get_pref
+
+LEDGER_PROP = 'spio_import'
+
+
+def get_importer_args(args):
+    return {key: value for key, value in (args or dict()).items() if key != 'filepath'}
+
+
+def get_importer_signature(bl_idname, args=None):
+    """Same file imported with other settings is another entry"""
+    args = get_importer_args(args)
+    data = repr((bl_idname, sorted((key, repr(value)) for key, value in args.items())))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:12]
+
+
+def get_source_stat(filepath):
+    """(normalized path, size, mtime), None if the file not exist"""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+
+    return os.path.normcase(os.path.abspath(filepath)), float(st.st_size), st.st_mtime
+
+
+def get_source(id_data):
+    """Provenance dict of an imported object / collection, None if not imported by SPIO"""
+    prop = id_data.get(LEDGER_PROP)
+    if prop is None: return None
+
+    return prop.to_dict() if hasattr(prop, 'to_dict') else dict(prop)
+
+
+def set_source(id_data, entry, linked=False):
+    # sizes / times are saved as float, blender int properties are 32 bits
+    id_data[LEDGER_PROP] = {
+        'path': entry.path,
+        'size': entry.size,
+        'mtime': entry.mtime,
+        'hash': entry.hash,
+        'signature': entry.signature,
+        'importer': entry.importer,
+        'args': entry.args,
+        'context': entry.op_context,
+        'linked': int(linked),
+    }
+
+
+class LedgerEntry():
+    def __init__(self, path, size, mtime, content_hash, signature, importer='', args='', op_context=''):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.hash = content_hash
+        self.signature = signature
+        self.importer = importer  # operator bl_idname
+        self.args = args  # repr of the operator arguments, without filepath
+        self.op_context = op_context
+        self.objects = list()  # object names
+        self.collection = ''  # file collection name (parallel import)
+
+    @classmethod
+    def from_source(cls, source):
+        return cls(source['path'], source['size'], source['mtime'], source['hash'], source['signature'],
+                   source.get('importer', ''), source.get('args', ''), source.get('context', ''))
+
+    def get_args(self):
+        """Importer arguments for a new run"""
+        args = ast.literal_eval(self.args) if self.args else dict()
+        args['filepath'] = self.path
+        return args
+
+    def is_valid(self):
+        """All recorded datablocks still exist and still belong to this file"""
+        if self.collection:
+            coll = bpy.data.collections.get(self.collection)
+            if coll is None or (get_source(coll) or {}).get('path') != self.path: return False
+
+        for name in self.objects:
+            obj = bpy.data.objects.get(name)
+            if obj is None or (get_source(obj) or {}).get('path') != self.path: return False
+
+        return bool(self.objects or self.collection)
+
+
+class ImportLedger():
+    """Session index of the ledger, rebuilt from the custom properties after a file load"""
+
+    def __init__(self):
+        self.entries = dict()  # (path, signature): LedgerEntry
+        self.by_hash = dict()  # (content hash, signature): (path, signature)
+        self.by_size = dict()  # (size, signature): set of (path, signature)
+        self.scanned = False
+
+    def clear(self):
+        self.entries.clear()
+        self.by_hash.clear()
+        self.by_size.clear()
+        self.scanned = False
+
+    def add_entry(self, entry):
+        key = (entry.path, entry.signature)
+        self.entries[key] = entry
+        if entry.hash: self.by_hash[(entry.hash, entry.signature)] = key
+        self.by_size.setdefault((entry.size, entry.signature), set()).add(key)
+
+    def scan(self):
+        """Read the ledger saved in the blend file"""
+        self.entries.clear()
+        self.by_hash.clear()
+        self.by_size.clear()
+
+        for coll in bpy.data.collections:
+            source = get_source(coll)
+            if source is None or source.get('linked'): continue
+            entry = self.get_or_add(source)
+            entry.collection = coll.name
+
+        for obj in bpy.data.objects:
+            source = get_source(obj)
+            if source is None or source.get('linked'): continue
+            entry = self.get_or_add(source)
+            if entry.collection and obj.name in bpy.data.collections[entry.collection].all_objects: continue
+            entry.objects.append(obj.name)
+
+        self.scanned = True
+
+    def get_or_add(self, source):
+        key = (source['path'], source['signature'])
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = LedgerEntry.from_source(source)
+            self.add_entry(entry)
+
+        return entry
+
+    def get_valid(self, key):
+        entry = self.entries.get(key)
+        if entry is not None and entry.is_valid(): return entry
+
+        # renamed / deleted since recorded, read the properties again
+        self.scan()
+        entry = self.entries.get(key)
+        if entry is not None and entry.is_valid(): return entry
+
+    def find(self, stat, signature):
+        """Entry of an unchanged file, compare size / mtime only (no hashing)"""
+        if not self.scanned: self.scan()
+
+        path, size, mtime = stat
+        key = (path, signature)
+        if key not in self.entries: return None
+
+        entry = self.get_valid(key)
+        if entry is not None and entry.size == size and entry.mtime == mtime: return entry
+
+    def find_by_hash(self, content_hash, signature):
+        """Same content pasted from another path, or the file was touched but not modified"""
+        key = self.by_hash.get((content_hash, signature))
+        if key is None: return None
+
+        entry = self.get_valid(key)
+        if entry is not None and entry.hash == content_hash: return entry
+
+    def find_same_content(self, stat, signature):
+        """(entry, content hash) of a file not found by stat. Nothing is hashed when no entry has the same size"""
+        path, size, mtime = stat
+        keys = self.by_size.get((size, signature))
+        if not keys: return None, ''
+
+        # entries recorded without hash, hashed now if their file is still the one imported
+        for key in list(keys):
+            entry = self.entries.get(key)
+            if entry is None or entry.hash: continue
+            if get_source_stat(entry.path) != (entry.path, entry.size, entry.mtime): continue
+            entry.hash = TempStore.hash_file(entry.path)
+            self.by_hash[(entry.hash, signature)] = key
+
+        content_hash = TempStore.hash_file(path)
+        return self.find_by_hash(content_hash, signature), content_hash
+
+    def record(self, stat, content_hash, importer, args, op_context=None, objects=(), collection=None):
+        path, size, mtime = stat
+        entry = LedgerEntry(path, size, mtime, content_hash, get_importer_signature(importer, args),
+                            importer, repr(get_importer_args(args)), op_context or '')
+
+        if collection is not None:
+            set_source(collection, entry)
+            entry.collection = collection.name
+            objects = collection.all_objects
+
+        for obj in objects:
+            set_source(obj, entry)
+            if collection is None: entry.objects.append(obj.name)
+
+        if entry.objects or entry.collection:
+            self.add_entry(entry)
+
+        return entry
+
+    def link(self, context, entry):
+        """Linked duplicates of an entry in the active collection, return the new objects"""
+        if entry.collection:
+            src_coll = bpy.data.collections[entry.collection]
+            target = bpy.data.collections.new(src_coll.name)
+            context.collection.children.link(target)
+            set_source(target, entry, linked=True)
+            sources = list(src_coll.all_objects)
+        else:
+            target = context.collection
+            sources = [bpy.data.objects[name] for name in entry.objects]
+
+        copies = duplicate_linked(sources, target)
+        for obj in copies:
+            set_source(obj, entry, linked=True)
+
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        for obj in copies:
+            obj.select_set(True)
+        if copies: context.view_layer.objects.active = copies[0]
+
+        return copies
+
+
+LEDGER = ImportLedger()
+
+
+def duplicate_linked(objects, target_collection):
+    """Copy objects sharing their data, parents / modifier targets are remapped inside the copied set"""
+    mapping = {obj: obj.copy() for obj in objects}
+
+    for src, obj in mapping.items():
+        if src.parent in mapping:
+            obj.parent = mapping[src.parent]
+        for mod in obj.modifiers:
+            if getattr(mod, 'object', None) in mapping:
+                mod.object = mapping[mod.object]
+        target_collection.objects.link(obj)
+
+    return list(mapping.values())
+
+
+def use_ledger(op_context=None):
+    # importers run with a file browser are left to the user
+    return get_pref().import_ledger and op_context != 'INVOKE_DEFAULT'
+
+
+def call_importer(op_callable, args, op_context=None):
+    with PROFILER.span('importer', importer=op_callable.idname_py()):
+        if op_context:
+            op_callable(op_context, **args)
+        else:
+            op_callable(**args)
+
+
+def run_importer(op_callable, args, op_context=None, collection=None):
+    """Call an importer operator, return the objects it created
+    collection: the batch staging collection the importer links into, only the objects added to it are read
+    instead of comparing every object of the blend file"""
+    if collection is None:
+        before = set(bpy.data.objects)
+        call_importer(op_callable, args, op_context)
+        return [obj for obj in bpy.data.objects if obj not in before]
+
+    objects_count, children_count = len(collection.objects), len(collection.children)
+    call_importer(op_callable, args, op_context)
+
+    objects = list(collection.objects[objects_count:])
+    for child in collection.children[children_count:]:
+        objects.extend(child.all_objects)
+
+    return objects
+
+
+def import_file(context, op_callable, filepath, ops_args=None, op_context=None, collection=None):
+    """Run one importer operator on filepath through the ledger, return True if linked instead of imported
+    collection: staging collection of the batch, see run_importer"""
+    args = dict(ops_args or dict())
+    args['filepath'] = filepath
+
+    stat = get_source_stat(filepath) if use_ledger(op_context) else None
+    if stat is None:
+        call_importer(op_callable, args, op_context)  # nothing to record
+        return False
+
+    bl_idname = op_callable.idname_py()
+    signature = get_importer_signature(bl_idname, args)
+    entry = LEDGER.find(stat, signature)
+    content_hash = entry.hash if entry is not None else ''
+    if entry is None:
+        with PROFILER.span('ledger.hash'):
+            entry, content_hash = LEDGER.find_same_content(stat, signature)
+    if entry is not None:
+        with PROFILER.span('ledger.link'):
+            LEDGER.link(context, entry)
+        return True
+
+    objects = run_importer(op_callable, args, op_context, collection)
+    LEDGER.record(stat, content_hash, bl_idname, args, op_context, objects=objects)
+
+    return False
+
+
+def link_unchanged(context, file_list, bl_idname, args):
+    """Link the files already in the ledger, return {filepath: (stat, hash)} of the files left to import"""
+    if not use_ledger(): return {filepath: (None, None) for filepath in file_list}
+
+    signature = get_importer_signature(bl_idname, args)
+    remain = dict()  # filepath: (stat, hash)
+    for filepath in file_list:
+        stat = get_source_stat(filepath)
+        if stat is None:
+            remain[filepath] = (None, None)
+            continue
+
+        entry = LEDGER.find(stat, signature)
+        content_hash = ''
+        if entry is None:
+            entry, content_hash = LEDGER.find_same_content(stat, signature)
+        if entry is not None:
+            LEDGER.link(context, entry)
+        else:
+            remain[filepath] = (stat, content_hash)
+
+    return remain
+
+
+def record_collections(collections, remain, bl_idname, args):
+    """Record the file collections of a parallel import"""
+    for coll in collections:
+        stat, content_hash = remain.get(coll.get('spio_source'), (None, None))
+        if stat is not None: LEDGER.record(stat, content_hash, bl_idname, args, collection=coll)
+
+
+@persistent
+def clear_ledger(dummy):
+    LEDGER.clear()
+
+
+def register():
+    bpy.app.handlers.load_post.append(clear_ledger)
+
+
+def unregister():
+    if clear_ledger in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_ledger)
+    LEDGER.clear()
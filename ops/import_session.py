@@ -0,0 +1,85 @@
+"""Batch import session
+
+Files of a batch are imported into a staging collection disabled in the viewports, so the growing
+scene is not evaluated / drawn after each file. The staged objects and collections are linked into
+the target collection once at the end. The batch operator itself pushes the single undo step.
+The user can undo or delete collections while a modal batch runs, so the collections are kept by name
+and looked up again at the end.
+"""
+
+import bpy
+
+STAGING_NAME = 'SPIO Import'
+
+
+def find_layer_collection(layer_coll, coll):
+    if layer_coll.collection == coll: return layer_coll
+
+    for child in layer_coll.children:
+        found = find_layer_collection(child, coll)
+        if found is not None: return found
+
+
+class ImportSession():
+    def __init__(self):
+        self.staging = None  # collection name
+        self.target = None  # name of the collection the result goes to, None for the scene collection
+
+    def begin(self, context):
+        view_layer = context.view_layer
+        target = view_layer.active_layer_collection.collection
+        # batch started by another batch, already staged
+        if target.get('spio_staging'): return
+        self.target = None if target == context.scene.collection else target.name
+
+        staging = bpy.data.collections.new(STAGING_NAME)
+        staging['spio_staging'] = True
+        # not evaluated by the viewport depsgraph. the layer collection is not excluded:
+        # python importers select their objects, which must stay in the view layer
+        staging.hide_viewport = True
+        context.scene.collection.children.link(staging)
+        view_layer.active_layer_collection = find_layer_collection(view_layer.layer_collection, staging)
+        self.staging = staging.name
+
+    def get_collection(self, context):
+        """Staging collection the files are imported into, None if the batch is not staged (yet)"""
+        staging = bpy.data.collections.get(self.staging) if self.staging else None
+        # batch started by another batch, imported into the outer staging
+        if staging is None and self.target is None and context.collection.get('spio_staging'):
+            staging = context.collection
+
+        return staging if staging is not None and staging.get('spio_staging') else None
+
+    def get_target(self, context):
+        target = bpy.data.collections.get(self.target) if self.target else None
+        return target if target is not None else context.scene.collection
+
+    def end(self, context):
+        """Link the staged result into the target collection, return the imported objects"""
+        if self.staging is None: return []
+
+        staging = bpy.data.collections.get(self.staging)
+        self.staging = None
+        # undone or removed by the user during the import
+        if staging is None or not staging.get('spio_staging'): return []
+        target = self.get_target(context)
+
+        objects = list(staging.objects)
+        for obj in objects:
+            target.objects.link(obj)
+        for child in staging.children:
+            target.children.link(child)
+        bpy.data.collections.remove(staging)
+
+        view_layer = context.view_layer
+        layer_coll = find_layer_collection(view_layer.layer_collection, target)
+        if layer_coll is not None: view_layer.active_layer_collection = layer_coll
+
+        for obj in context.selected_objects:
+            obj.select_set(False)
+        for obj in objects:
+            if obj.name in view_layer.objects: obj.select_set(True)
+        if objects and objects[-1].name in view_layer.objects:
+            view_layer.objects.active = objects[-1]
+
+        return objects
@@ -0,0 +1,263 @@
+"""Time sliced batch import
+
+An import job is a list / generator of tasks. spio.batch_import runs the tasks of a job for a
+time budget on each timer tick, so blender keeps drawing, shows the progress and can be stopped
+with Esc. Files imported before a cancel stay imported.
+The files are staged in an ImportSession and the whole batch is one undo step: the staging collection
+is created on the first timer tick, inside the modal, and the operator that handed the files over
+returns CANCELLED so it does not push a step of its own (see get_handoff_result).
+"""
+
+import bpy
+import os
+import time
+from bpy.props import StringProperty
+
+from .core import get_pref
+from .import_session import ImportSession
+from ..profiler import PROFILER
+
+TIME_BUDGET = 0.1  # seconds of import per timer tick, at least one file
+
+BATCH_JOBS = dict()  # handle: BatchImportJob, waiting for the operator to run it
+_counter = 0
+
+
+class ImportTask():
+    """Import one file through the import ledger"""
+
+    def __init__(self, filepath, op_callable, ops_args=None, op_context=None):
+        self.filepath = filepath
+        self.op_callable = op_callable
+        self.ops_args = ops_args
+        self.op_context = op_context
+
+    def run(self, context, collection=None):
+        from .import_ledger import import_file
+        import_file(context, self.op_callable, self.filepath, self.ops_args, self.op_context, collection)
+
+
+class BatchImportJob():
+    def __init__(self, tasks, total=None, title='Super Import'):
+        self.tasks = iter(tasks)
+        self.total = total  # None when the tasks come from a generator
+        self.title = title
+        self.done = 0
+        self.errors = 0
+        self.session = ImportSession()
+        self.run = PROFILER.current  # profiler run of the paste, resumed on each step
+
+    def begin(self, context):
+        self.session.begin(context)
+
+    def end(self, context):
+        with PROFILER.span('import.session_end'):
+            self.session.end(context)
+
+    def step(self, context, op=None, budget=TIME_BUDGET):
+        """Run tasks for the time budget, False once all tasks are done"""
+        start = time.perf_counter()
+        # new objects of each file are read from the staging collection, not from all bpy.data.objects
+        collection = self.session.get_collection(context)
+        while True:
+            task = next(self.tasks, None)
+            if task is None: return False
+
+            try:
+                with PROFILER.span('import.file', file=os.path.basename(task.filepath)):
+                    task.run(context, collection)
+                self.done += 1
+            except Exception as e:
+                self.errors += 1
+                if op: op.report({'ERROR'}, f'{os.path.basename(task.filepath)}: {e}')
+
+            if time.perf_counter() - start >= budget: return True
+
+    def cancel(self):
+        pass
+
+    def get_progress_text(self):
+        if self.total is None: return f'{self.title}: {self.done} files'
+        return f'{self.title}: {self.done} / {self.total} files'
+
+
+class ParallelImportJob(BatchImportJob):
+    """Files imported by background blender workers, polled on each tick"""
+
+    def __init__(self, bl_idname, args, file_list, workers=0, title='Super Import'):
+        super().__init__((), total=len(file_list), title=title)
+        self.bl_idname = bl_idname
+        self.args = args
+        self.file_list = file_list
+        self.workers = workers
+        self.task = None
+        self.remain = None
+
+    def step(self, context, op=None, budget=TIME_BUDGET):
+        from ..imexporter.parallel_import import ParallelImport
+        from .import_ledger import link_unchanged, record_collections
+
+        if self.task is None:
+            with PROFILER.span('ledger.link_unchanged', files=str(len(self.file_list))):
+                self.remain = link_unchanged(context, self.file_list, self.bl_idname, self.args)
+            self.done = len(self.file_list) - len(self.remain)
+            if len(self.remain) == 0: return False
+
+            self.task = ParallelImport(self.bl_idname, self.args, list(self.remain), self.workers)
+            with PROFILER.span('import.parallel_start', importer=self.bl_idname):
+                self.task.start()
+            self.start_time = time.perf_counter()
+            return True
+
+        if not self.task.poll():
+            # no timer to come back (blender --background)
+            if budget != float('inf'): return True
+            self.task.wait()
+
+        # workers run outside of any span, record their wall time
+        PROFILER.record('import.parallel_workers', time.perf_counter() - self.start_time,
+                        workers=str(len(self.task.jobs)))
+        try:
+            with PROFILER.span('import.parallel_load'):
+                collections, errors = self.task.load(context.collection)
+        finally:
+            self.task.cleanup()
+
+        record_collections(collections, self.remain, self.bl_idname, self.args)
+        self.done += len(collections)
+        self.errors += len(errors)
+        if op:
+            for filepath, error in errors.items():
+                op.report({'ERROR'}, f'{os.path.basename(filepath)}: {error}')
+
+        return False
+
+    def cancel(self):
+        if self.task is not None: self.task.cancel()
+
+    def get_progress_text(self):
+        if self.task is None: return f'{self.title}: preparing {self.total} files'
+        return f'{self.title}: {self.task.done_count()} / {len(self.task.jobs)} workers done'
+
+
+def register_job(job):
+    global _counter
+    _counter += 1
+    handle = f'spio_job:{_counter}'
+    BATCH_JOBS[handle] = job
+
+    return handle
+
+
+def run_batch_import(context, job, op=None):
+    """Run the job in the modal operator, or at once when there is no window (blender --background)"""
+    if bpy.app.background or context.window is None:
+        job.begin(context)
+        try:
+            while job.step(context, op=op, budget=float('inf')):
+                pass
+        finally:
+            job.end(context)
+        return
+
+    bpy.ops.spio.batch_import('INVOKE_DEFAULT', job=register_job(job))
+    if op is not None: op.batch_modal = True
+
+
+def get_handoff_result(op):
+    """Return value of an operator calling run_batch_import
+    the modal batch pushes the undo step, CANCELLED keeps the caller from pushing an empty one first"""
+    return {'CANCELLED'} if getattr(op, 'batch_modal', False) else {'FINISHED'}
+
+
+class SPIO_OT_batch_import(bpy.types.Operator):
+    """Import a batch of files a slice at a time, Esc to stop (imported files are kept)"""
+
+    bl_idname = 'spio.batch_import'
+    bl_label = 'Batch Import'
+    bl_options = {'UNDO', 'INTERNAL'}
+
+    job: StringProperty()  # handle of a job in BATCH_JOBS
+
+    def execute(self, context):
+        job = BATCH_JOBS.pop(self.job, None)
+        if job is None: return {'CANCELLED'}
+
+        self.start_time = time.time()
+        with PROFILER.resume(job.run):
+            job.begin(context)
+            try:
+                while job.step(context, op=self, budget=float('inf')):
+                    pass
+            finally:
+                job.end(context)
+        self.report_done(job)
+
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        self.batch_job = BATCH_JOBS.pop(self.job, None)
+        if self.batch_job is None: return {'CANCELLED'}
+
+        self.start_time = time.time()
+        self.begun = False  # session begins on the first tick, in the undo step of this operator
+        wm = context.window_manager
+        wm.progress_begin(0, max(self.batch_job.total or 0, 1))
+        self.timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        job = self.batch_job
+
+        if event.type == 'ESC':
+            job.cancel()
+            with PROFILER.resume(job.run):
+                self.end(context)
+            self.report({'WARNING'}, f'{job.title} cancelled, {job.done} files imported')
+            return {'FINISHED'}  # keep the imported files (and their undo step)
+
+        if event.type != 'TIMER': return {'PASS_THROUGH'}
+
+        with PROFILER.resume(job.run):
+            if not self.begun:
+                job.begin(context)
+                self.begun = True
+            try:
+                more = job.step(context, op=self)
+            except Exception as e:
+                self.report({'ERROR'}, str(e))
+                more = False
+            context.window_manager.progress_update(job.done)
+            if not more: self.end(context)
+
+        if not more:
+            self.report_done(job)
+            return {'FINISHED'}
+
+        context.workspace.status_text_set(f'{job.get_progress_text()} (Esc to cancel)')
+
+        return {'RUNNING_MODAL'}
+
+    def end(self, context):
+        if self.begun: self.batch_job.end(context)
+        wm = context.window_manager
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+
+    def report_done(self, job):
+        if not get_pref().report_time: return
+
+        cost = round(time.time() - self.start_time, 2)
+        self.report({'INFO'}, f'{job.title}: {job.done} files imported ({cost} s)')
+
+
+def register():
+    bpy.utils.register_class(SPIO_OT_batch_import)
+
+
+def unregister():
+    bpy.utils.unregister_class(SPIO_OT_batch_import)
+    BATCH_JOBS.clear()
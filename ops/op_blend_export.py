@@ -10,14 +10,15 @@ from os.path import join, exists
 
 from bpy.props import StringProperty, BoolProperty, EnumProperty
 from .core import get_pref, PostProcess
+from ..profiler import PROFILER
 
 
 class ImageCopyDefault:
     @classmethod
     def poll(_cls, context):
-        if sys.platform in {"darwin", "win32"}:
+        if sys.platform in {"darwin", "win32", "linux"}:
             return (
-                    context.area.type == "VIEW_3D"
+                    (context.area.type == "VIEW_3D" if context.area else bpy.app.background)
                     and context.active_object is not None
                     and context.active_object.mode == 'OBJECT'
                     and len(context.selected_objects) != 0
@@ -41,23 +42,25 @@ class SPIO_OT_export_blend(ImageCopyDefault, bpy.types.Operator):
         return temp_dir
 
     def execute(self, context):
-        # copy buffer
-        bpy.ops.view3d.copybuffer()
-        temp_dir = self.get_temp_dir()  # win support only(not sure the temp dir of macOS)
-        if self.filepath == '': self.filepath = os.path.join(temp_dir, context.active_object.name + '.blend')
-
-        if exists(self.filepath):
-            os.remove(self.filepath)  # remove exist file
-
-        POST = PostProcess()
-        POST.fix_blend(join(temp_dir, 'copybuffer.blend'),
-                       scripts_file_name=self.scripts_file_name)
-        # Copy
-        shutil.copy(join(temp_dir, 'copybuffer.blend'),
-                    self.filepath)
-        # Prefs
-        POST.copy_to_clipboard(paths=[self.filepath], op=self)
-        POST.open_dir(self.filepath)
+        with PROFILER.run(self.bl_label):
+            # copy buffer
+            with PROFILER.span('export.copybuffer'):
+                bpy.ops.view3d.copybuffer()
+            temp_dir = self.get_temp_dir()  # win support only(not sure the temp dir of macOS)
+            if self.filepath == '': self.filepath = os.path.join(temp_dir, context.active_object.name + '.blend')
+
+            if exists(self.filepath):
+                os.remove(self.filepath)  # remove exist file
+
+            POST = PostProcess()
+            POST.fix_blend(join(temp_dir, 'copybuffer.blend'),
+                           scripts_file_name=self.scripts_file_name)
+            # Copy
+            shutil.copy(join(temp_dir, 'copybuffer.blend'),
+                        self.filepath)
+            # Prefs
+            POST.copy_to_clipboard(paths=[self.filepath], op=self)
+            POST.open_dir(self.filepath)
 
         return {'FINISHED'}
 
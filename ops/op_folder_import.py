@@ -0,0 +1,89 @@
+import bpy
+import os
+from bpy.props import StringProperty, IntProperty, BoolProperty
+
+from .core import get_pref, get_op_by_idname, ConfigHelper, MatchDispatcher, CONFIG_INDEX
+from .file_registry import resolve_files
+
+
+class FolderImporter():
+    """Pick the importer of each file of a folder batch:
+    config with a matching rule > first config without rule > blender's default importer"""
+
+    def __init__(self, area_type=None, use_default=True):
+        from ..imexporter.default_importer import get_importer
+
+        self.area_type = area_type
+        self.default_importer = get_importer(cpp_obj_importer=get_pref().cpp_obj_importer) if use_default else {}
+        self.targets = dict()  # ext: (MatchDispatcher, catch all ConfigItemHelper)
+
+    def get_extensions(self):
+        """Extensions that have an enabled import config or a default importer"""
+        extensions = {config['extension'].lower() for index, config in CONFIG_INDEX.get_entries('IMPORT')
+                      if config.get('use_config')}
+
+        return extensions | set(self.default_importer)
+
+    def get_targets(self, ext):
+        if ext not in self.targets:
+            configs = ConfigHelper(check_use=True, filter=ext, io_type='IMPORT')
+            items = [(index, configs.get_item_helper(index)) for index in configs.index_list]
+            items = [(index, ITEM) for index, ITEM in items if ITEM.is_config_item_poll(self.area_type)]
+            catch_all = next((ITEM for index, ITEM in items if ITEM.get_match_func() is None), None)
+            self.targets[ext] = (MatchDispatcher(items), catch_all)
+
+        return self.targets[ext]
+
+    def iter_tasks(self, batches):
+        """ImportTask of each file of the (ext, [path]) batches"""
+        from .op_batch_import import ImportTask
+
+        for ext, batch in batches:
+            dispatcher, catch_all = self.get_targets(ext)
+            match_file_op_dict, match_index_list = dispatcher.dispatch(batch)
+
+            for filepath in batch:
+                item = match_file_op_dict.get(filepath, catch_all)
+                if item is not None:
+                    op_callable, ops_args, op_context = item.get_operator_and_args()
+                    # no file browser for each file of a folder
+                    if op_context == 'INVOKE_DEFAULT': op_context = None
+                elif ext in self.default_importer:
+                    op_callable, ops_args, op_context = get_op_by_idname(self.default_importer[ext]), dict(), None
+                else:
+                    continue
+
+                yield ImportTask(filepath, op_callable, ops_args, op_context)
+
+
+class SPIO_OT_import_folders(bpy.types.Operator):
+    """Import every supported file in the pasted folders (sub folders included), Esc to stop"""
+
+    bl_idname = 'spio.import_folders'
+    bl_label = 'Import Folder Files'
+
+    dirs: StringProperty()  # folder list handle (see file_registry), or paths joined with $$
+    batch_size: IntProperty(name='Batch Size', default=32, min=1)
+    recursive: BoolProperty(name='Sub Folders', default=True)
+
+    def execute(self, context):
+        from ..imexporter.folder_walk import iter_folder_files, iter_ext_batches
+        from .op_batch_import import BatchImportJob, run_batch_import
+
+        area_type = context.area.type if context.area else None
+        importer = FolderImporter(area_type)
+        paths = iter_folder_files(resolve_files(self.dirs), importer.get_extensions(), self.recursive)
+        tasks = importer.iter_tasks(iter_ext_batches(paths, self.batch_size))
+
+        # files are found while importing, no total
+        run_batch_import(context, BatchImportJob(tasks, title='Import Folders'), op=self)
+
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(SPIO_OT_import_folders)
+
+
+def unregister():
+    bpy.utils.unregister_class(SPIO_OT_import_folders)
@@ -3,13 +3,79 @@ import os
 import sys
 import math
 from bpy.props import StringProperty, BoolProperty, EnumProperty
+from bpy.app.handlers import persistent
 
 from ..public_path_utils import get_template_dir, TemplateDir
+from ..temp_store import TEMP_STORE
+from .file_registry import resolve_files, register_files
+from ..imexporter.addon_loader import ensure_operator
+
+# session index of pasted images, content hash: image name
+IMAGE_INDEX = dict()
+
+
+def get_indexed_image(key):
+    """Image already loaded for this content, None if not found"""
+    image = bpy.data.images.get(IMAGE_INDEX.get(key, ''))
+    if image is not None and image.get('spio_hash') == key:
+        return image
+
+    # renamed or loaded with the blend file, the hash is saved as custom property
+    for image in bpy.data.images:
+        if image.get('spio_hash') == key:
+            IMAGE_INDEX[key] = image.name
+            return image
+
+    IMAGE_INDEX.pop(key, None)
+
+
+def index_image(key, image):
+    image['spio_hash'] = key
+    IMAGE_INDEX[key] = image.name
+
+
+def get_path_key(path):
+    """files stored by content in temp store use their hash, other files (copied image with its name) use path and stat"""
+    path = os.path.abspath(path)
+    if os.path.normcase(os.path.dirname(path)) == os.path.normcase(os.path.abspath(TEMP_STORE.root)):
+        key = TEMP_STORE.get_content_key(path)
+        if key is not None: return key
+
+    st = os.stat(path)
+    return f'{path}|{st.st_mtime_ns}|{st.st_size}'
+
+
+@persistent
+def clear_image_index(dummy):
+    IMAGE_INDEX.clear()
+
+
+def load_clipboard_image(clip_image, name='Clipboard'):
+    """Create a packed image datablock from a ClipboardImage, without writing any file"""
+    key = clip_image.get_hash()
+    image = get_indexed_image(key)
+    if image is not None: return image
+
+    if clip_image.is_raw():
+        image = bpy.data.images.new(name, clip_image.width, clip_image.height, alpha=True)
+        image.pixels.foreach_set(clip_image.get_pixels())
+        image.pack()
+    else:
+        # let blender decode the png bytes from memory
+        image = bpy.data.images.new(name, 8, 8)
+        image.pack(data=clip_image.encoded, data_len=len(clip_image.encoded))
+        image.source = 'FILE'
+
+    image.filepath_raw = f'//{image.name}.{clip_image.ext}'
+    index_image(key, image)
+
+    return image
 
 
 class image_io:
     bl_options = {'UNDO_GROUPED'}
-    files: StringProperty()  # list of filepath, join with$$
+    files: StringProperty()  # file list handle (see file_registry), or filepath joined with $$
+    image_name: StringProperty()  # image pasted in memory, used instead of files
 
     action = None
 
@@ -30,6 +96,14 @@ class image_io:
             return context.area.ui_type == 'ASSETS'
 
     def load_image_by_path(self, path):
+        try:
+            key = get_path_key(path)
+        except OSError:
+            key = None
+
+        image = get_indexed_image(key) if key else None
+        if image is not None: return image
+
         src_images = list(bpy.data.images)
 
         # use built-in ops instead of bpy.data.images.load to detect sequence and UDIM
@@ -39,16 +113,34 @@ class image_io:
             bpy.data.images.get(os.path.basename(path))]
 
         image = images[0]
+        if key and image is not None: index_image(key, image)
 
         return image
 
+    def iter_images(self):
+        """yield (filepath, image), filepath is empty for image pasted in memory"""
+        if self.image_name != '':
+            image = bpy.data.images.get(self.image_name)
+            if image: yield '', image
+            return
+
+        for filepath in resolve_files(self.files):
+            yield filepath, self.load_image_by_path(filepath)
+
 
 class SPIO_OT_import_image_as_reference(image_io, bpy.types.Operator):
     bl_idname = "spio.import_image_as_reference"
     bl_label = "Import as Reference"
 
     def execute(self, context):
-        for filepath in self.files.split('$$'):
+        if self.image_name != '':
+            for filepath, image in self.iter_images():
+                bpy.ops.object.empty_add(type='IMAGE', align='VIEW')
+                context.object.data = image
+                context.object.name = image.name
+            return {'FINISHED'}
+
+        for filepath in resolve_files(self.files):
             bpy.ops.object.load_reference_image(filepath=filepath)
 
         return {'FINISHED'}
@@ -59,11 +151,16 @@ class SPIO_OT_import_image_as_plane(image_io, bpy.types.Operator):
     bl_label = "Import as Plane"
 
     def execute(self, context):
-        filepaths = self.files.split('$$')
+        filepaths = resolve_files(self.files)
+        if len(filepaths) == 0:
+            self.report({'ERROR'}, 'No image to import, the file list has expired, paste again')
+            return {'CANCELLED'}
+
         dir = os.path.dirname(filepaths[0]) + '\\'
         files = [{"name": os.path.basename(filepath)} for filepath in
                  filepaths]
 
+        ensure_operator('import_image.to_plane')
         bpy.ops.import_image.to_plane(files=files, directory=dir, offset=True)
 
         return {'FINISHED'}
@@ -75,8 +172,7 @@ class SPIO_OT_import_image_as_nodes(image_io, bpy.types.Operator):
 
     def execute(self, context):
         location_X, location_Y = context.space_data.cursor_location
-        for filepath in self.files.split('$$'):
-            image = self.load_image_by_path(filepath)
+        for filepath, image in self.iter_images():
 
             bpy.ops.node.select_all(action='DESELECT')
             nt = context.space_data.edit_tree
@@ -136,9 +232,13 @@ class SPIO_OT_import_image_PBR_setup(image_io, bpy.types.Operator):
         # from addon_utils import enable
         # enable('node_wrangler')
 
-        filepaths = self.files.split('$$')
+        filepaths = resolve_files(self.files)
+        if len(filepaths) == 0:
+            self.report({'ERROR'}, 'No image to import, the file list has expired, paste again')
+            return {'CANCELLED'}
+
         dir = os.path.dirname(filepaths[0]) + '\\'
-        files = '$$'.join([os.path.basename(filepath) for filepath in filepaths])
+        files = register_files([os.path.basename(filepath) for filepath in filepaths])
 
         # print(filepaths[0])
         # print(dir)
@@ -159,12 +259,10 @@ class SPIO_OT_import_image_as_world(image_io, bpy.types.Operator):
     bl_label = "Import as World"
 
     def invoke(self, context, event):
-        for filepath in self.files.split('$$'):
+        for filepath, img in self.iter_images():
             # get preset node group
             node_group_file = get_template_dir(TemplateDir.WORLD)
 
-            img = self.load_image_by_path(filepath)
-
             with bpy.data.libraries.load(str(node_group_file), link=False) as (data_from, data_to):
                 setattr(data_to, 'worlds', getattr(data_from, 'worlds'))
 
@@ -188,12 +286,11 @@ class SPIO_OT_import_image_as_light_gobos(image_io, bpy.types.Operator):
     bl_label = "Import as Light Gobos"
 
     def invoke(self, context, event):
-        for filepath in self.files.split('$$'):
-            img = self.load_image_by_path(filepath)
-
+        for filepath, img in self.iter_images():
             bpy.ops.object.light_add(type='AREA')
             light = context.object
-            light.name = ".".join(os.path.basename(filepath).split('.')[:-1])  # get file name without extension
+            # get file name without extension
+            light.name = ".".join(os.path.basename(filepath).split('.')[:-1]) if filepath else img.name
 
             d = light.data
             d.shadow_soft_size = 1  # set a small shadow soft size to get clear shapes
@@ -217,9 +314,10 @@ class SPIO_OT_import_image_as_light_gobos(image_io, bpy.types.Operator):
 
             if event.alt:
                 light.asset_mark()
-                override = context.copy()
-                override['id'] = light
-                bpy.ops.ed.lib_id_load_custom_preview(override, filepath=filepath)
+                if filepath:
+                    override = context.copy()
+                    override['id'] = light
+                    bpy.ops.ed.lib_id_load_custom_preview(override, filepath=filepath)
 
         return {'FINISHED'}
 
@@ -230,11 +328,9 @@ class SPIO_OT_import_image_as_parallax_material(image_io, bpy.types.Operator):
     bl_label = "Import as Parallax Material"
 
     def invoke(self, context, event):
-        for filepath in self.files.split('$$'):
+        for filepath, img in self.iter_images():
             node_group_file = get_template_dir(TemplateDir.PARALLAX_MAPPING)
 
-            img = self.load_image_by_path(filepath)
-
             with bpy.data.libraries.load(str(node_group_file), link=False) as (data_from, data_to):
                 data_to.materials = ['ParallaxMapping']
 
@@ -263,7 +359,7 @@ from ..clipboard.clipboard import Clipboard as Clipboard, get_dir
 class ImageCopyDefault:
     @classmethod
     def poll(_cls, context):
-        if sys.platform in {"darwin", "win32"}:
+        if sys.platform in {"darwin", "win32", "linux"}:
             return (
                     context.area.type == "IMAGE_EDITOR"
                     and context.area.spaces.active.image is not None
@@ -333,7 +429,7 @@ class SPIO_OT_import_pbr_folders_as_materials(bpy.types.Operator):
     dirs: StringProperty(name='Join Dirs')
 
     def invoke(self, context, event):
-        dirs = self.dirs.split('$$')
+        dirs = resolve_files(self.dirs)
 
         for i, dir in enumerate(dirs):
             # add and set slot
@@ -368,7 +464,7 @@ class SPIO_OT_create_principled_set_up_material(bpy.types.Operator):
         default=True
     )
 
-    # file name combine with $$ to split files
+    # file names, handle from file_registry or combine with $$
     files: StringProperty()
     # to check is single mode or batch mode(multiple dirs)
     use_context_space: BoolProperty(default=False)
@@ -456,7 +552,7 @@ class SPIO_OT_create_principled_set_up_material(bpy.types.Operator):
         def match_files_to_socket_names(directory):
             for sname in socketnames:
                 if self.files != '':
-                    for fname in self.files.split('$$'):
+                    for fname in resolve_files(self.files):
                         if is_matches(fname, sname):
                             break
                 else:
@@ -671,7 +767,13 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    bpy.app.handlers.load_post.append(clear_image_index)
+
 
 def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
+
+    if clear_image_index in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_image_index)
+    IMAGE_INDEX.clear()
@@ -5,14 +5,15 @@ import sys
 from bpy.props import StringProperty, BoolProperty, EnumProperty
 
 from .core import get_pref, PostProcess
+from ..profiler import PROFILER
 
 
 class ModeCopyDefault:
     @classmethod
     def poll(_cls, context):
-        if sys.platform in {"darwin", "win32"}:
+        if sys.platform in {"darwin", "win32", "linux"}:
             return (
-                    context.area.type == "VIEW_3D"
+                    (context.area.type == "VIEW_3D" if context.area else bpy.app.background)
                     and context.active_object is not None
                     and context.active_object.mode == 'OBJECT'
                     and len(context.selected_objects) != 0
@@ -31,10 +32,9 @@ class SPIO_OT_export_model(ModeCopyDefault, bpy.types.Operator):
         ori_dir = bpy.context.preferences.filepaths.temporary_directory
         temp_dir = ori_dir
         if ori_dir == '':
-            # win temp file
-            temp_dir = os.path.join(os.path.expanduser('~'), 'spio_temp')
-            if not "spio_temp" in os.listdir(os.path.expanduser('~')):
-                os.makedirs(temp_dir)
+            # managed spio_temp, size / age limited
+            from ..temp_store import TEMP_STORE
+            temp_dir = TEMP_STORE.get_dir()
 
         return temp_dir
 
@@ -55,7 +55,8 @@ class SPIO_OT_export_model(ModeCopyDefault, bpy.types.Operator):
             obj.select_set(True)
 
             op_args.update({'filepath': filepath})
-            op_callable(**op_args)
+            with PROFILER.span('export.file', exporter=op_callable.idname_py(), file=os.path.basename(filepath)):
+                op_callable(**op_args)
             obj.select_set(False)
 
         context.view_layer.objects.active = src_active
@@ -68,7 +69,8 @@ class SPIO_OT_export_model(ModeCopyDefault, bpy.types.Operator):
         paths.append(filepath)
 
         op_args.update({'filepath': filepath})
-        op_callable(**op_args)
+        with PROFILER.span('export.file', exporter=op_callable.idname_py(), file=os.path.basename(filepath)):
+            op_callable(**op_args)
 
         return paths
 
@@ -97,21 +99,20 @@ class SPIO_OT_export_model(ModeCopyDefault, bpy.types.Operator):
 
         op_args = exporter_ops_props.get(self.extension)
 
+        with PROFILER.run(f'{self.bl_label} {self.extension.upper()}'):
+            if self.batch_mode:
+                paths = self.export_batch(context, op_callable, op_args, temp_dir)
+                self.report({'INFO'},
+                            f'{len(paths)} {self.extension} files has been copied to Clipboard')
 
+            else:
+                paths = self.export_single(context, op_callable, op_args, temp_dir)
+                self.report({'INFO'}, f'{context.active_object.name}.{self.extension} has been copied to Clipboard')
 
-        if self.batch_mode:
-            paths = self.export_batch(context, op_callable, op_args, temp_dir)
-            self.report({'INFO'},
-                        f'{len(paths)} {self.extension} files has been copied to Clipboard')
-
-        else:
-            paths = self.export_single(context, op_callable, op_args, temp_dir)
-            self.report({'INFO'}, f'{context.active_object.name}.{self.extension} has been copied to Clipboard')
-
-        # Pref
-        POST = PostProcess()
-        POST.copy_to_clipboard(paths=PostProcess.get_update_files(src_file, temp_dir), op=self)
-        POST.open_dir(temp_dir)
+            # Pref
+            POST = PostProcess()
+            POST.copy_to_clipboard(paths=PostProcess.get_update_files(src_file, temp_dir), op=self)
+            POST.open_dir(temp_dir)
 
         return {'FINISHED'}
 
@@ -3,6 +3,7 @@ import bpy
 from bpy.props import StringProperty
 from ..imexporter.default_importer import get_importer
 from ..preferences.prefs import get_pref
+from .file_registry import resolve_files
 
 
 class SPIO_OT_import_model(bpy.types.Operator):
@@ -12,10 +13,13 @@ class SPIO_OT_import_model(bpy.types.Operator):
     bl_label = 'Import Model'
     bl_options = {'UNDO_GROUPED'}
 
-    files: StringProperty()  # list of filepath, join with$$
+    files: StringProperty()  # file list handle (see file_registry), or filepath joined with $$
 
     @classmethod
     def poll(_cls, context):
+        if context.area is None:
+            return bpy.app.background  # headless run
+
         if context.area.type == "VIEW_3D":
             return (
                     context.area.ui_type == "VIEW_3D"
@@ -29,16 +33,21 @@ class SPIO_OT_import_model(bpy.types.Operator):
             )
 
     def execute(self, context):
+        from .op_batch_import import BatchImportJob, ImportTask, run_batch_import, get_handoff_result
+
         importer = get_importer(cpp_obj_importer=get_pref().cpp_obj_importer)
 
-        for filepath in self.files.split('$$'):
+        tasks = list()
+        for filepath in resolve_files(self.files):
             ext = filepath.split('.')[-1]
             if ext in importer:
                 bl_idname = importer.get(ext)
                 op_callable = getattr(getattr(bpy.ops, bl_idname.split('.')[0]), bl_idname.split('.')[1])
-                op_callable(filepath=filepath)
+                tasks.append(ImportTask(filepath, op_callable))
+
+        run_batch_import(context, BatchImportJob(tasks, total=len(tasks), title=self.bl_label), op=self)
 
-        return {'FINISHED'}
+        return get_handoff_result(self)
 
 
 def register():
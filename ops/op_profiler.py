@@ -0,0 +1,54 @@
+import bpy
+import os
+import time
+from bpy.props import StringProperty
+
+from .core import get_pref
+from ..profiler import PROFILER
+
+
+class SPIO_OT_dump_profile(bpy.types.Operator):
+    """Save the timing of the recent super import / export runs to a json file"""
+    bl_idname = 'spio.dump_profile'
+    bl_label = 'Save Timing'
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    filter_glob: StringProperty(default='*.json', options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        self.filepath = os.path.join(os.path.expanduser('~'), time.strftime('spio_timing_%Y%m%d_%H%M%S.json'))
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        if self.filepath == '': return {'CANCELLED'}
+
+        PROFILER.dump(self.filepath)
+        self.report({'INFO'}, f'{len(PROFILER.runs)} runs saved to {self.filepath}')
+
+        return {'FINISHED'}
+
+
+class SPIO_OT_clear_profile(bpy.types.Operator):
+    """Clear the timing of the recent runs"""
+    bl_idname = 'spio.clear_profile'
+    bl_label = 'Clear Timing'
+
+    def execute(self, context):
+        PROFILER.clear()
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(SPIO_OT_dump_profile)
+    bpy.utils.register_class(SPIO_OT_clear_profile)
+
+    try:
+        PROFILER.configure(get_pref().profile_max_runs)
+    except AttributeError:
+        pass  # preferences not registered
+
+
+def unregister():
+    bpy.utils.unregister_class(SPIO_OT_dump_profile)
+    bpy.utils.unregister_class(SPIO_OT_clear_profile)
@@ -2,6 +2,7 @@ import bpy
 import os
 from os.path import join
 from ..preferences.prefs import get_pref
+from .core import mark_config_dirty
 
 import re
 
@@ -87,6 +88,8 @@ class SPIO_OT_read_preset(bpy.types.Operator):
                         prop_item.name = key
                         prop_item.value = value
 
+                mark_config_dirty()
+
                 return {'FINISHED'}
 
             op_cls = type("DynOp",
@@ -0,0 +1,167 @@
+import bpy
+import re
+
+from .core import get_op_by_idname
+from .import_ledger import (LEDGER, LedgerEntry, get_source, set_source, get_source_stat, run_importer)
+from ..temp_store import TempStore
+
+# datablocks an importer may create, the ones left without users after a refresh are removed
+DATA_ATTRS = ('meshes', 'curves', 'materials', 'images', 'textures', 'node_groups', 'armatures', 'actions',
+              'cameras', 'lights')
+
+
+def get_base_name(name):
+    """Cube.001 -> Cube"""
+    return re.sub(r'\.\d{3,}$', '', name)
+
+
+def get_imported_groups():
+    """{(path, signature): (LedgerEntry, [objects])}, linked duplicates included"""
+    groups = dict()
+    for obj in bpy.data.objects:
+        source = get_source(obj)
+        if source is None or not source.get('importer'): continue
+
+        key = (source['path'], source['signature'])
+        if key not in groups:
+            groups[key] = (LedgerEntry.from_source(source), list())
+        groups[key][1].append(obj)
+
+    return groups
+
+
+def match_objects(old_objects, new_objects):
+    """Pair old / new objects of the same type by name (the new ones get a .001 suffix)"""
+    by_name = dict()
+    for obj in new_objects:
+        by_name.setdefault((get_base_name(obj.name), obj.type), []).append(obj)
+
+    pairs = list()
+    for obj in old_objects:
+        candidates = by_name.get((get_base_name(obj.name), obj.type))
+        if candidates: pairs.append((obj, candidates.pop(0)))
+
+    return pairs
+
+
+def swap_data(old_obj, new_obj):
+    """Give old_obj (and its linked duplicates) the data of new_obj, materials of old data are kept"""
+    old_data, new_data = old_obj.data, new_obj.data
+    if old_data is None or new_data is None or old_data == new_data: return
+
+    if hasattr(old_data, 'materials'):
+        new_data.materials.clear()
+        for mat in old_data.materials:
+            new_data.materials.append(mat)
+
+    # every user of the old data in one call, not a loop over all the objects of the file
+    old_data.user_remap(new_data)
+
+    name = old_data.name
+    if old_data.users == 0:
+        bpy.data.batch_remove([old_data])
+        new_data.name = name
+
+
+def get_collection_tree(coll):
+    colls = [coll]
+    for child in coll.children:
+        colls.extend(get_collection_tree(child))
+
+    return colls
+
+
+class SPIO_OT_refresh_imported(bpy.types.Operator):
+    """Import again the files changed since they were imported, mesh data is swapped in place
+    (transforms, modifiers and materials are kept)"""
+
+    bl_idname = 'spio.refresh_imported'
+    bl_label = 'Refresh Imported'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def execute(self, context):
+        refreshed = unchanged = 0
+
+        for entry, objects in get_imported_groups().values():
+            stat = get_source_stat(entry.path)
+            if stat is None:
+                self.report({'WARNING'}, f'{entry.path} not exist!')
+                continue
+
+            path, size, mtime = stat
+            if size == entry.size and mtime == entry.mtime:
+                unchanged += 1
+                continue
+
+            content_hash = TempStore.hash_file(path)
+            entry.size, entry.mtime = size, mtime
+            if content_hash != entry.hash:
+                entry.hash = content_hash
+                try:
+                    self.refresh_file(context, entry, objects)
+                except Exception as e:
+                    self.report({'ERROR'}, f'{path}: {e}')
+                    continue
+                refreshed += 1
+            else:
+                unchanged += 1  # saved again without change
+
+            for obj in objects:
+                if obj.name in bpy.data.objects:
+                    set_source(obj, entry, linked=get_source(obj).get('linked', 0))
+
+        LEDGER.clear()
+        self.report({'INFO'}, f'{refreshed} files refreshed, {unchanged} unchanged')
+
+        return {'FINISHED'}
+
+    def refresh_file(self, context, entry, objects):
+        op_callable = get_op_by_idname(entry.importer)
+        args = entry.get_args()
+        data_before = {attr: set(getattr(bpy.data, attr)) for attr in DATA_ATTRS}
+
+        # import in a temporary collection, the active one is not touched
+        temp_coll = bpy.data.collections.new('spio_refresh')
+        context.scene.collection.children.link(temp_coll)
+        view_layer = context.view_layer
+        active_layer_coll = view_layer.active_layer_collection
+        view_layer.active_layer_collection = view_layer.layer_collection.children[temp_coll.name]
+        try:
+            new_objects = run_importer(op_callable, args, entry.op_context or None, collection=temp_coll)
+        finally:
+            view_layer.active_layer_collection = active_layer_coll
+
+        originals = [obj for obj in objects if not get_source(obj).get('linked')]
+        pairs = match_objects(originals, new_objects)
+        for old_obj, new_obj in pairs:
+            swap_data(old_obj, new_obj)
+
+        # parts added to the source file
+        matched = {new_obj for old_obj, new_obj in pairs}
+        targets = originals[0].users_collection if originals else (context.collection,)
+        for obj in new_objects:
+            if obj in matched: continue
+            for coll in targets:
+                coll.objects.link(obj)
+            set_source(obj, entry)
+
+        bpy.data.batch_remove(list(matched) + get_collection_tree(temp_coll))
+
+        # materials / images created by the importer and not used anymore (images are freed by the materials)
+        for i in range(3):
+            orphans = [id_data for attr in DATA_ATTRS for id_data in getattr(bpy.data, attr)
+                       if id_data not in data_before[attr] and id_data.users == 0]
+            if not orphans: break
+            bpy.data.batch_remove(orphans)
+
+
+def register():
+    bpy.utils.register_class(SPIO_OT_refresh_imported)
+
+
+def unregister():
+    bpy.utils.unregister_class(SPIO_OT_refresh_imported)
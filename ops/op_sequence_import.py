@@ -0,0 +1,281 @@
+"""Import numbered file sequences as one object
+
+VDB: one volume with sequence frames (blender volume sequence)
+ABC: one alembic cache (is_sequence)
+STL / PLY: one mesh object, the frame mesh is read by the SPIO NumPy readers when the frame changes
+and a few recent frames are cached. Other mesh formats are imported once per frame and the frame
+meshes are swapped on the same object.
+"""
+
+import os
+import uuid
+from bisect import bisect_right
+from functools import partial
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .core import get_op_by_idname
+
+SEQUENCE_PROP = 'spio_sequence'
+SEQUENCE_CACHE_SIZE = 8  # meshes kept per lazy sequence
+
+LAZY_READERS = {'stl', 'ply'}
+CACHE_SEQUENCE_EXTS = {'vdb', 'abc'}  # sequence formats, detected by default
+MESH_SEQUENCE_EXTS = {'stl', 'ply', 'obj'}  # detected only when enabled in the preferences
+
+# session index of frame meshes, (sequence id, frame): mesh name, recently used last
+SEQUENCE_MESHES = dict()
+
+
+def read_frame_mesh(name, filepath, ext):
+    from ..imexporter.fast_mesh import mesh_from_arrays
+
+    if ext == 'stl':
+        from ..imexporter.stl_reader import read_stl
+
+        vertices, faces = read_stl(filepath)
+        return mesh_from_arrays(name, vertices, faces)
+
+    from ..imexporter.ply_reader import read_ply
+
+    data = read_ply(filepath)
+    if data.is_point_cloud():
+        return mesh_from_arrays(name, data.vertices)
+    elif data.face_sizes is not None:
+        return mesh_from_arrays(name, data.vertices, data.faces, face_sizes=data.face_sizes)
+
+    return mesh_from_arrays(name, data.vertices, data.faces, corners_per_face=data.faces.shape[1])
+
+
+def get_frame_mesh(seq_id, frame):
+    mesh = bpy.data.meshes.get(SEQUENCE_MESHES.get((seq_id, frame), ''))
+    if mesh is None:
+        # renamed or loaded with the blend file
+        for m in bpy.data.meshes:
+            if m.get('spio_sequence_id') == seq_id and m.get('spio_sequence_frame') == frame:
+                mesh = m
+                break
+
+    if mesh is None:
+        SEQUENCE_MESHES.pop((seq_id, frame), None)
+    else:
+        # move to the end, recently used
+        SEQUENCE_MESHES.pop((seq_id, frame), None)
+        SEQUENCE_MESHES[(seq_id, frame)] = mesh.name
+
+    return mesh
+
+
+def add_frame_mesh(seq_id, frame, mesh):
+    mesh['spio_sequence_id'] = seq_id
+    mesh['spio_sequence_frame'] = frame
+    SEQUENCE_MESHES[(seq_id, frame)] = mesh.name
+
+
+def evict_frame_meshes(seq_id, keep):
+    """Remove the least recently used frame meshes of a lazy sequence"""
+    keys = [key for key in SEQUENCE_MESHES if key[0] == seq_id]
+    for key in keys[:max(0, len(keys) - keep)]:
+        mesh = bpy.data.meshes.get(SEQUENCE_MESHES.pop(key))
+        if mesh is not None and mesh.users == 0: bpy.data.meshes.remove(mesh)
+
+
+def get_sequence_frame(frames, scene_frame):
+    """Last file frame not after the scene frame, held before the first / after the last"""
+    index = bisect_right(frames, scene_frame) - 1
+    return frames[max(index, 0)]
+
+
+def update_sequence_object(obj, scene_frame):
+    info = obj[SEQUENCE_PROP]
+    frames = list(info['frames'])
+    frame = get_sequence_frame(frames, scene_frame)
+    if obj.get('spio_sequence_current') == frame and obj.data is not None: return
+
+    seq_id = info['id']
+    mesh = get_frame_mesh(seq_id, frame)
+    if mesh is None:
+        if not info.get('lazy'): return  # frame mesh removed by the user
+        name = info['files'].split('\n')[frames.index(frame)]
+        mesh = read_frame_mesh(f'{obj.name}.{frame}', os.path.join(info['directory'], name), info['ext'])
+        add_frame_mesh(seq_id, frame, mesh)
+
+    old_mesh = obj.data
+    if old_mesh is not None and old_mesh != mesh and len(mesh.materials) == 0:
+        for mat in old_mesh.materials:
+            mesh.materials.append(mat)
+
+    obj.data = mesh
+    obj['spio_sequence_current'] = frame
+    # empty mesh the object was created with
+    if old_mesh is not None and old_mesh.users == 0 and 'spio_sequence_id' not in old_mesh:
+        bpy.data.meshes.remove(old_mesh)
+
+    if info.get('lazy'): evict_frame_meshes(seq_id, SEQUENCE_CACHE_SIZE)
+
+
+@persistent
+def update_sequences(scene, depsgraph=None):
+    # render threads read the meshes, data can't be swapped under them
+    if bpy.app.is_job_running('RENDER'): return
+
+    for obj in scene.objects:
+        if obj.type != 'MESH' or SEQUENCE_PROP not in obj: continue
+        try:
+            update_sequence_object(obj, scene.frame_current)
+        except (OSError, ValueError) as e:
+            print(f'Super IO: sequence {obj.name} frame failed, {e}')
+
+
+@persistent
+def clear_sequence_index(dummy):
+    SEQUENCE_MESHES.clear()
+
+
+def new_sequence_object(context, seq, lazy):
+    mesh = bpy.data.meshes.new(seq.name)
+    obj = bpy.data.objects.new(seq.name, mesh)
+    obj[SEQUENCE_PROP] = {
+        'id': uuid.uuid4().hex[:12],
+        'directory': seq.directory,
+        'files': '\n'.join(seq.files[frame] for frame in seq.frames),
+        'frames': seq.frames,
+        'ext': seq.ext,
+        'lazy': int(lazy),
+    }
+    context.collection.objects.link(obj)
+
+    return obj
+
+
+def share_frame_materials(mesh, materials):
+    """Each imported frame brings its own copy of the materials, use the first frame ones and remove the copies"""
+    copies = {mat for mat in mesh.materials if mat is not None and mat not in materials}
+    for index in range(min(len(mesh.materials), len(materials))):
+        mesh.materials[index] = materials[index]
+
+    for mat in copies:
+        if mat.users == 0: bpy.data.materials.remove(mat)
+
+
+class SequenceTask():
+    """One step of a sequence import, run by BatchImportJob like an ImportTask"""
+
+    def __init__(self, filepath, func):
+        self.filepath = filepath
+        self.func = func
+
+    def run(self, context, collection=None):
+        self.func(context, collection)
+
+
+class EagerSequenceImport():
+    """Import each frame with the default importer, keep only the frame meshes
+    one frame per task, the object is found by name on each task (undo can run between two ticks)"""
+
+    def __init__(self, seq, bl_idname):
+        self.seq = seq
+        self.bl_idname = bl_idname
+        self.obj_name = None
+        self.materials = None  # names of the first frame materials, every frame use them
+
+    def get_tasks(self):
+        return [SequenceTask(self.seq.get_path(frame), partial(self.import_frame, frame)) for frame in self.seq.frames]
+
+    def import_frame(self, frame, context, collection=None):
+        from .import_ledger import run_importer
+
+        obj = bpy.data.objects.get(self.obj_name) if self.obj_name else None
+        if obj is None:
+            obj = new_sequence_object(context, self.seq, lazy=False)
+            self.obj_name = obj.name
+            self.materials = None
+
+        op_callable = get_op_by_idname(self.bl_idname)
+        new_objects = run_importer(op_callable, {'filepath': self.seq.get_path(frame)}, collection=collection)
+        meshes = [o.data for o in new_objects if o.type == 'MESH']
+        if meshes:
+            mesh = meshes[0]
+            mesh.name = f'{obj.name}.{frame}'
+            mesh.use_fake_user = True  # not used between frame changes, keep it on save
+            add_frame_mesh(obj[SEQUENCE_PROP]['id'], frame, mesh)
+
+            materials = [bpy.data.materials.get(name) for name in self.materials] if self.materials else None
+            if materials is None or None in materials:
+                self.materials = [mat.name for mat in mesh.materials if mat is not None]
+            else:
+                share_frame_materials(mesh, materials)
+
+        bpy.data.batch_remove(new_objects)
+
+        if frame == self.seq.frames[-1]: select_sequence_object(context, obj)
+
+
+def select_sequence_object(context, obj):
+    for o in context.selected_objects:
+        o.select_set(False)
+    obj.select_set(True)
+    context.view_layer.objects.active = obj
+    update_sequence_object(obj, context.scene.frame_current)
+
+
+def import_file_sequence(seq, context, collection=None):
+    """Import a vdb / abc / lazy mesh FileSequence as one object, return the object"""
+    ext = seq.ext
+    if ext == 'vdb':
+        files = [{'name': seq.files[frame]} for frame in seq.frames]
+        bpy.ops.object.volume_import(filepath=seq.first_path, directory=seq.directory, files=files,
+                                     use_sequence_detection=True)
+        return context.active_object
+
+    if ext == 'abc':
+        bpy.ops.wm.alembic_import(filepath=seq.first_path, is_sequence=True, as_background_job=False)
+        return context.active_object
+
+    obj = new_sequence_object(context, seq, lazy=True)
+    select_sequence_object(context, obj)
+
+    return obj
+
+
+def get_sequence_tasks(file_list, importer, exts, min_files=None):
+    """Batch import tasks of the numbered sequences found in file_list, and the files that are not part of one
+    importer: extension: importer bl_idname (see default_importer.get_importer)
+    exts: extensions imported as sequence, see get_sequence_exts"""
+    from ..imexporter.file_sequence import group_sequences, SEQUENCE_MIN_FILES
+
+    if not exts: return [], file_list
+
+    sequences, others = group_sequences(file_list, min_files or SEQUENCE_MIN_FILES)
+    tasks = list()
+    for seq in sequences:
+        if seq.ext not in exts or seq.ext not in importer:
+            others.extend(seq.get_paths())
+        elif seq.ext in LAZY_READERS or seq.ext in CACHE_SEQUENCE_EXTS:
+            tasks.append(SequenceTask(seq.first_path, partial(import_file_sequence, seq)))
+        else:
+            tasks.extend(EagerSequenceImport(seq, importer.get(seq.ext)).get_tasks())
+
+    return tasks, others
+
+
+def get_sequence_exts(pref):
+    """numbered mesh files are often separate parts (part_1.obj, part_2.obj...), their detection is opt-in"""
+    if not pref.detect_sequences: return set()
+    if pref.detect_mesh_sequences: return CACHE_SEQUENCE_EXTS | MESH_SEQUENCE_EXTS
+
+    return CACHE_SEQUENCE_EXTS
+
+
+def register():
+    bpy.app.handlers.frame_change_post.append(update_sequences)
+    bpy.app.handlers.load_post.append(clear_sequence_index)
+
+
+def unregister():
+    if update_sequences in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(update_sequences)
+    if clear_sequence_index in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_sequence_index)
+    SEQUENCE_MESHES.clear()
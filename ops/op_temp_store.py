@@ -0,0 +1,62 @@
+import bpy
+import os
+
+from .core import get_pref
+from ..temp_store import TEMP_STORE
+
+
+def get_used_paths():
+    """files in the temp store still used by the current blend file"""
+    root = os.path.normcase(os.path.abspath(TEMP_STORE.root))
+    paths = set()
+    for img in bpy.data.images:
+        if img.library or img.packed_file or img.source in {'VIEWER', 'GENERATED'}: continue
+        path = os.path.abspath(bpy.path.abspath(img.filepath))
+        if os.path.normcase(os.path.dirname(path)) == root:
+            paths.add(path)
+
+    return paths
+
+
+SWEEP_CHECK = 10  # seconds between two checks of the size budget
+
+
+def sweep_temp_store():
+    try:
+        TEMP_STORE.configure(max_size_mb=get_pref().temp_max_size, max_age_days=get_pref().temp_max_age)
+        TEMP_STORE.sweep(keep=get_used_paths())
+    except Exception as e:
+        print(f'Super IO: clean temp files failed, {e}')
+
+
+def check_temp_store():
+    """Sweep on the main thread once a paste / copy went over the size budget"""
+    if TEMP_STORE.sweep_pending: sweep_temp_store()
+    return SWEEP_CHECK
+
+
+class SPIO_OT_clean_temp_store(bpy.types.Operator):
+    """Remove old and least recently used files in spio_temp"""
+    bl_idname = 'spio.clean_temp_store'
+    bl_label = 'Clean Temp Files'
+
+    def execute(self, context):
+        removed = TEMP_STORE.sweep(keep=get_used_paths())
+        self.report({'INFO'}, f'{removed} temp files removed, {round(TEMP_STORE.total_size / 1024 / 1024, 2)} MB left')
+
+        return {'FINISHED'}
+
+
+def register():
+    bpy.utils.register_class(SPIO_OT_clean_temp_store)
+    # startup sweep, wait for preferences and file to be loaded
+    bpy.app.timers.register(sweep_temp_store, first_interval=5)
+    bpy.app.timers.register(check_temp_store, first_interval=5 + SWEEP_CHECK, persistent=True)
+
+
+def unregister():
+    for timer in (sweep_temp_store, check_temp_store):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+
+    bpy.utils.unregister_class(SPIO_OT_clean_temp_store)
@@ -0,0 +1,188 @@
+"""Watch folder mode
+
+The folders set in the preferences are polled by a timer with an incremental index (see
+imexporter/folder_watch.py). New files that settled are routed through the same config matching as
+Super Import (FolderImporter) and imported a time slice per tick, so the ui keeps running while
+files keep coming. Each batch of files is staged and linked to the scene at once.
+"""
+
+import bpy
+import time
+from bpy.app.handlers import persistent
+
+from .core import get_pref
+from ..profiler import PROFILER
+
+TICK = 0.05  # seconds between two import slices while there are files to import
+JOB_FILES = 64  # files of one import batch, the result is linked to the scene after each batch
+
+
+class FolderWatcher():
+    def __init__(self):
+        self.watches = list()  # FolderWatch of each watched folder
+        self.queue = list()  # settled files waiting for import
+        self.job = None  # BatchImportJob running
+        self.last_poll = 0.0
+        self.imported = 0
+        self.errors = 0
+
+    def is_running(self):
+        return bpy.app.timers.is_registered(watch_tick)
+
+    def restart(self):
+        """Start watching the folders of the preferences, the files already there are not imported
+        files settled but not imported yet stay queued"""
+        from ..imexporter.folder_watch import FolderWatch
+
+        self.stop(keep_queue=True)
+
+        pref = get_pref()
+        if not pref.use_watch_folders:
+            self.queue.clear()
+            return
+
+        self.watches = [FolderWatch([bpy.path.abspath(item.path)], item.recursive, pref.watch_settle_time)
+                        for item in pref.watch_folders if item.path != '']
+        if len(self.watches) == 0: return
+
+        for watch in self.watches:
+            watch.start()
+        self.last_poll = time.monotonic()
+        bpy.app.timers.register(watch_tick, first_interval=pref.watch_interval, persistent=True)
+
+    def stop(self, keep_queue=False):
+        if self.is_running(): bpy.app.timers.unregister(watch_tick)
+
+        # keep the files imported so far, the files left go back to the queue
+        job = self.job
+        if job is not None:
+            self.finish_job(bpy.context)
+            if keep_queue: self.queue[:0] = [task.filepath for task in job.tasks]
+
+        self.watches.clear()
+        if not keep_queue: self.queue.clear()
+
+    def poll(self, pref):
+        self.last_poll = time.monotonic()
+        for watch in self.watches:
+            watch.settle_time = pref.watch_settle_time
+            self.queue.extend(watch.poll())
+
+    def start_job(self, context):
+        from ..imexporter.folder_walk import get_ext, iter_ext_batches
+        from .op_folder_import import FolderImporter
+        from .op_batch_import import BatchImportJob
+
+        files, self.queue = self.queue[:JOB_FILES], self.queue[JOB_FILES:]
+
+        importer = FolderImporter('VIEW_3D')
+        extensions = importer.get_extensions()
+        files = [filepath for filepath in files if get_ext(filepath) in extensions]
+        if len(files) == 0: return
+
+        # tasks in a list, the files left are queued again if the job is dropped
+        tasks = list(importer.iter_tasks(iter_ext_batches(files, batch_size=JOB_FILES)))
+        with PROFILER.run('Watch Folder'):
+            self.job = BatchImportJob(tasks, total=len(tasks), title='Watch Folder')
+        self.job.begin(context)
+
+    def step(self, context):
+        job = self.job
+        with PROFILER.resume(job.run):
+            try:
+                more = job.step(context)
+            except Exception as e:
+                print(f'Super IO: watch folder import failed, {e}')
+                more = False
+
+        if not more: self.finish_job(context)
+
+    def finish_job(self, context):
+        job, self.job = self.job, None
+        with PROFILER.resume(job.run):
+            job.end(context)
+
+        self.imported += job.done
+        self.errors += job.errors
+        if job.errors: print(f'Super IO: watch folder, {job.errors} files failed to import')
+
+        if not bpy.app.background: self.push_undo(context)
+
+    @staticmethod
+    def push_undo(context):
+        """Timers have no window in context, the undo push needs one with a screen"""
+        windows = context.window_manager.windows
+        if len(windows) == 0: return
+
+        window = windows[0]
+        try:
+            with context.temp_override(window=window, screen=window.screen):
+                bpy.ops.ed.undo_push(message='Watch Folder Import')
+        except RuntimeError as e:
+            print(f'Super IO: watch folder import could not be added to undo history, {e}')
+
+    def drop_job(self):
+        """File is about to be replaced, queue the files not imported yet again"""
+        if self.job is None: return
+
+        self.queue[:0] = [task.filepath for task in self.job.tasks]
+        self.job = None
+
+    def tick(self, context):
+        pref = get_pref()
+        if time.monotonic() - self.last_poll >= pref.watch_interval: self.poll(pref)
+
+        # importers need object mode, wait for the user
+        if context.mode != 'OBJECT': return pref.watch_interval
+
+        if self.job is None and len(self.queue) > 0: self.start_job(context)
+        if self.job is not None: self.step(context)
+
+        return TICK if self.job is not None or len(self.queue) > 0 else pref.watch_interval
+
+    def get_status(self):
+        if not self.is_running(): return 'Not watching'
+
+        pending = sum(len(watch.pending) for watch in self.watches)
+        waiting = len(self.queue) + (self.job.total - self.job.done - self.job.errors if self.job else 0)
+        return f'{self.imported} imported, {waiting} to import, {pending} settling'
+
+
+WATCHER = FolderWatcher()
+
+
+def watch_tick():
+    try:
+        return WATCHER.tick(bpy.context)
+    except Exception as e:
+        print(f'Super IO: watch folder stopped, {e}')
+        return None
+
+
+def start_watch():
+    """Startup, wait for the preferences to be loaded"""
+    try:
+        WATCHER.restart()
+    except Exception as e:
+        print(f'Super IO: watch folder failed to start, {e}')
+
+
+@persistent
+def drop_watch_job(dummy):
+    WATCHER.drop_job()
+
+
+def register():
+    bpy.app.timers.register(start_watch, first_interval=1)
+    bpy.app.handlers.load_pre.append(drop_watch_job)
+
+
+def unregister():
+    if bpy.app.timers.is_registered(start_watch):
+        bpy.app.timers.unregister(start_watch)
+    bpy.app.handlers.load_pre.remove(drop_watch_job)
+
+    try:
+        WATCHER.stop()
+    except Exception as e:
+        print(e)
@@ -4,6 +4,8 @@ import os
 
 from bpy.props import StringProperty, BoolProperty, EnumProperty
 
+from .file_registry import resolve_files
+
 
 class blenderFileDefault:
     bl_label = 'blenderFileDefault'
@@ -95,6 +97,7 @@ class SPIO_OT_batch_import_blend(bpy.types.Operator):
     """Batch import all from all files"""
     bl_idname = 'spio.batch_import_blend'
     bl_label = 'Batch Import'
+    bl_options = {'UNDO'}
 
     # action
     action: EnumProperty(items=[
@@ -102,7 +105,7 @@ class SPIO_OT_batch_import_blend(bpy.types.Operator):
         ('APPEND', 'Append', ''),
         ('OPEN', 'Open Extra', ''),
     ])
-    # filepath join with $$
+    # file list handle (see file_registry), or filepath joined with $$
     files: StringProperty()
 
     # property to pass in to single blend file importer
@@ -111,13 +114,21 @@ class SPIO_OT_batch_import_blend(bpy.types.Operator):
     data_type: StringProperty()
 
     def execute(self, context):
-        for filepath in self.files.split('$$'):
-            if self.action == 'LINK':
-                bpy.ops.spio.link_blend(filepath=filepath, data_type=self.data_type, load_all=self.load_all)
-            elif self.action == 'APPEND':
-                bpy.ops.spio.append_blend(filepath=filepath, data_type=self.data_type, load_all=self.load_all)
-            elif self.action == 'OPEN':
-                bpy.ops.spio.open_blend_extra(filepath=filepath)
+        from .import_session import ImportSession
+
+        # one undo step, objects staged and linked to the scene at the end
+        session = ImportSession()
+        session.begin(context)
+        try:
+            for filepath in resolve_files(self.files):
+                if self.action == 'LINK':
+                    bpy.ops.spio.link_blend(filepath=filepath, data_type=self.data_type, load_all=self.load_all)
+                elif self.action == 'APPEND':
+                    bpy.ops.spio.append_blend(filepath=filepath, data_type=self.data_type, load_all=self.load_all)
+                elif self.action == 'OPEN':
+                    bpy.ops.spio.open_blend_extra(filepath=filepath)
+        finally:
+            session.end(context)
 
         return {'FINISHED'}
 
@@ -3,7 +3,7 @@ import json
 import os
 
 from bpy.props import StringProperty, BoolProperty
-from .core import get_pref
+from .core import get_pref, mark_config_dirty
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 
 
@@ -46,6 +46,8 @@ class SPIO_OT_import_config(bpy.types.Operator, ImportHelper):
 
             self.report({"INFO"}, f'Load config from "{self.filepath}"')
 
+        mark_config_dirty()
+
         return {"FINISHED"}
 
 
@@ -1,10 +1,11 @@
 import bpy
 
 from .dynamic_io import IO_Base
-from .core import MeasureTime, ConfigItemHelper, ConfigHelper
+from .core import ConfigItemHelper, ConfigHelper
 from .core import is_float, get_pref, convert_value
 
 from ..preferences.data_icon import G_ICON_ID
+from ..profiler import PROFILER
 
 
 class WM_OT_super_export(IO_Base, bpy.types.Operator):
@@ -13,58 +14,53 @@ class WM_OT_super_export(IO_Base, bpy.types.Operator):
     bl_label = 'Super Export'
 
     def invoke(self, context, event):
+        return self.execute(context)
+
+    def execute(self, context):
+        """Register config operators and popup, without window only the operators are registered
+        so headless scripts can call bpy.ops.wm.spio_config_xxx() directly"""
         self.restore()
-        # filter user's configs
-        self.CONFIGS = ConfigHelper(check_use=True, io_type='EXPORT')
+        with PROFILER.run(self.bl_label):
+            # filter user's configs
+            self.CONFIGS = ConfigHelper(check_use=True, io_type='EXPORT')
 
-        self.use_custom_config = not self.CONFIGS.is_empty()
+            self.use_custom_config = not self.CONFIGS.is_empty()
 
-        return self.export_custom_dynamic(context)
+            return self.export_custom_dynamic(context)
 
     def export_custom_dynamic(self, context):
-        # unregister_class
-        self.unregister_dep_classes()
         self.dep_classes.clear()
 
         # dynamic operator
         ##################
-        from .dynamic_io import DynamicExport
+        from .dynamic_io import DynamicExport, CONFIG_OPERATORS
 
         if self.use_custom_config:
 
             for index in self.CONFIGS.index_list:
                 # pass in
-                config_item = get_pref().config_list[index]
-                ITEM = ConfigItemHelper(config_item)
-                if not ITEM.is_config_item_poll(context.area.type): continue
-
-                op_cls = type("DynOp",
-                              (bpy.types.Operator,),
-                              {"bl_idname": f'wm.spio_config_{index}',
-                               "bl_label": ITEM.name,
-                               "bl_description": ITEM.description,
-                               "execute": DynamicExport.execute,
-                               "invoke": DynamicExport.invoke,
-                               "poll": DynamicExport.poll,
-                               # custom pass in
-                               'ITEM': ITEM,
-                               'batch_mode': False,
-                               'extension': ITEM.extension,
-                               # custom function
-                               'export_single': DynamicExport.export_single,
-                               'export_batch': DynamicExport.export_batch,
-                               'get_temp_dir': DynamicExport.get_temp_dir,
-                               },
-                              )
+                ITEM = self.CONFIGS.get_item_helper(index)
+                if not ITEM.is_config_item_poll(self.get_area_type(context)): continue
+
+                op_cls = CONFIG_OPERATORS.get_operator(index, ITEM, 'EXPORT',
+                                                       {"execute": DynamicExport.execute,
+                                                        "invoke": DynamicExport.invoke,
+                                                        "poll": DynamicExport.poll,
+                                                        # custom pass in
+                                                        'batch_mode': False,
+                                                        'extension': ITEM.extension,
+                                                        # custom function
+                                                        'export_single': DynamicExport.export_single,
+                                                        'export_batch': DynamicExport.export_batch,
+                                                        'get_temp_dir': DynamicExport.get_temp_dir,
+                                                        })
 
                 self.dep_classes.append(op_cls)
 
-            # register
-            self.register_dep_classes()
-
         ############################
         # pop up menu
         ############################
+        if not self.can_popup(context): return {'FINISHED'}
 
         export_op = self
 
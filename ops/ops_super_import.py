@@ -6,10 +6,12 @@ import sys
 import bpy
 from bpy.props import (StringProperty)
 
-from .dynamic_io import IO_Base
-from .core import MeasureTime, ConfigItemHelper, ConfigHelper
+from .dynamic_io import IO_Base, use_parallel_import
+from .core import ConfigItemHelper, ConfigHelper
 from .core import get_pref
 
+from ..profiler import PROFILER
+
 from ..preferences.data_icon import G_ICON_ID
 
 
@@ -21,51 +23,92 @@ class SuperImport(IO_Base, bpy.types.Operator):
     # Build-in
     ############
     def invoke(self, context, event):
+        """Pull clipboard in a thread, the modal resumes the import once data arrives (Esc to cancel)"""
+        self.restore()
+
+        from ..clipboard.clipboard import Clipboard as Clipboard, ClipboardPullTask
+
+        # the pull thread and the batch import record into this run
+        with PROFILER.run(self.bl_label) as self.profile:
+            self.pull_task = ClipboardPullTask(Clipboard(), force_unicode=get_pref().force_unicode,
+                                               image_in_memory=get_pref().image_paste_in_memory)
+        # clipboard not changed since last paste
+        if self.pull_task.is_done():
+            return self.finish_pull(context)
+
+        wm = context.window_manager
+        self.pull_timer = wm.event_timer_add(0.02, window=context.window)
+        wm.modal_handler_add(self)
+        context.workspace.status_text_set('Super Import: reading clipboard... (Esc to cancel)')
+
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.pull_task.cancel()
+            self.end_pull(context)
+            self.report({"WARNING"}, "Super Import cancelled")
+            return {'CANCELLED'}
+
+        if event.type == 'TIMER' and self.pull_task.is_done():
+            self.end_pull(context)
+            return self.finish_pull(context)
+
+        return {'PASS_THROUGH'}
+
+    def end_pull(self, context):
+        context.window_manager.event_timer_remove(self.pull_timer)
+        context.workspace.status_text_set(None)
+
+    def finish_pull(self, context):
+        with PROFILER.resume(self.profile):
+            try:
+                payload = self.pull_task.get_payload()
+            except Exception as e:
+                self.report({"ERROR"}, str(e))
+                return {"CANCELLED"}
+
+            if payload.is_empty():
+                self.report({"ERROR"}, "No file found in clipboard!")
+                return {"CANCELLED"}
+
+            return self.import_payload(context, payload)
+
+    def execute(self, context):
+        """Pull clipboard and import, also the entry for blender --background (invoke is not called without window)"""
         self.restore()
 
         from ..clipboard.clipboard import Clipboard as Clipboard
-        # get Clipboard
-        self.clipboard = Clipboard()
-        file_list = self.clipboard.pull_files_from_clipboard(force_unicode=get_pref().force_unicode)
-
-        del self.clipboard  # release clipboard
-
-        if len(file_list) == 0:
-            self.report({"ERROR"}, "No file found in clipboard!")
-            return {"CANCELLED"}
-
-        for file_path in file_list:
-            if os.path.isdir(file_path):
-                self.dir_list.append(file_path)  # add dir list for batch import folder's files
-                continue
-            elif not os.path.exists(file_path):
-                self.report({"ERROR"}, f"{file_path} not exist!")
-
-            # pass extra file
-            extension = file_path.split('.')[-1].lower()
-            if extension in {'mtl'}:
-                continue
-
-            self.file_list.append(file_path)
-        # count ext type
-        ext_list = [file.split('.')[-1].lower() for file in self.file_list]
-        # report if more than one extension is selected
-        if len(set(ext_list)) > 1:
-            self.report({"WARNING"}, "More than one format of file is copied!")
-            # return {"CANCELLED"}
-        ext_count_dict = dict()
 
-        for ext in ext_list:
-            if ext not in ext_count_dict:
-                ext_count_dict[ext] = 1
-            else:
-                ext_count_dict[ext] += 1
+        with PROFILER.run(self.bl_label):
+            # get Clipboard
+            self.clipboard = Clipboard()
+            payload = self.clipboard.pull_payload(force_unicode=get_pref().force_unicode,
+                                                  image_in_memory=get_pref().image_paste_in_memory)
+
+            del self.clipboard  # release clipboard
+
+            if payload.is_empty():
+                self.report({"ERROR"}, "No file found in clipboard!")
+                return {"CANCELLED"}
 
-        # set the main ext
-        for key, value in ext_count_dict.items():
-            if (value == max(ext_count_dict.values())):
-                self.ext = key
-                break
+            return self.import_payload(context, payload)
+
+    def import_payload(self, context, payload):
+        if payload.image is not None:
+            return self.import_clipboard_image(context, payload.image)
+
+        # copy, the payload is shared with the clipboard cache
+        self.file_list.extend(payload.file_list)
+        self.dir_list.extend(payload.dir_list)
+        self.ext = payload.ext
+
+        for file_path in payload.missing_list:
+            self.report({"ERROR"}, f"{file_path} not exist!")
+
+        # report if more than one extension is selected
+        if payload.is_multi_ext():
+            self.report({"WARNING"}, "More than one format of file is copied!")
 
         # call for match configs
         self.CONFIGS = ConfigHelper(check_use=True, filter=self.ext, io_type='IMPORT')
@@ -78,99 +121,76 @@ class SuperImport(IO_Base, bpy.types.Operator):
                 self.import_blend_default(context)
                 return {'FINISHED'}
             else:
-                return self.execute(context)
+                from .op_batch_import import get_handoff_result
+
+                # timing is reported by the batch import
+                self.import_default(context)
+
+                return get_handoff_result(self)
 
         self.use_custom_config = True
 
         return self.import_custom_dynamic(context)
 
-    def execute(self, context):
-        with MeasureTime() as start_time:
-            self.import_default(context)
-            self.report_time(start_time)
+    def import_clipboard_image(self, context, clip_image):
+        """Load pasted image into a packed datablock, no temp file is written"""
+        from .op_image_io import load_clipboard_image
 
-        return {"FINISHED"}
+        with PROFILER.span('image.load'):
+            image = load_clipboard_image(clip_image)
+        self.report_time(PROFILER.current)
+
+        if context.area and context.area.type == 'IMAGE_EDITOR':
+            context.area.spaces.active.image = image
+        elif self.can_popup(context):
+            from .core import PopupImportMenu
+
+            popup = PopupImportMenu([], [], context)
+            popup.clipboard_image_menu(image.name)
+
+        return {'FINISHED'}
 
     # Import Method (Popup)
     def import_custom_dynamic(self, context):
-        # unregister_class
-        self.unregister_dep_classes()
         self.dep_classes.clear()
 
         # no match list
         file_list = self.file_list
         dir_list = self.dir_list
-        # match dict
-        match_file_op_dict = dict()
-        # match index :exclude from popup importer
-        match_index_list = list()
-
-        for index in self.CONFIGS.index_list:
-            # set config for register
-            config_item = get_pref().config_list[index]
-            ITEM = ConfigItemHelper(config_item)
-            if not ITEM.is_config_item_poll(context.area.type): continue
-
-            match_files = ITEM.get_match_files(file_list)
+        # match dict, match index :exclude from popup importer
+        from .core import MatchDispatcher
 
-            if len(match_files) > 0:
-                for file in match_files:
-                    match_file_op_dict[file] = ITEM
-                match_index_list.append(index)
+        area_type = self.get_area_type(context)
+        items = [(index, self.CONFIGS.get_item_helper(index)) for index in self.CONFIGS.index_list]
+        items = [(index, ITEM) for index, ITEM in items if ITEM.is_config_item_poll(area_type)]
+        match_file_op_dict, match_index_list = MatchDispatcher(items).dispatch(file_list)
 
         # dynamic operator
         ##################
-        from .dynamic_io import DynamicImport
+        from .dynamic_io import DynamicImport, CONFIG_OPERATORS, set_dynamic_import_state
         from ..imexporter.default_importer import get_importer
 
         importer = get_importer(cpp_obj_importer=get_pref().cpp_obj_importer)
+        set_dynamic_import_state(list(file_list), list(dir_list), match_file_op_dict)
 
-        for index in self.CONFIGS.index_list:
+        for index, ITEM in items:
             if index in match_index_list: continue  # not register those match config
-            # only for register
-            config_item = get_pref().config_list[index]
-            ITEM = ConfigItemHelper(config_item)
-            if not ITEM.is_config_item_poll(context.area.type): continue
-
-            op_cls = type("DynOp",
-                          (bpy.types.Operator,),
-                          {"bl_idname": f'wm.spio_config_{index}',
-                           "bl_label": ITEM.name,
-                           "bl_description": ITEM.description,
-                           "execute": DynamicImport.execute,
-                           # custom pass in
-                           'ITEM': ITEM,
-                           'file_list': file_list,
-                           'dir_list': dir_list,
-                           'match_file_op_dict': match_file_op_dict,
-                           },
-                          )
-
+            op_cls = CONFIG_OPERATORS.get_operator(index, ITEM, 'IMPORT',
+                                                   {"execute": DynamicImport.execute})
             self.dep_classes.append(op_cls)
 
-        # register
-        self.register_dep_classes()
-
         ############################
         # execute
         ############################
 
         # first import all matching rule files
         if len(match_file_op_dict) > 0:
-            with MeasureTime() as start_time:
-                for filepath, item_helper in match_file_op_dict.items():
-                    op_callable, ops_args, op_context = item_helper.get_operator_and_args()
-                    ops_args['filepath'] = filepath
-                    try:
-                        if op_context:
-                            op_callable(op_context, **ops_args)
-                        else:
-                            op_callable(**ops_args)
-
-                    except Exception as e:
-                        self.report({"ERROR"}, str(e))
+            from .op_batch_import import BatchImportJob, ImportTask, run_batch_import
 
-                if get_pref().report_time: self.report_time(start_time)
+            tasks = [ImportTask(filepath, *item_helper.get_operator_and_args())
+                     for filepath, item_helper in match_file_op_dict.items()]
+            run_batch_import(context, BatchImportJob(tasks, total=len(tasks), title=f'Match {self.ext.upper()}'),
+                             op=self)
 
         # then popup menu to select the remain not matching file
         remain_list = list()
@@ -188,11 +208,24 @@ class SuperImport(IO_Base, bpy.types.Operator):
         else:
             title = f'Super Import {self.ext.upper()}'
 
-        if len(remain_list) > 0:
+        if len(remain_list) > 0 and self.can_popup(context):
             # set draw menu
             from .core import PopupImportMenu
+            from .file_registry import register_files
             import_op = self
             ext = self.ext
+            remain_handle = register_files(remain_list)
+
+            # build default menu once, its file lists are registered when the menu is built, not on each redraw
+            default_menu = None
+            if ext not in importer:
+                pop = PopupImportMenu(file_list=remain_list,
+                                      dir_list=dir_list,
+                                      context=context)
+                if ext == 'blend':
+                    default_menu = pop.default_blend_menu(return_menu=True)
+                else:
+                    default_menu = pop.default_image_menu(return_menu=True)
 
             def draw_custom_menu(self, context):
                 layout = self.layout
@@ -206,24 +239,14 @@ class SuperImport(IO_Base, bpy.types.Operator):
                 layout.separator()
                 # default popup
                 if ext in importer:
-                    layout.operator('spio.import_model').files = '$$'.join(
-                        remain_list)
-                elif ext == 'blend':
-                    pop = PopupImportMenu(file_list=remain_list,
-                                          dir_list=dir_list,
-                                          context=context)
-                    menu = pop.default_blend_menu(return_menu=True)
-                    if menu: menu(self, context)
-                else:
-                    pop = PopupImportMenu(file_list=remain_list,
-                                          dir_list=dir_list,
-                                          context=context)
-                    menu = pop.default_image_menu(return_menu=True)
-                    if menu: menu(self, context)
+                    layout.operator('spio.import_model').files = remain_handle
+                elif default_menu:
+                    default_menu(self, context)
 
             context.window_manager.popup_menu(draw_custom_menu, title=title, icon='FILEBROWSER')
 
-        return {'FINISHED'}
+        from .op_batch_import import get_handoff_result
+        return get_handoff_result(self)
 
 
 class WM_OT_super_import(SuperImport):
@@ -233,6 +256,8 @@ class WM_OT_super_import(SuperImport):
 
     def import_blend_default(self, context):
         """Import with default popup"""
+        if not self.can_popup(context): return
+
         from .core import PopupImportMenu
         popup = PopupImportMenu(file_list=self.file_list,
                                 dir_list=self.dir_list,
@@ -245,16 +270,34 @@ class WM_OT_super_import(SuperImport):
         importer = get_importer(cpp_obj_importer=get_pref().cpp_obj_importer)
 
         ext = self.ext
+        file_list = self.file_list
+
         if ext in importer:
-            for file_path in self.file_list:
-                bl_idname = importer.get(ext)
-                op_callable = getattr(getattr(bpy.ops, bl_idname.split('.')[0]), bl_idname.split('.')[1])
-                op_callable(filepath=file_path)
-        else:
+            from .op_batch_import import BatchImportJob, ParallelImportJob, ImportTask, run_batch_import
+            from .op_sequence_import import get_sequence_tasks, get_sequence_exts
+            from .core import get_op_by_idname
+
+            # numbered sequences become one object each, imported in the same batch as the other files
+            seq_tasks, file_list = get_sequence_tasks(file_list, importer, get_sequence_exts(get_pref()))
+
+            bl_idname = importer.get(ext)
+            if not seq_tasks and use_parallel_import(file_list):
+                job = ParallelImportJob(bl_idname, {}, file_list, workers=get_pref().parallel_import_workers)
+            else:
+                op_callable = get_op_by_idname(bl_idname)
+                tasks = seq_tasks + [ImportTask(file_path, op_callable) for file_path in file_list]
+                job = BatchImportJob(tasks, total=len(tasks))
+            run_batch_import(context, job, op=self)
+        elif self.can_popup(context):
             from .core import PopupImportMenu
 
             popup = PopupImportMenu(self.file_list, self.dir_list, context)
             popup.default_image_menu()
+        elif len(self.file_list) == 0 and len(self.dir_list) > 0:
+            # no menu in background, import the folders files
+            from .file_registry import register_files
+
+            bpy.ops.spio.import_folders(dirs=register_files(self.dir_list))
 
 
 def file_context_menu(self, context):
@@ -284,5 +327,8 @@ def unregister():
 
     bpy.utils.unregister_class(WM_OT_super_import)
 
+    from .dynamic_io import CONFIG_OPERATORS
+    CONFIG_OPERATORS.clear()
+
     del bpy.types.Scene.spio_ext
     del bpy.types.WindowManager.spio_cache_import
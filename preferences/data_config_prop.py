@@ -12,12 +12,19 @@ from bpy.types import PropertyGroup
 from .utils import get_pref
 
 
+def update_config(self, context):
+    """configs are compiled in ops.core.CONFIG_INDEX, rebuild it on next lookup"""
+    from ..ops.core import mark_config_dirty
+    mark_config_dirty()
+
+
 class OperatorProperty(PropertyGroup):
-    name: StringProperty(name='Property')
-    value: StringProperty(name='Value')
+    name: StringProperty(name='Property', update=update_config)
+    value: StringProperty(name='Value', update=update_config)
 
 
 def correct_blidname(self, context):
+    update_config(self, context)
     if self.bl_idname.startswith('bpy.ops.'):
         self.bl_idname = self.bl_idname[8:]
     if self.bl_idname.endswith('()'):
@@ -25,6 +32,7 @@ def correct_blidname(self, context):
 
 
 def correct_name(self, context):
+    update_config(self, context)
     pref = get_pref()
     names = [item.name for item in pref.config_list if item.name == self.name and item.name != '']
     if len(names) != 1:
@@ -61,20 +69,20 @@ def get_operator_type():
 
 class ConfigItemProperty(PropertyGroup):
     # USE
-    use_config: BoolProperty(name='Use', default=True)
+    use_config: BoolProperty(name='Use', default=True, update=update_config)
     # UI
     color_tag: EnumProperty(name='Color Tag',
-                            items=enum_color_tag_items)
+                            items=enum_color_tag_items, update=update_config)
     # IO type
     io_type: EnumProperty(name='IO Type',
                           items=[('IMPORT', 'Import', '', 'IMPORT', 0), ('EXPORT', 'Export', '', 'EXPORT', 1)],
-                          default='IMPORT')
+                          default='IMPORT', update=update_config)
     # information
     name: StringProperty(name='Preset Name', update=correct_name)
     description: StringProperty(name='Description',
-                                description='Show in the popup operator tips')
+                                description='Show in the popup operator tips', update=update_config)
     # extension
-    extension: StringProperty(name='Extension')
+    extension: StringProperty(name='Extension', update=update_config)
 
     # custom import match rule
     ###############################
@@ -84,13 +92,14 @@ class ConfigItemProperty(PropertyGroup):
                                     ('ENDSWITH', 'Endswith', ''),
                                     ('IN', 'Contain', ''),
                                     ('REGEX', 'Regex (Match or not)', ''), ],
-                             default='NONE', description='Matching rule of the name')
+                             default='NONE', description='Matching rule of the name', update=update_config)
 
-    match_value: StringProperty(name='Match Value', default='')
+    match_value: StringProperty(name='Match Value', default='', update=update_config)
 
     # custom export temp path
     temporary_directory: StringProperty(name='Temporary Directory', subtype='DIR_PATH',
-                                        description="Temporary Directory to store export files.\nIf empty, use blender's default temporary directory")
+                                        description="Temporary Directory to store export files.\nIf empty, use blender's default temporary directory",
+                                        update=update_config)
 
     # remove grease pencil from default because this design is only allow one default importer
     operator_type: EnumProperty(
@@ -159,25 +168,28 @@ class ConfigItemProperty(PropertyGroup):
 
             ('ADDONS_IMPORT_IES', 'Import IES (.ies)', 'Import IES file as light', 'LIGHT_SPOT', 104),
             ('ADDONS_IMPORT_PBR_ZIP', 'Import PBR Material (.zip)', 'Import PBR Material', 'MATERIAL', 105),
+            ('ADDONS_IMPORT_STL_FAST', 'Import STL Fast (.stl)', 'Import STL with the SPIO NumPy reader', 'IMPORT', 106),
+            ('ADDONS_IMPORT_PLY_FAST', 'Import PLY Fast (.ply)',
+             'Import PLY meshes and point clouds with the SPIO NumPy reader', 'IMPORT', 107),
 
             None,
             ('CUSTOM', 'Custom', '', 'USER', 666),
         ],
-        default='DEFAULT_OBJ', )
+        default='DEFAULT_OBJ', update=update_config)
 
     # custom operator
     bl_idname: StringProperty(name='Operator Identifier', update=correct_blidname)
     context: EnumProperty(name="Operator Context",
                           items=[("INVOKE_DEFAULT", "INVOKE_DEFAULT", ''),
                                  ("EXEC_DEFAULT", "EXEC_DEFAULT", ''), ],
-                          default='EXEC_DEFAULT')
+                          default='EXEC_DEFAULT', update=update_config)
     context_area: EnumProperty(name="Area",
                                items=[
                                    ("VIEW_3D", "3D View", ''),
                                    ("IMAGE_EDITOR", "Image Editor", ''),
                                    ("NODE_EDITOR", "Node Editor", ''),
                                ],
-                               default='VIEW_3D')
+                               default='VIEW_3D', update=update_config)
     prop_list: CollectionProperty(type=OperatorProperty)
     show_prop_list: BoolProperty(name='Properties', default=True)
 
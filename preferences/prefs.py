@@ -35,6 +35,8 @@ class OperatorPropAction:
         elif self.action == 'REMOVE':
             item.prop_list.remove(self.prop_index)
 
+        update_config(self, context)
+
         return {'FINISHED'}
 
 
@@ -105,6 +107,8 @@ class SPIO_OT_ConfigListAction:
             for i in range(old_index, new_index - 1):
                 bpy.ops.spio.config_list_move_up()
 
+        update_config(self, context)
+
         return {'FINISHED'}
 
 
@@ -122,6 +126,7 @@ class SPIO_OT_ConfigListMove:
         neighbor = index + (-1 if self.action == 'UP' else 1)
         my_list.move(neighbor, index)
         self.move_index(context)
+        update_config(self, context)
 
         return {'FINISHED'}
 
@@ -324,7 +329,61 @@ def update_category(self, context):
         self.report({'ERROR'}, f'Category change failed:\n{e}')
 
 
-from .data_config_prop import ConfigItemProperty
+def update_temp_store(self, context):
+    from ..temp_store import TEMP_STORE
+    TEMP_STORE.configure(max_size_mb=self.temp_max_size, max_age_days=self.temp_max_age)
+
+
+def update_profiler(self, context):
+    from ..profiler import PROFILER
+    PROFILER.configure(max_runs=self.profile_max_runs)
+
+
+def update_watch(self, context):
+    from ..ops.op_watch_folder import WATCHER
+    WATCHER.restart()
+
+
+class WatchFolderProperty(PropertyGroup):
+    path: StringProperty(name='Folder', subtype='DIR_PATH', update=update_watch)
+    recursive: BoolProperty(name='Sub Folders', default=True, update=update_watch)
+
+
+class SPIO_OT_WatchFolderAction:
+    """Add / Remove watched folder"""
+    bl_label = "Watch Folder Operate"
+    bl_options = {'INTERNAL'}
+
+    index: IntProperty()
+    action = None
+
+    def execute(self, context):
+        pref = get_pref()
+
+        if self.action == 'ADD':
+            pref.watch_folders.add()
+        elif self.action == 'REMOVE':
+            pref.watch_folders.remove(self.index)
+            update_watch(self, context)
+
+        return {'FINISHED'}
+
+
+class SPIO_OT_WatchFolderAdd(SPIO_OT_WatchFolderAction, bpy.types.Operator):
+    bl_idname = "spio.watch_folder_add"
+    bl_label = "Add Watch Folder"
+
+    action = 'ADD'
+
+
+class SPIO_OT_WatchFolderRemove(SPIO_OT_WatchFolderAction, bpy.types.Operator):
+    bl_idname = "spio.watch_folder_remove"
+    bl_label = "Remove Watch Folder"
+
+    action = 'REMOVE'
+
+
+from .data_config_prop import ConfigItemProperty, update_config
 
 
 class SPIO_Preference(bpy.types.AddonPreferences):
@@ -340,6 +399,7 @@ class SPIO_Preference(bpy.types.AddonPreferences):
         ('UI', 'User Interface', '', 'WINDOW', 1),
         ('KEYMAP', 'Keymap', '', 'KEYINGSET', 2),
         ('ADDONS', 'Addons', '', 'EXPERIMENTAL', 3),
+        ('TIMING', 'Timing', '', 'TIME', 5),
         ('URL', 'Url', '', 'HELP', 4),
 
     ], default='IO')
@@ -351,6 +411,38 @@ class SPIO_Preference(bpy.types.AddonPreferences):
                                 description="Force to use 'utf-8' to decode filepath \nOnly enable when your system coding 'utf-8'",
                                 default=False)
     cpp_obj_importer: BoolProperty(name='Use C++ obj importer', default=False)
+    image_paste_in_memory: BoolProperty(name='Paste Image In Memory',
+                                        description='Paste clipboard image into a packed image without writing a temp file',
+                                        default=True)
+    parallel_import: BoolProperty(name='Parallel Import',
+                                  description='Import many model files in background blender processes at the same time',
+                                  default=False)
+    parallel_import_workers: IntProperty(name='Workers',
+                                         description='Number of background blender processes, 0 for cpu count - 1',
+                                         default=0, min=0, soft_max=64)
+    parallel_import_min_files: IntProperty(name='Min Files',
+                                           description='Only import in parallel when at least this number of files is pasted',
+                                           default=16, min=2)
+    detect_sequences: BoolProperty(name='Import Numbered Sequences',
+                                   description='Import numbered VDB / Alembic files (smoke_0001.vdb, smoke_0002.vdb...) as one sequence object',
+                                   default=True)
+    detect_mesh_sequences: BoolProperty(name='Mesh Sequences',
+                                        description='Also import numbered STL / PLY / OBJ files (sim_0001.ply, sim_0002.ply...) as one animated object.\n'
+                                                    'Off by default, numbered mesh files are often separate parts (part_1.obj, part_2.obj...)',
+                                        default=False)
+    use_watch_folders: BoolProperty(name='Watch Folders',
+                                    description='Import the new files dropped in the watched folders, with the same configs as Super Import',
+                                    default=False, update=update_watch)
+    watch_folders: CollectionProperty(type=WatchFolderProperty)
+    watch_interval: FloatProperty(name='Interval (s)',
+                                  description='Seconds between two checks of the watched folders',
+                                  default=2.0, min=0.2, soft_max=60)
+    watch_settle_time: FloatProperty(name='Settle Time (s)',
+                                     description='A new file is imported once its size has not changed for this time',
+                                     default=2.0, min=0.0, soft_max=60)
+    import_ledger: BoolProperty(name='Link Re-pasted Files',
+                                description='Pasting an unchanged file already imported creates linked duplicates of its objects instead of importing it again',
+                                default=True)
     # addon
     asset_helper: BoolProperty(name='Asset Helper', default=True)
     # asset helper batch import pbr tags
@@ -368,11 +460,22 @@ class SPIO_Preference(bpy.types.AddonPreferences):
     post_push_to_clipboard: BoolProperty(name='Copy After Export',
                                          description='Copy files to clipboard after export models / images (Mac Only Support One file)',
                                          default=True)
+    # Temp files
+    temp_max_size: IntProperty(name='Max Temp Size (MB)',
+                               description='Least recently used files in spio_temp are removed over this size, 0 for no limit',
+                               default=512, min=0, update=update_temp_store)
+    temp_max_age: IntProperty(name='Max Temp Age (Days)',
+                              description='Files in spio_temp older than this are removed on startup, 0 for no limit',
+                              default=7, min=0, update=update_temp_store)
 
     # UI
     report_time: BoolProperty(name='Report Time',
                               description='Report import time', default=True)
 
+    profile_max_runs: IntProperty(name='Runs Kept',
+                                  description='Number of recent super import / export runs kept with their timing',
+                                  default=20, min=1, soft_max=200, update=update_profiler)
+
     disable_warning_rules: BoolProperty(name='Close Warning Rules', default=False)
     # Preset
     config_list: CollectionProperty(type=ConfigItemProperty)
@@ -458,6 +561,28 @@ class SPIO_Preference(bpy.types.AddonPreferences):
             row = box.row(align=True)
             row.prop(self, 'cpp_obj_importer')
 
+            row = box.row(align=True)
+            row.prop(self, 'image_paste_in_memory')
+
+            row = box.row(align=True)
+            row.prop(self, 'parallel_import')
+            sub = row.row(align=True)
+            sub.active = self.parallel_import
+            sub.prop(self, 'parallel_import_workers')
+            sub.prop(self, 'parallel_import_min_files')
+
+            row = box.row(align=True)
+            row.prop(self, 'detect_sequences')
+            sub = row.row(align=True)
+            sub.active = self.detect_sequences
+            sub.prop(self, 'detect_mesh_sequences')
+
+            row = box.row(align=True)
+            row.prop(self, 'import_ledger')
+
+            #### Watch Folders ####
+            self.draw_watch_folders(box)
+
             #### PBR Tags ####
             box = box.box()
             subcol = box.column(align=True)
@@ -501,6 +626,17 @@ class SPIO_Preference(bpy.types.AddonPreferences):
             row = box.row(align=True)
             row.prop(self, 'post_push_to_clipboard')
 
+            #### Temp Files ####
+            box = col.box()
+            box.label(text='Temp Files', icon="FILE_FOLDER")
+            row = box.row(align=True)
+            row.prop(self, 'temp_max_size')
+
+            row = box.row(align=True)
+            row.prop(self, 'temp_max_age')
+
+            box.operator('spio.clean_temp_store', icon='TRASH')
+
         def draw_ui():
             box = col.box()
             box.label(text='User Interface', icon='WINDOW')
@@ -524,9 +660,59 @@ class SPIO_Preference(bpy.types.AddonPreferences):
             self.draw_keymap(context, col)
         elif self.settings_ui == 'ADDONS':
             self.draw_addons(context, col)
+        elif self.settings_ui == 'TIMING':
+            self.draw_timing(context, col)
         elif self.settings_ui == 'URL':
             self.draw_url(context, col)
 
+    def draw_watch_folders(self, layout):
+        from ..ops.op_watch_folder import WATCHER
+
+        box = layout.box()
+        subcol = box.column(align=True)
+        subcol.use_property_split = False
+        row = subcol.row(align=True)
+        row.prop(self, 'use_watch_folders')
+        row.label(text=WATCHER.get_status())
+
+        subcol = box.column(align=True)
+        subcol.active = self.use_watch_folders
+        subcol.prop(self, 'watch_interval')
+        subcol.prop(self, 'watch_settle_time')
+        subcol.separator()
+
+        for index, item in enumerate(self.watch_folders):
+            row = subcol.row(align=True)
+            row.use_property_split = False
+            row.prop(item, 'path', text='')
+            row.prop(item, 'recursive', text='', icon='OUTLINER')
+            row.operator('spio.watch_folder_remove', text='', icon='REMOVE').index = index
+        subcol.operator('spio.watch_folder_add', text='Add Folder', icon='ADD')
+
+    def draw_timing(self, context, layout):
+        from ..profiler import PROFILER
+
+        box = layout.box()
+        box.label(text='Timing', icon='TIME')
+        row = box.row(align=True)
+        row.prop(self, 'profile_max_runs')
+        row = box.row(align=True)
+        row.operator('spio.dump_profile', icon='EXPORT')
+        row.operator('spio.clear_profile', icon='TRASH')
+
+        # newest run first, spans of the same stage summed
+        for run in reversed(list(PROFILER.runs)):
+            box = layout.box()
+            row = box.row()
+            row.label(text=run.title, icon='PLAY')
+            row.label(text=f'{round(run.get_duration() * 1000, 1)} ms')
+
+            col = box.column(align=True)
+            for depth, name, count, total in run.get_breakdown():
+                row = col.row()
+                row.label(text='    ' * depth + (name if count == 1 else f'{name} x{count}'))
+                row.label(text=f'{round(total * 1000, 1)} ms')
+
     def draw_keymap(self, context, layout):
         col = layout.box().column()
         col.label(text="Keymap", icon="KEYINGSET")
@@ -635,6 +821,13 @@ class SPIO_Preference(bpy.types.AddonPreferences):
             box2.prop(item, 'match_rule')
             if item.match_rule != 'NONE':
                 box2.prop(item, 'match_value', text='Match Value' if item.match_rule != 'REGEX' else 'Expression')
+                if item.match_rule == 'REGEX':
+                    from ..ops.core import get_regex_error
+                    error = get_regex_error(item.match_value)
+                    if error is not None:
+                        col = box2.column()
+                        col.alert = True
+                        col.label(text=f'Invalid expression: {error}', icon='ERROR')
                 if not self.disable_warning_rules:
                     box3 = box2.box().column(align=True)
                     box3.alert = True
@@ -745,6 +938,8 @@ classes = [
     SPIO_OT_ConfigListAdd, SPIO_OT_ConfigListRemove, SPIO_OT_ConfigListCopy, SPIO_OT_ConfigListMoveUP,
     SPIO_OT_ConfigListMoveDown,
 
+    WatchFolderProperty, SPIO_OT_WatchFolderAdd, SPIO_OT_WatchFolderRemove,
+
     PREF_UL_ConfigList,
     SPIO_MT_ConfigIOMenu,
     NWPrincipledPreferences,
@@ -0,0 +1,160 @@
+"""Span profiler of the paste / copy pipeline
+
+A run is one super import / export. Each stage of the run (clipboard pull, payload classification,
+config resolution, operator registration, importer / exporter calls, post process) is recorded as a
+span. The last runs are kept in a ring buffer, shown in the preferences and can be dumped to json.
+Batch imports go on after the operator returns (modal / timer), their spans are added to the run
+that started them.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class Span():
+    __slots__ = ('name', 'depth', 'start', 'duration', 'meta')
+
+    def __init__(self, name, depth, start, duration, meta):
+        self.name = name
+        self.depth = depth
+        self.start = start  # seconds since the run start
+        self.duration = duration
+        self.meta = meta
+
+    def to_dict(self):
+        return {'name': self.name, 'depth': self.depth, 'start': round(self.start, 6),
+                'duration': round(self.duration, 6), 'meta': self.meta}
+
+
+class Run():
+    def __init__(self, title):
+        self.title = title
+        self.time = time.time()
+        self.start = time.perf_counter()
+        self.spans = list()
+        self.lock = threading.Lock()  # clipboard is pulled in a thread
+        self.depths = dict()  # thread id: open span count
+
+    def enter(self):
+        tid = threading.get_ident()
+        with self.lock:
+            depth = self.depths.get(tid, 0)
+            self.depths[tid] = depth + 1
+        return depth
+
+    def exit(self, name, depth, start, meta):
+        end = time.perf_counter()
+        with self.lock:
+            self.depths[threading.get_ident()] = depth
+            self.spans.append(Span(name, depth, start - self.start, end - start, meta))
+
+    def get_duration(self):
+        """From the run start to the end of its last span"""
+        with self.lock:
+            return max((span.start + span.duration for span in self.spans), default=0.0)
+
+    def get_breakdown(self):
+        """[(depth, name, count, total seconds)] spans of the same name and depth summed, in order of first start"""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+
+        breakdown = dict()
+        for span in spans:
+            key = (span.depth, span.name)
+            count, total = breakdown.get(key, (0, 0.0))
+            breakdown[key] = (count + 1, total + span.duration)
+
+        return [(depth, name, count, total) for (depth, name), (count, total) in breakdown.items()]
+
+    def to_dict(self):
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+
+        return {'title': self.title,
+                'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.time)),
+                'duration': round(self.get_duration(), 6),
+                'spans': [span.to_dict() for span in spans]}
+
+
+class Profiler():
+    def __init__(self, max_runs=20):
+        self.runs = deque(maxlen=max_runs)
+        self.current = None  # run of the operator running on the main thread
+
+    def configure(self, max_runs):
+        if max_runs != self.runs.maxlen:
+            self.runs = deque(self.runs, maxlen=max_runs)
+
+    def begin_run(self, title):
+        run = Run(title)
+        self.runs.append(run)
+        self.current = run
+        return run
+
+    def end_run(self, run=None):
+        """The run stays in the buffer, jobs holding it can still add spans"""
+        if run is None or run is self.current:
+            self.current = None
+
+    @contextmanager
+    def run(self, title):
+        """Run of an operator, the outer run (operator called by another one) is current again after it"""
+        outer = self.current
+        run = self.begin_run(title)
+        try:
+            yield run
+        finally:
+            self.end_run(run)
+            if outer is not None: self.current = outer
+
+    @contextmanager
+    def resume(self, run):
+        """Make the run current again, for an operator going on in a modal / timer"""
+        outer = self.current
+        self.current = run
+        try:
+            yield run
+        finally:
+            self.current = outer
+
+    @contextmanager
+    def span(self, name, run=None, **meta):
+        """Time the block into the given run, or the current run. Nothing is recorded without a run"""
+        if run is None: run = self.current
+        if run is None:
+            yield
+            return
+
+        depth = run.enter()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            run.exit(name, depth, start, meta)
+
+    def record(self, name, duration, run=None, **meta):
+        """Add a span timed elsewhere, ending now"""
+        if run is None: run = self.current
+        if run is None: return
+
+        depth = run.enter()
+        run.exit(name, depth, time.perf_counter() - duration, meta)
+
+    def get_last_run(self):
+        return self.runs[-1] if len(self.runs) > 0 else None
+
+    def clear(self):
+        self.runs.clear()
+        self.current = None
+
+    def dump(self, filepath):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'runs': [run.to_dict() for run in list(self.runs)]}, f, indent=2)
+
+
+PROFILER = Profiler()
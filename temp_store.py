@@ -0,0 +1,178 @@
+"""Managed ~/spio_temp directory
+
+Pasted images / svg are stored under the sha1 of their content, so copying the same thing twice
+reuses one file. Files written by other processes (osascript, powershell, exporters) go to a staging
+path first and are adopted into the store with an atomic rename.
+The directory is kept under a size / age budget, least recently used files are evicted first.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import uuid
+import hashlib
+import threading
+
+STAGING_PREFIX = '.spio_staging_'
+STAGING_MAX_AGE = 3600  # seconds, staging file left by a crashed pull
+
+
+class TempStore():
+    def __init__(self, root=None, max_size_mb=512, max_age_days=7):
+        self.root = root if root is not None else os.path.join(os.path.expanduser('~'), 'spio_temp')
+        self.max_size = max_size_mb * 1024 * 1024
+        self.max_age = max_age_days * 86400
+        self.total_size = None  # estimate, None until the first sweep
+        self.sweep_pending = False  # over budget, swept later on the main thread (see ops/op_temp_store.py)
+        self.lock = threading.Lock()  # images can be pulled in a thread
+
+    def configure(self, max_size_mb=None, max_age_days=None):
+        """0 means no limit"""
+        if max_size_mb is not None: self.max_size = max_size_mb * 1024 * 1024
+        if max_age_days is not None: self.max_age = max_age_days * 86400
+
+    def get_dir(self):
+        os.makedirs(self.root, exist_ok=True)
+        return self.root
+
+    def get_path(self, name):
+        """Path for a file that has to keep its name (exported model, copied image)"""
+        return os.path.join(self.get_dir(), name)
+
+    def get_staging_path(self, ext):
+        """Unique path for a file that will be written by another process, then adopt() it"""
+        return os.path.join(self.get_dir(), f'{STAGING_PREFIX}{uuid.uuid4().hex}.{ext}')
+
+    @staticmethod
+    def hash_file(path):
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha1.update(chunk)
+
+        return sha1.hexdigest()
+
+    @staticmethod
+    def get_content_key(path):
+        """sha1 of a file stored under its content hash, None for other names (exported / copied files)"""
+        stem, _, ext = os.path.basename(path).partition('.')
+        if ext == '' or len(stem) != 40: return None
+        if any(c not in '0123456789abcdef' for c in stem): return None
+
+        return stem
+
+    def touch(self, path):
+        """Mark a file as recently used"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def write_bytes(self, data, ext):
+        """Store data under its content hash (atomic), return the path"""
+        path = os.path.join(self.get_dir(), f'{hashlib.sha1(data).hexdigest()}.{ext}')
+        if os.path.isfile(path):
+            self.touch(path)
+            return path
+
+        staging_path = self.get_staging_path(ext)
+        with open(staging_path, 'wb') as f:
+            f.write(data)
+        os.replace(staging_path, path)
+
+        self.add_size(len(data))
+
+        return path
+
+    def adopt(self, staging_path, ext=None):
+        """Move a staging file to its content address, return the new path (None if empty / not exist)"""
+        try:
+            size = os.path.getsize(staging_path)
+        except OSError:
+            return None
+
+        if size == 0:
+            os.remove(staging_path)
+            return None
+
+        if ext is None: ext = staging_path.split('.')[-1]
+        path = os.path.join(self.get_dir(), f'{self.hash_file(staging_path)}.{ext}')
+
+        if os.path.isfile(path):
+            os.remove(staging_path)
+            self.touch(path)
+        else:
+            os.replace(staging_path, path)
+            self.add_size(size)
+
+        return path
+
+    def add_size(self, size):
+        """Files are not evicted here, the caller can be the pull thread and files used by the blend are unknown"""
+        with self.lock:
+            if self.total_size is None: return
+            self.total_size += size
+            if self.max_size and self.total_size > self.max_size: self.sweep_pending = True
+
+    def sweep(self, keep=None):
+        """Evict old files and least recently used files over the size budget
+        keep: set of paths still used (eg. images in the current blend), never removed"""
+        keep = keep if keep is not None else set()
+        if not os.path.isdir(self.root):
+            with self.lock:
+                self.total_size = 0
+                self.sweep_pending = False
+            return 0
+
+        now = time.time()
+        entries = list()  # (mtime, size, path)
+        removed = 0
+
+        with os.scandir(self.root) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file(follow_symlinks=False): continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+
+                age = now - st.st_mtime
+                if entry.name.startswith(STAGING_PREFIX):
+                    expired = age > STAGING_MAX_AGE
+                else:
+                    expired = self.max_age and age > self.max_age
+
+                if expired and entry.path not in keep and self.remove(entry.path):
+                    removed += 1
+                    continue
+
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        if self.max_size and total_size > self.max_size:
+            entries.sort()  # oldest first
+            for mtime, size, path in entries:
+                if total_size <= self.max_size: break
+                if path in keep or os.path.basename(path).startswith(STAGING_PREFIX): continue
+                if self.remove(path):
+                    total_size -= size
+                    removed += 1
+
+        with self.lock:
+            self.total_size = total_size
+            self.sweep_pending = False
+
+        return removed
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:  # file opened by other process
+            return False
+
+        return True
+
+
+TEMP_STORE = TempStore()
@@ -0,0 +1,63 @@
+"""Fake clipboard helper speaking the spio_clipboard_helper protocol, without display server
+
+The clipboard is a dict in memory. Extra commands drive the failure cases:
+    PID   - 0   process id, to check the helper was restarted
+    EXIT  - 0   answer OK then exit, the next request finds a dead helper
+    CRASH - 0   exit without answering
+    HANG  - 0   never answer
+"""
+
+import os
+import sys
+import time
+
+
+def main():
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    clipboard = dict()
+    sequence = 0
+
+    def write_response(status, payload=b''):
+        stdout.write(f'{status} {len(payload)}\n'.encode('utf-8'))
+        if payload:
+            stdout.write(payload)
+        stdout.flush()
+
+    while True:
+        header = stdin.readline()
+        if not header: return
+
+        cmd, mime, length = header.decode('utf-8').split()
+        length = int(length)
+        payload = stdin.read(length) if length else b''
+
+        if cmd == 'PING':
+            write_response('OK')
+        elif cmd == 'PID':
+            write_response('OK', str(os.getpid()).encode('utf-8'))
+        elif cmd == 'SEQ':
+            write_response('OK', str(sequence).encode('utf-8'))
+        elif cmd == 'GET':
+            data = clipboard.get(mime)
+            if data is None:
+                write_response('NONE')
+            else:
+                write_response('OK', data)
+        elif cmd == 'SET':
+            clipboard = {mime: payload}
+            sequence += 1
+            write_response('OK')
+        elif cmd in {'QUIT', 'EXIT'}:
+            write_response('OK')
+            return
+        elif cmd == 'CRASH':
+            os._exit(1)
+        elif cmd == 'HANG':
+            time.sleep(3600)
+        else:
+            write_response('ERR', f'Unknown command {cmd}'.encode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()
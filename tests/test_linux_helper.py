@@ -0,0 +1,94 @@
+"""LinuxHelperProcess driven through a fake helper, no blender needed: python -m pytest tests"""
+
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clipboard.linux_helper import LinuxHelperProcess
+
+FAKE_HELPER = [sys.executable, os.path.join(ROOT, 'tests', 'fake_clipboard_helper.py')]
+
+
+@pytest.fixture
+def helper():
+    helper = LinuxHelperProcess(args=FAKE_HELPER, timeout=1.0)
+    yield helper
+    helper.stop()
+
+
+def test_request_response(helper):
+    assert helper.request('PING') == b''
+    assert helper.request('GET', 'text/plain') is None
+
+    helper.request('SET', 'text/plain', 'héllo\nworld'.encode('utf-8'))
+    assert helper.request('GET', 'text/plain').decode('utf-8') == 'héllo\nworld'
+    assert helper.request('SEQ') == b'1'
+
+
+def test_binary_payload(helper):
+    payload = bytes(range(256)) * 1024 + b'\n\n'
+    helper.request('SET', 'image/png', payload)
+    assert helper.request('GET', 'image/png') == payload
+
+
+def test_error_response(helper):
+    with pytest.raises(RuntimeError, match='Unknown command'):
+        helper.request('NOPE')
+
+    # the helper is still usable after an error answer
+    assert helper.request('PING') == b''
+
+
+def test_one_process_for_all_requests(helper):
+    pid = helper.request('PID')
+    for _ in range(10):
+        helper.request('PING')
+    assert helper.request('PID') == pid
+
+
+def test_restart_after_kill(helper):
+    pid = helper.request('PID')
+    helper.popen.kill()
+    helper.popen.wait()
+
+    assert helper.request('PID') != pid
+
+
+def test_restart_after_exit(helper):
+    pid = helper.request('PID')
+    helper.request('EXIT')
+
+    # dead before or while sending, either way the request is sent again to a new helper
+    assert helper.request('PID') != pid
+
+
+def test_crash_raises_after_one_retry(helper):
+    with pytest.raises(BrokenPipeError):
+        helper.request('CRASH')
+
+    assert helper.request('PING') == b''
+
+
+def test_timeout(helper):
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        helper.request('HANG')
+    assert time.monotonic() - start < 3
+
+    # the hung helper was killed, a new one answers
+    assert helper.popen is None
+    assert helper.request('PING') == b''
+
+
+def test_stop(helper):
+    helper.request('PING')
+    popen = helper.popen
+    helper.stop()
+
+    assert helper.popen is None
+    assert popen.poll() is not None
@@ -74,6 +74,8 @@ class SPIO_PT_ImportPanel(SidebarSetup, bpy.types.Panel):
         row.operator("wm.super_export", icon_value=G_ICON_ID['export'])
         row.separator()
 
+        layout.operator('spio.refresh_imported', icon='FILE_REFRESH')
+
 
 class SPIO_PT_AssetHelper(SidebarSetup, bpy.types.Panel):
     bl_label = 'Asset Helper'